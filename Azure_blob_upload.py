@@ -99,6 +99,11 @@ def process_csv_files(local_directory, blob_directory, backup_directory, existin
         if not os.path.isfile(local_path):
             continue
         
+        # Only completed files: the aggregator publishes a .done marker after closing a CSV
+        done_marker = local_path + ".done"
+        if not os.path.exists(done_marker):
+            continue
+        
         if filename in existing_blobs:
             print(f"[{datetime.datetime.now()}] Skipping {filename} - already exists in blob")
             continue  # Already uploaded
@@ -114,6 +119,7 @@ def process_csv_files(local_directory, blob_directory, backup_directory, existin
             # Move to backup folder
             backup_path = os.path.join(backup_directory, filename)
             shutil.move(local_path, backup_path)
+            os.remove(done_marker)
             print(f"[{datetime.datetime.now()}] Moved {filename} to backup")
         except Exception as ex:
             print(f"[{datetime.datetime.now()}] Failed to upload {local_path}: {ex}")
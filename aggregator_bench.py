@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Last- und Replay-Benchmark des Aggregators
+
+Dieses Script treibt ``EventAggregator`` direkt im Prozess mit einer
+simulierten Uhr: entweder mit synthetischen Event-Strömen mehrerer Kameras
+(Rate, Klassenmix, Exit-Verzögerung einstellbar) oder mit den Events, die
+sich aus den CSVs unter ``saved_data/<location>/csv`` rekonstruieren lassen.
+Gemessen werden Events/s, die Latenz pro Event (insbesondere beim Matching)
+und die Anzahl der Pending-Events über die Zeit. Die erzeugten Zeilen können
+mit einem Golden Run verglichen werden, um geänderte Pairing-Entscheidungen
+zu erkennen.
+"""
+
+import os
+import csv
+import glob
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+from aggregator_events import CSV_FIELDS, EventAggregator
+from event_schema import CLASS_NAMES, encode_event
+
+# Bootsklassen (ohne Kennzeichen) mit ihrer Klassen-ID im Schema
+BOAT_CLASSES = [name for name in CLASS_NAMES if name != 'licence']
+# Exit-Kamera je Richtung
+EXIT_CAMERAS = {'left': 1, 'up': 1, 'right': 3, 'down': 3}
+# Feste Startzeit, damit synthetische Läufe reproduzierbar sind
+DEFAULT_START = '2024-06-01 08:00:00'
+
+
+def parse_class_mix(value: str) -> dict:
+    """``name=gewicht,...`` -> {Klassenname: Gewicht}; leer = alle Bootsklassen gleich oft."""
+    if not value:
+        return {name: 1.0 for name in BOAT_CLASSES}
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in CLASS_NAMES:
+            raise ValueError(f"Unbekannte Klasse '{name}' (erlaubt: {', '.join(BOAT_CLASSES)})")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def synthetic_events(location: str, start: float, hours: float = 8.0, rate: float = 30.0,
+                     class_mix: dict = None, exit_delay: float = 300.0, exit_jitter: float = 120.0,
+                     exit_ratio: float = 0.9, noise_ratio: float = 0.05, seed: int = 0) -> list:
+    """Synthetischer Event-Strom: Liste von (Aufnahmezeitpunkt, Record), zeitlich sortiert.
+
+    Boote erscheinen als Poisson-Prozess mit ``rate`` pro Stunde an Camera 2;
+    mit ``exit_ratio`` folgt nach ``exit_delay`` ± ``exit_jitter`` Sekunden ein
+    Exit-Event an Camera 1 oder 3. ``noise_ratio`` erzeugt zusätzlich
+    Exit-Events ohne zugehöriges Camera-2-Event.
+    """
+    rng = random.Random(seed)
+    class_mix = class_mix or parse_class_mix('')
+    names = list(class_mix)
+    weights = [class_mix[name] for name in names]
+    end = start + hours * 3600
+    events = []
+    track_id = 0
+    t = start
+    while True:
+        t += rng.expovariate(rate / 3600.0)
+        if t >= end:
+            break
+        track_id += 1
+        class_name = rng.choices(names, weights)[0]
+        class_id = CLASS_NAMES.index(class_name)
+        direction = rng.choice(('left', 'right'))
+        text = f"B {rng.randint(100, 9999)}" if rng.random() < 0.6 else ''
+        fields = dict(class_id=class_id, class_name=class_name, direction=direction, location=location,
+                      identified=bool(text) and rng.random() < 0.3, ocr_method='recognizer_gray' if text else 'no_license')
+
+        events.append((t, encode_event(camera=2, track_id=track_id, timestamp=t, extracted_text=text,
+                                       ocr_confidence=rng.random() if text else 0.0,
+                                       confidence=rng.uniform(0.5, 1.0), **fields)))
+        if rng.random() < exit_ratio:
+            exit_time = t + max(1.0, rng.gauss(exit_delay, exit_jitter))
+            exit_text = text if rng.random() < 0.5 else ''
+            events.append((exit_time, encode_event(camera=EXIT_CAMERAS[direction], track_id=track_id + 100000,
+                                                   timestamp=exit_time, extracted_text=exit_text,
+                                                   ocr_confidence=rng.random() if exit_text else 0.0,
+                                                   confidence=rng.uniform(0.5, 1.0), **fields)))
+        if rng.random() < noise_ratio:
+            noise_time = t + rng.uniform(0, 600)
+            noise_class = rng.choices(names, weights)[0]
+            noise_direction = rng.choice(('left', 'right'))
+            events.append((noise_time, encode_event(camera=EXIT_CAMERAS[noise_direction], track_id=track_id + 200000,
+                                                    class_id=CLASS_NAMES.index(noise_class), class_name=noise_class,
+                                                    direction=noise_direction, timestamp=noise_time,
+                                                    location=location, confidence=rng.uniform(0.5, 1.0))))
+    events.sort(key=lambda item: item[0])
+    return events
+
+
+def _parse_time(value: str):
+    try:
+        return time.mktime(time.strptime(value, '%Y-%m-%d %H:%M:%S'))
+    except (TypeError, ValueError):
+        return None
+
+
+def csv_replay_events(csv_dir: str) -> tuple:
+    """Events aus aggregierten CSVs rekonstruieren: (Location, [(Zeitpunkt, Record)]).
+
+    Jede Zeile ergibt ein Camera-2-Event und, falls gepaart, ein Exit-Event
+    an der Kamera aus ``pairing_status``. Das OCR-Ergebnis der Zeile wird
+    beiden Events mitgegeben.
+    """
+    paths = sorted(glob.glob(os.path.join(csv_dir, '*.csv')))
+    location = None
+    events = []
+    for path in paths:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                entry_time = _parse_time(row.get('entry_timestamp'))
+                if entry_time is None:
+                    continue
+                location = location or row.get('location') or 'replay'
+                class_name = row.get('class_name') or ''
+                fields = dict(
+                    track_id=int(row.get('track_id') or 0),
+                    class_id=int(row.get('class_id') or 0),
+                    class_name=class_name,
+                    direction=row.get('direction'),
+                    location=row.get('location') or location,
+                    extracted_text=row.get('extracted_text') or '',
+                    identified=row.get('identified_licence_number') == 'yes',
+                    ocr_confidence=float(row.get('ocr_confidence') or 0.0),
+                    confidence=float(row.get('confidence') or 0.0),
+                )
+                events.append((entry_time, encode_event(camera=2, timestamp=entry_time, **fields)))
+
+                status = row.get('pairing_status') or ''
+                exit_time = _parse_time(row.get('exit_timestamp'))
+                if status.startswith('paired_with_cam') and exit_time is not None:
+                    events.append((exit_time, encode_event(camera=int(status[len('paired_with_cam'):]),
+                                                           timestamp=exit_time, **fields)))
+    events.sort(key=lambda item: item[0])
+    return location or 'replay', events
+
+
+class AggregatorBenchmark:
+    """Treibt ``EventAggregator`` mit simulierter Uhr und misst Durchsatz und Latenzen."""
+
+    def __init__(self, location: str, timeout_minutes: float = 20, sample_interval: float = 60.0):
+        self.location = location
+        self.timeout_minutes = timeout_minutes
+        self.sample_interval = sample_interval
+
+    def run(self, events: list) -> dict:
+        """Alle Events verarbeiten; liefert Messwerte und die erzeugten CSV-Zeilen."""
+        save_root = tempfile.mkdtemp(prefix='aggregator_bench_')
+        try:
+            aggregator = EventAggregator(self.location, timeout_minutes=self.timeout_minutes,
+                                         save_root=save_root, verbose=False)
+            latencies = {'pending': [], 'matched': [], 'unmatched': [], 'invalid': []}
+            pending_samples = []
+            timeouts = 0
+            next_sample = events[0][0] if events else 0.0
+
+            start_time = time.perf_counter()
+            for sim_time, record in events:
+                timeouts += aggregator.check_timeouts(now=sim_time)
+                t0 = time.perf_counter()
+                outcome = aggregator.handle(record)
+                latencies[outcome].append(time.perf_counter() - t0)
+                aggregator.tick()
+                if sim_time >= next_sample:
+                    pending_samples.append((sim_time, len(aggregator.pending_events)))
+                    next_sample = sim_time + self.sample_interval
+            if events:
+                timeouts += aggregator.check_timeouts(now=events[-1][0] + self.timeout_minutes * 60 + 1)
+            aggregator.close()
+            elapsed = time.perf_counter() - start_time
+
+            rows = []
+            for path in sorted(glob.glob(os.path.join(save_root, self.location, 'csv', '*.csv'))):
+                with open(path, newline='', encoding='utf-8') as f:
+                    rows.extend(csv.DictReader(f))
+        finally:
+            shutil.rmtree(save_root, ignore_errors=True)
+
+        return {
+            'events': len(events),
+            'elapsed': elapsed,
+            'latencies': latencies,
+            'timeouts': timeouts,
+            'pending_samples': pending_samples,
+            'rows': rows,
+        }
+
+
+def percentiles_us(values: list) -> str:
+    if not values:
+        return "-"
+    ordered = sorted(values)
+    p50, p95, p99 = (ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6 for q in (0.50, 0.95, 0.99))
+    return f"p50 {p50:8.1f}  p95 {p95:8.1f}  p99 {p99:8.1f} µs"
+
+
+def _row_key(row: dict) -> tuple:
+    return (row['entry_timestamp'], row['track_id'], row['class_id'], row['direction'])
+
+
+def diff_rows(golden: list, rows: list, show: int = 10) -> int:
+    """Vergleicht die erzeugten Zeilen mit dem Golden Run; liefert die Anzahl der Abweichungen."""
+    golden_by_key = {_row_key(row): row for row in golden}
+    rows_by_key = {_row_key(row): row for row in rows}
+    missing = [key for key in golden_by_key if key not in rows_by_key]
+    added = [key for key in rows_by_key if key not in golden_by_key]
+    changed = [
+        key for key in golden_by_key
+        if key in rows_by_key and any(golden_by_key[key][f] != rows_by_key[key].get(f) for f in CSV_FIELDS)
+    ]
+
+    print(f"Golden-Vergleich: {len(missing)} fehlend, {len(added)} zusätzlich, {len(changed)} geändert")
+    for key in missing[:show]:
+        print(f"  - {key}")
+    for key in added[:show]:
+        print(f"  + {key}")
+    for key in changed[:show]:
+        fields = [f for f in CSV_FIELDS if golden_by_key[key][f] != rows_by_key[key].get(f)]
+        print(f"  ~ {key}: " + ", ".join(
+            f"{f}: {golden_by_key[key][f]!r} -> {rows_by_key[key].get(f)!r}" for f in fields))
+    return len(missing) + len(added) + len(changed)
+
+
+def main():
+    """Hauptfunktion für Command-Line Interface."""
+    parser = argparse.ArgumentParser(description='Last- und Replay-Benchmark des Aggregators')
+    parser.add_argument('--replay', type=str, default=None,
+                       help='CSV-Verzeichnis (z.B. saved_data/<location>/csv) statt synthetischer Events')
+    parser.add_argument('--location', type=str, default='bench',
+                       help='Location-Name für synthetische Events')
+    parser.add_argument('--hours', type=float, default=8.0,
+                       help='Simulierte Dauer in Stunden')
+    parser.add_argument('--rate', type=float, default=30.0,
+                       help='Boote pro Stunde an Camera 2')
+    parser.add_argument('--classes', type=str, default='',
+                       help='Klassenmix, z.B. motorboat_with_cabin=3,sailboat_with_cabin=1')
+    parser.add_argument('--exit-delay', type=float, default=300.0,
+                       help='Mittlere Zeit bis zum Exit-Event in Sekunden')
+    parser.add_argument('--exit-jitter', type=float, default=120.0,
+                       help='Standardabweichung der Exit-Verzögerung in Sekunden')
+    parser.add_argument('--exit-ratio', type=float, default=0.9,
+                       help='Anteil der Boote mit Exit-Event')
+    parser.add_argument('--noise-ratio', type=float, default=0.05,
+                       help='Anteil zusätzlicher Exit-Events ohne Camera-2-Event')
+    parser.add_argument('--timeout', type=float, default=20,
+                       help='Timeout des Aggregators in Minuten')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Startwert für den Zufallsgenerator')
+    parser.add_argument('--golden', type=str, default=None,
+                       help='CSV eines Golden Runs; fehlt die Datei, wird sie geschrieben')
+    parser.add_argument('--update-golden', action='store_true',
+                       help='Golden Run mit dem aktuellen Ergebnis überschreiben')
+    parser.add_argument('--pending-output', type=str, default=None,
+                       help='Pending-Events über die Zeit als CSV speichern')
+
+    args = parser.parse_args()
+
+    if args.replay:
+        location, events = csv_replay_events(args.replay)
+        print(f"{len(events)} Events aus {args.replay} rekonstruiert (Location: {location})")
+    else:
+        location = args.location
+        start = time.mktime(time.strptime(DEFAULT_START, '%Y-%m-%d %H:%M:%S'))
+        events = synthetic_events(location, start, args.hours, args.rate, parse_class_mix(args.classes),
+                                  args.exit_delay, args.exit_jitter, args.exit_ratio, args.noise_ratio, args.seed)
+        print(f"{len(events)} synthetische Events über {args.hours:g} h ({args.rate:g} Boote/h)")
+    if not events:
+        print("Keine Events gefunden.")
+        return
+
+    result = AggregatorBenchmark(location, args.timeout).run(events)
+    latencies = result['latencies']
+    all_latencies = [value for values in latencies.values() for value in values]
+    pending = [count for _, count in result['pending_samples']]
+
+    print("\nAggregator unter Last")
+    print("-" * 60)
+    print(f"Events:           {result['events']} in {result['elapsed']:.2f} s "
+          f"({result['events'] / result['elapsed']:.0f} Events/s, inkl. WAL-fsync)")
+    print(f"Zeilen:           {len(result['rows'])} ({len(latencies['matched'])} gepaart, "
+          f"{result['timeouts']} Timeouts, {len(latencies['unmatched'])} Exit-Events ohne Partner)")
+    print(f"Latenz gesamt:    {percentiles_us(all_latencies)}")
+    print(f"Latenz Camera 2:  {percentiles_us(latencies['pending'])}")
+    print(f"Latenz Matching:  {percentiles_us(latencies['matched'])}")
+    if pending:
+        print(f"Pending-Events:   Ø {sum(pending) / len(pending):.1f}, max {max(pending)}")
+        step = max(1, len(result['pending_samples']) // 10)
+        for sim_time, count in result['pending_samples'][::step]:
+            print(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(sim_time))}  {count:5d} {'#' * min(count, 50)}")
+
+    if args.pending_output:
+        with open(args.pending_output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['time', 'pending'])
+            for sim_time, count in result['pending_samples']:
+                writer.writerow([time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sim_time)), count])
+        print(f"\nPending-Verlauf gespeichert: {args.pending_output}")
+
+    if args.golden:
+        if args.update_golden or not os.path.exists(args.golden):
+            with open(args.golden, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, lineterminator='\n')
+                writer.writeheader()
+                writer.writerows(result['rows'])
+            print(f"\nGolden Run gespeichert: {args.golden}")
+        else:
+            with open(args.golden, newline='', encoding='utf-8') as f:
+                golden = list(csv.DictReader(f))
+            print()
+            diff_rows(golden, result['rows'])
+
+
+if __name__ == "__main__":
+    main()
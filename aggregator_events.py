@@ -1,9 +1,110 @@
 import os
 import time
+import heapq
 import queue
-import pandas as pd
+import bisect
+import struct
 from collections import defaultdict
-from image_utils import sanitize_filename
+from csv_sink import RollingCsvSink
+from event_schema import decode_event, format_timestamp
+from event_wal import EventWal
+
+# Columns of the aggregated CSV (order of ``create_final_csv_row``)
+CSV_FIELDS = [
+    "track_id",
+    "class_id",
+    "class_name",
+    "direction",
+    "entry_timestamp",
+    "exit_timestamp",
+    "location",
+    "extracted_text",
+    "identified_licence_number",
+    "ocr_confidence",
+    "confidence",
+    "pairing_status",
+]
+
+
+class PendingEventIndex:
+    """Camera 2 events waiting for an exit camera.
+
+    Events are indexed by ``(class_id, direction)``; each bucket is a list of
+    ``(epoch, seq)`` kept sorted with ``bisect``, so a match is a binary
+    search for the oldest event within ``timeout_seconds``. Expiry pops from
+    a min-heap ordered by epoch; entries that were matched in the meantime
+    are skipped lazily. ``seq`` is unique per event, so no two events ever
+    share a key.
+    """
+
+    def __init__(self, timeout_seconds: float):
+        self.timeout_seconds = timeout_seconds
+        self._buckets = defaultdict(list)  # (class_id, direction) -> sorted [(epoch, seq)]
+        self._events = {}  # seq -> ((class_id, direction), epoch, event)
+        self._heap = []  # (epoch, seq)
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    def __bool__(self):
+        return bool(self._events)
+
+    def add(self, evt: dict, epoch: float, seq: int = None) -> int:
+        """Insert a pending event and return its sequence number.
+
+        ``seq`` restores the number of an event replayed from the WAL.
+        """
+        if seq is None:
+            seq = self._next_seq
+        self._next_seq = max(self._next_seq, seq + 1)
+        key = (evt.get("class_id"), evt.get("direction"))
+        bisect.insort(self._buckets[key], (epoch, seq))
+        heapq.heappush(self._heap, (epoch, seq))
+        self._events[seq] = (key, epoch, evt)
+        return seq
+
+    def _remove(self, seq: int) -> dict:
+        key, epoch, evt = self._events.pop(seq)
+        bucket = self._buckets[key]
+        del bucket[bisect.bisect_left(bucket, (epoch, seq))]
+        if not bucket:
+            del self._buckets[key]
+        return evt
+
+    def match(self, class_id, direction, epoch: float):
+        """Remove and return the oldest pending event with the same class and
+        direction less than ``timeout_seconds`` away from ``epoch`` (or None)."""
+        bucket = self._buckets.get((class_id, direction))
+        if not bucket:
+            return None
+        # First entry with entry_epoch > epoch - timeout
+        i = bisect.bisect_right(bucket, (epoch - self.timeout_seconds, float("inf")))
+        if i == len(bucket) or bucket[i][0] >= epoch + self.timeout_seconds:
+            return None
+        return self._remove(bucket[i][1])
+
+    def expire(self, now: float) -> list:
+        """Remove and return all events older than ``timeout_seconds``, oldest first."""
+        expired = []
+        cutoff = now - self.timeout_seconds
+        while self._heap and self._heap[0][0] < cutoff:
+            _, seq = heapq.heappop(self._heap)
+            if seq in self._events:
+                expired.append(self._remove(seq))
+        return expired
+
+    def events(self) -> list:
+        """All pending events, oldest first (without removing them)."""
+        return [evt for _, _, evt in sorted(self._events.values(), key=lambda item: item[1])]
+
+    def drain(self) -> list:
+        """Remove and return all pending events, oldest first."""
+        events = self.events()
+        self._buckets.clear()
+        self._events.clear()
+        self._heap.clear()
+        return events
 
 
 def _choose_best_text(evt1: dict, evt2: dict):
@@ -29,70 +130,97 @@ def _choose_best_text(evt1: dict, evt2: dict):
     return evt1 if evt1.get("ocr_confidence", 0) >= evt2.get("ocr_confidence", 0) else evt2
 
 
-def aggregator_worker(
-    event_queue,
-    location,
-    stop_event,
-    daily_counter=None,
-    daily_lock=None,
-    flush_interval=120,
-    timeout_minutes=20,
-):
-    """Aggregate events from cameras with Camera 2 as primary detection.
+class EventAggregator:
+    """Pairs camera 2 events with exit camera events and writes the CSV rows.
+
+    Holds the pending index, the daily CSV sink and the write-ahead log;
+    ``aggregator_worker`` feeds it from the event queue. Pending camera 2
+    events and emitted rows are written to the WAL
+    (``<save_root>/<location>/wal/aggregator.wal``) before they are processed.
+    On construction the log is replayed: pending events, rows that may not
+    have reached the CSV yet and today's count in ``daily_counter`` are
+    restored.
 
     Parameters
     ----------
-    event_queue : mp.Queue
-        Queue with raw events from the tracking workers.
     location : str
         Name of the current location (original name with umlauts).
-    stop_event : mp.Event
-        Signals when the process should terminate.
     daily_counter : multiprocessing.Value, optional
         Shared counter for boats that completely left the lock.
     daily_lock : multiprocessing.Lock, optional
         Synchronization primitive for updating ``daily_counter``.
     flush_interval : int, optional
-        Seconds between writing accumulated CSV rows to disk.
+        Maximum seconds between fsyncs of the CSV file. Rows are appended
+        immediately; only the fsync is batched.
     timeout_minutes : int, optional
         Minutes to wait for exit camera before creating CSV without license match.
+    max_csv_bytes : int, optional
+        Size at which the daily CSV is completed and a new file started.
+    save_root : str, optional
+        Base directory for the CSV files and the WAL.
+    verbose : bool, optional
+        Print a line per received event.
     """
-    # Use original location name for directory paths
-    save_dir = os.path.join("saved_data", location, "csv")
-    os.makedirs(save_dir, exist_ok=True)
-
-    # Events waiting for completion: {(class_id, direction, timestamp_rounded): event_data}
-    pending_events = {}
-    csv_rows = []
-    last_flush = time.time()
-    timeout_seconds = timeout_minutes * 60
-
-    def _get_time_bucket(timestamp_str, bucket_minutes=5):
-        """Round timestamp to nearest bucket for matching."""
-        try:
-            ts = time.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-            epoch = time.mktime(ts)
-            bucket_epoch = (epoch // (bucket_minutes * 60)) * (bucket_minutes * 60)
-            return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(bucket_epoch))
-        except:
-            return timestamp_str
-
-    def flush_rows():
-        nonlocal csv_rows, last_flush
-        if not csv_rows:
-            return
-        ts = time.strftime("%Y%m%d_%H%M%S")
-        # Only sanitize the timestamp and filename parts, preserve location
-        csv_path = os.path.join(
-            save_dir,
-            f"live_{sanitize_filename(location)}_{ts}_aggregated.csv",
+
+    def __init__(
+        self,
+        location,
+        daily_counter=None,
+        daily_lock=None,
+        flush_interval=10,
+        timeout_minutes=20,
+        max_csv_bytes=20 * 1024 * 1024,
+        save_root="saved_data",
+        verbose=True,
+    ):
+        self.location = location
+        self.daily_counter = daily_counter
+        self.daily_lock = daily_lock
+        self.verbose = verbose
+
+        # Use original location name for directory paths
+        save_dir = os.path.join(save_root, location, "csv")
+        self.wal = EventWal(os.path.join(save_root, location, "wal", "aggregator.wal"))
+        # Daily rolling CSV, published with a .done marker at midnight or max_csv_bytes;
+        # every completed file is committed to the WAL before the next one is opened
+        self.csv_sink = RollingCsvSink(
+            save_dir, location, CSV_FIELDS, max_csv_bytes, flush_interval,
+            on_rotate=lambda: self.wal.log_sync(durable=True),
         )
-        pd.DataFrame(csv_rows).to_csv(csv_path, index=False, encoding="utf-8")
-        print(f"Aggregator: Saved {len(csv_rows)} records to {csv_path}")
-        csv_rows.clear()
-        last_flush = time.time()
 
-    def create_final_csv_row(cam2_event, exit_event=None):
+        # Camera 2 events waiting for completion
+        self.pending_events = PendingEventIndex(timeout_minutes * 60)
+        # Rows emitted today (stored in the WAL on compaction)
+        self.rows_day = time.strftime("%Y%m%d")
+        self.rows_today = 0
+
+        # Rebuild state from the write-ahead log
+        replay_start = time.perf_counter()
+        state = self.wal.replay(self.rows_day)
+        for seq, record in state["pending"]:
+            try:
+                evt = decode_event(record)
+            except (ValueError, struct.error) as e:
+                print(f"Aggregator: Discarding pending WAL event {seq}: {e}")
+                continue
+            evt["seq"], evt["record"] = seq, record
+            self.pending_events.add(evt, evt["timestamp"], seq)
+        missing_rows = self.csv_sink.missing_rows(state["unsynced_rows"])
+        for row in missing_rows:
+            self.csv_sink.write(row)
+        self.rows_today = state["rows_today"]
+        self._count_boats(self.rows_today)
+        self.compact_wal()
+        print(f"Aggregator: WAL replay of {state['records']} records in "
+              f"{(time.perf_counter() - replay_start) * 1000:.1f} ms - {len(self.pending_events)} pending events, "
+              f"{len(missing_rows)} rows rewritten, {self.rows_today} boats today")
+
+    def _count_boats(self, count):
+        if count and self.daily_counter is not None and self.daily_lock is not None:
+            with self.daily_lock:
+                self.daily_counter.value += count
+
+    def create_final_csv_row(self, cam2_event, exit_event=None):
         """Create final CSV row from camera 2 event and optional exit event."""
         # Choose best license text if exit event exists
         if exit_event:
@@ -110,9 +238,9 @@ def aggregator_worker(
             "class_id": cam2_event.get("class_id"),
             "class_name": cam2_event.get("class_name"),
             "direction": cam2_event.get("direction"),
-            "entry_timestamp": cam2_event.get("timestamp"),
-            "exit_timestamp": exit_event.get("timestamp") if exit_event else "timeout",
-            "location": location,  # Original location name
+            "entry_timestamp": format_timestamp(cam2_event["timestamp"]),
+            "exit_timestamp": format_timestamp(exit_event["timestamp"]) if exit_event else "timeout",
+            "location": self.location,  # Original location name
             "extracted_text": best_evt.get("extracted_text", ""),
             "identified_licence_number": best_evt.get("identified_licence_number", "no"),
             "ocr_confidence": best_evt.get("ocr_confidence", 0),
@@ -120,95 +248,142 @@ def aggregator_worker(
             "pairing_status": paired_info,
         }
 
-    def check_timeouts():
-        """Check for timed out events and create CSV rows."""
-        current_time = time.time()
-        timed_out_keys = []
-        
-        for key, event_data in pending_events.items():
-            event_time_str = event_data.get("timestamp")
-            try:
-                event_time = time.mktime(time.strptime(event_time_str, '%Y-%m-%d %H:%M:%S'))
-                if current_time - event_time > timeout_seconds:
-                    timed_out_keys.append(key)
-            except:
-                # If we can't parse the time, remove it anyway
-                timed_out_keys.append(key)
-        
-        for key in timed_out_keys:
-            event_data = pending_events.pop(key)
-            print(f"Aggregator: Timeout for event {key}, creating CSV without exit match")
-            row = create_final_csv_row(event_data)
-            csv_rows.append(row)
-            
-            # Increment daily counter for timed out boats
-            if daily_counter is not None and daily_lock is not None:
-                with daily_lock:
-                    daily_counter.value += 1
-
-    while not stop_event.is_set() or not event_queue.empty() or pending_events:
+    def emit_row(self, cam2_event, row):
+        """Log the row, append it to the CSV and count the boat."""
+        # Rotate first so the SYNC logged on rotation never covers this row
+        self.csv_sink.rotate_if_due()
+        self.wal.log_row(cam2_event["seq"], row)
+        self.csv_sink.write(row)
+
+        day = time.strftime("%Y%m%d")
+        if day != self.rows_day:
+            self.rows_day, self.rows_today = day, 0
+        self.rows_today += 1
+        self._count_boats(1)
+
+    def compact_wal(self):
+        """Replace the WAL by a snapshot once all CSV rows are on disk."""
+        self.csv_sink.sync()
+        day = time.strftime("%Y%m%d")
+        self.wal.compact(
+            [(evt["seq"], evt["record"]) for evt in self.pending_events.events()],
+            day,
+            self.rows_today if day == self.rows_day else 0,
+        )
+
+    def handle(self, record):
+        """Process one binary event record.
+
+        Returns ``"pending"``, ``"matched"``, ``"unmatched"`` or ``"invalid"``.
+        """
         try:
-            evt = event_queue.get(timeout=1)
-        except queue.Empty:
-            evt = None
+            evt = decode_event(record)
+        except (ValueError, struct.error) as e:
+            print(f"Aggregator: Discarding malformed event record: {e}")
+            return "invalid"
 
-        if evt:
-            cam = evt.get("camera")
-            direction = evt.get("direction")
-            class_id = evt.get("class_id")
-            timestamp = evt.get("timestamp")
-            time_bucket = _get_time_bucket(timestamp)
+        cam = evt.get("camera")
+        direction = evt.get("direction")
+        class_id = evt.get("class_id")
+        epoch = evt["timestamp"]
 
+        if self.verbose:
             print(f"Aggregator: Received event - Cam{cam}, Direction: {direction}, Class: {class_id}")
 
-            if cam == 2:
-                # Primary detection camera - start new tracking
-                # Key for matching: (class_id, direction, time_bucket)
-                event_key = (class_id, direction, time_bucket)
-                pending_events[event_key] = evt
-                print(f"Aggregator: Added pending event with key {event_key}")
-                
-            elif cam in [1, 3]:
-                # Exit cameras - try to match with pending camera 2 events
-                expected_direction = direction  # Use the same direction logic
-                
-                # Look for matching pending event
-                matching_key = None
-                for key in pending_events.keys():
-                    key_class, key_direction, key_time = key
-                    if (key_class == class_id and 
-                        key_direction == expected_direction and
-                        abs(time.mktime(time.strptime(timestamp, '%Y-%m-%d %H:%M:%S')) - 
-                            time.mktime(time.strptime(pending_events[key].get("timestamp"), '%Y-%m-%d %H:%M:%S'))) < timeout_seconds):
-                        matching_key = key
-                        break
-                
-                if matching_key:
-                    # Found match - create final CSV row
-                    cam2_event = pending_events.pop(matching_key)
-                    print(f"Aggregator: Found match for {matching_key} with cam{cam}")
-                    
-                    row = create_final_csv_row(cam2_event, evt)
-                    csv_rows.append(row)
-                    
-                    # Increment daily counter for completed boats
-                    if daily_counter is not None and daily_lock is not None:
-                        with daily_lock:
-                            daily_counter.value += 1
-                else:
-                    print(f"Aggregator: No matching pending event found for cam{cam} event")
+        if cam == 2:
+            # Primary detection camera - start new tracking
+            evt["seq"], evt["record"] = self.pending_events.add(evt, epoch), record
+            self.wal.log_event(evt["seq"], record)
+            if self.verbose:
+                print(f"Aggregator: Added pending event ({class_id}, {direction}), "
+                      f"{len(self.pending_events)} pending")
+            return "pending"
+
+        if cam in [1, 3]:
+            # Exit cameras - match the oldest pending camera 2 event with the
+            # same class and direction within the timeout window
+            cam2_event = self.pending_events.match(class_id, direction, epoch)
+
+            if cam2_event is not None:
+                # Found match - create final CSV row
+                if self.verbose:
+                    print(f"Aggregator: Found match for Cam2 track {cam2_event.get('track_id')} with cam{cam}")
+                self.emit_row(cam2_event, self.create_final_csv_row(cam2_event, evt))
+                return "matched"
+
+        if self.verbose:
+            print(f"Aggregator: No matching pending event found for cam{cam} event")
+        return "unmatched"
+
+    def check_timeouts(self, now=None):
+        """Check for timed out events and create CSV rows; returns their number."""
+        expired = self.pending_events.expire(time.time() if now is None else now)
+        for event_data in expired:
+            if self.verbose:
+                print(f"Aggregator: Timeout for Cam2 track {event_data.get('track_id')} "
+                      f"({format_timestamp(event_data['timestamp'])}), creating CSV without exit match")
+            self.emit_row(event_data, self.create_final_csv_row(event_data))
+        return len(expired)
+
+    def tick(self):
+        """Batched fsync, midnight rotation and WAL compaction."""
+        if self.csv_sink.tick():
+            self.wal.log_sync()
+        if self.wal.should_compact():
+            self.compact_wal()
+
+    def close(self):
+        """Process any remaining pending events as timeouts and close the files."""
+        for event_data in self.pending_events.drain():
+            self.emit_row(event_data, self.create_final_csv_row(event_data))
+
+        self.csv_sink.close()
+        self.compact_wal()
+        self.wal.close()
+
+
+def aggregator_worker(
+    event_queue,
+    location,
+    stop_event,
+    daily_counter=None,
+    daily_lock=None,
+    flush_interval=10,
+    timeout_minutes=20,
+    max_csv_bytes=20 * 1024 * 1024,
+):
+    """Aggregate events from cameras with Camera 2 as primary detection.
+
+    Parameters
+    ----------
+    event_queue : mp.Queue
+        Queue with binary event records (see ``event_schema``) from the tracking workers.
+    location : str
+        Name of the current location (original name with umlauts).
+    stop_event : mp.Event
+        Signals when the process should terminate.
+    daily_counter, daily_lock, flush_interval, timeout_minutes, max_csv_bytes
+        Passed to ``EventAggregator``.
+    """
+    aggregator = EventAggregator(
+        location, daily_counter, daily_lock, flush_interval, timeout_minutes, max_csv_bytes
+    )
+
+    while not stop_event.is_set() or not event_queue.empty() or aggregator.pending_events:
+        try:
+            record = event_queue.get(timeout=1)
+        except queue.Empty:
+            record = None
+
+        if record is not None:
+            aggregator.handle(record)
 
         # Check for timeouts periodically
-        check_timeouts()
+        aggregator.check_timeouts()
 
-        # Flush CSV if needed
-        if time.time() - last_flush >= flush_interval and csv_rows:
-            flush_rows()
+        # Batched fsync, midnight rotation and WAL compaction
+        aggregator.tick()
 
     # Final cleanup - process any remaining pending events as timeouts
-    for event_data in pending_events.values():
-        row = create_final_csv_row(event_data)
-        csv_rows.append(row)
-    
-    flush_rows()
+    aggregator.close()
     print("Aggregator: Finished processing all events")
@@ -0,0 +1,88 @@
+import time
+import threading
+
+import cv2
+
+
+class LatestFrameCapture:
+    """RTSP-Capture in einem eigenen Thread, der immer nur den neuesten Frame bereithält.
+
+    Der Thread dekodiert den Stream unabhängig vom Verarbeitungs-Loop; hängt
+    der Loop (z.B. OCR oder Inference), werden ältere Frames verworfen statt
+    sich im Decoder zu stauen. Jeder Frame trägt den Zeitstempel seiner
+    Aufnahme. ``stats`` zählt aufgenommene und verworfene Frames sowie
+    Neuverbindungen.
+    """
+
+    def __init__(self, stream_url: str, name: str = "Capture", reconnect_delay: float = 5.0):
+        self.stream_url = stream_url
+        self.name = name
+        self.reconnect_delay = reconnect_delay
+        self.stats = {'captured': 0, 'dropped': 0, 'reconnects': 0}
+
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._frame = None
+        self._timestamp = 0.0
+        self._seq = 0
+        self._read_seq = 0
+        self._thread = threading.Thread(target=self._run, name=f"{name} capture", daemon=True)
+
+    def start(self) -> "LatestFrameCapture":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        cap = None
+        while not self._stop.is_set():
+            if cap is None:
+                cap = cv2.VideoCapture(self.stream_url, cv2.CAP_FFMPEG)
+                if not cap.isOpened():
+                    print(f"{self.name}: Stream {self.stream_url} nicht erreichbar, neuer Versuch in "
+                          f"{self.reconnect_delay:.0f} s")
+                    cap.release()
+                    cap = None
+                    self._stop.wait(self.reconnect_delay)
+                    continue
+
+            ok, frame = cap.read()
+            timestamp = time.time()
+            if not ok or frame is None:
+                print(f"{self.name}: Stream unterbrochen, verbinde neu")
+                cap.release()
+                cap = None
+                self.stats['reconnects'] += 1
+                continue
+
+            with self._cond:
+                if self._seq != self._read_seq:
+                    # Vorheriger Frame wurde nie abgeholt
+                    self.stats['dropped'] += 1
+                self._frame = frame
+                self._timestamp = timestamp
+                self._seq += 1
+                self.stats['captured'] += 1
+                self._cond.notify_all()
+
+        if cap is not None:
+            cap.release()
+
+    def read(self, timeout: float = None):
+        """Wartet auf einen noch nicht gelesenen Frame.
+
+        Rückgabe: (Frame, Aufnahmezeitpunkt) oder (None, None) bei Timeout bzw. nach ``stop``.
+        """
+        with self._cond:
+            has_frame = self._cond.wait_for(
+                lambda: self._seq != self._read_seq or self._stop.is_set(), timeout
+            )
+            if not has_frame or self._seq == self._read_seq:
+                return None, None
+            self._read_seq = self._seq
+            return self._frame, self._timestamp
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout=self.reconnect_delay + 1.0)
@@ -5,6 +5,8 @@ import unicodedata
 import os
 import configparser
 
+from roi import parse_roi
+
 
 def get_available_locations(config_path: str = "config.ini") -> list:
     """Automatisch alle verfügbaren Locations aus der config.ini laden."""
@@ -13,7 +15,7 @@ def get_available_locations(config_path: str = "config.ini") -> list:
         cfg.read(config_path, encoding='utf-8')
         
         # Alle Sections außer 'email' und 'ocr_settings' sind Locations
-        excluded_sections = {'email', 'ocr_settings', 'colors', 'DEFAULT'}
+        excluded_sections = {'email', 'ocr_settings', 'performance', 'colors', 'DEFAULT'}
         locations = [section for section in cfg.sections() 
                     if section not in excluded_sections]
         
@@ -430,12 +432,15 @@ Mögliche Lösungen:
             raise ValueError(
                 f"Ungültige Orientierung '{orientation}' für orientation_{i} in Abschnitt '{location}'."
             )
+        # Optionaler Inference-Bereich (x1,y1,x2,y2 oder full), sonst Band um die Linien
+        roi = parse_roi(sec.get(f"roi_{i}"))
         streams.append(
             {
                 "url": url,
                 "line1": line1,
                 "line2": line2,
                 "orientation": orientation,
+                "roi": roi,
             }
         )
     
@@ -454,6 +459,9 @@ def load_ocr_config(path: str = "config.ini") -> dict:
         'enable_denoising': True,
         'enable_sharpening': True,
         'scale_factor': 2.0,
+        'preprocessing_contrast': 'clahe',
+        'preprocessing_denoise': 'tv_chambolle',
+        'preprocessing_threshold': 'adaptive_gaussian',
         
         # OCR-Parameter
         'min_confidence': 0.3,
@@ -471,6 +479,17 @@ def load_ocr_config(path: str = "config.ini") -> dict:
         'enable_parallel_processing': True,
         'frame_skip_threshold': 50.0,
         
+        # OCR-Kaskade
+        'ocr_early_exit_score': 0.85,
+        'ocr_time_budget_ms': 500.0,
+        'ocr_recognizer_only': False,
+        
+        # OCR-Service
+        'ocr_batch_size': 8,
+        'ocr_batch_wait_ms': 20.0,
+        'ocr_queue_size': 32,
+        'ocr_requests_per_frame': 2,
+        
         # Logging und Monitoring
         'enable_performance_logging': True,
         'enable_difficult_cases_saving': True,
@@ -485,24 +504,27 @@ def load_ocr_config(path: str = "config.ini") -> dict:
         for key in ['enable_clahe', 'enable_denoising', 'enable_sharpening', 
                    'enable_multi_frame', 'enable_gpu_acceleration', 
                    'enable_parallel_processing', 'enable_performance_logging', 
-                   'enable_difficult_cases_saving']:
+                   'enable_difficult_cases_saving', 'ocr_recognizer_only']:
             if key in ocr_sec:
                 default_ocr_settings[key] = ocr_sec.getboolean(key)
         
         # Float Werte
         for key in ['scale_factor', 'min_confidence', 'min_frame_quality', 
-                   'frame_skip_threshold']:
+                   'frame_skip_threshold', 'ocr_early_exit_score', 'ocr_time_budget_ms',
+                   'ocr_batch_wait_ms']:
             if key in ocr_sec:
                 default_ocr_settings[key] = ocr_sec.getfloat(key)
         
         # Integer Werte
         for key in ['max_ocr_attempts', 'max_frame_history', 'min_text_length', 
-                   'max_text_length']:
+                   'max_text_length', 'ocr_batch_size', 'ocr_queue_size',
+                   'ocr_requests_per_frame']:
             if key in ocr_sec:
                 default_ocr_settings[key] = ocr_sec.getint(key)
         
         # String Werte
-        for key in ['log_directory', 'difficult_cases_directory']:
+        for key in ['log_directory', 'difficult_cases_directory', 'preprocessing_contrast',
+                   'preprocessing_denoise', 'preprocessing_threshold']:
             if key in ocr_sec:
                 default_ocr_settings[key] = ocr_sec.get(key)
     
@@ -518,12 +540,78 @@ def load_ocr_config(path: str = "config.ini") -> dict:
     print(f"  - Min. Confidence: {default_ocr_settings['min_confidence']}")
     print(f"  - Frame History: {default_ocr_settings['max_frame_history']}")
     print(f"  - GPU-Beschleunigung: {default_ocr_settings['enable_gpu_acceleration']}")
+    print(f"  - OCR-Kaskade: Early Exit ab {default_ocr_settings['ocr_early_exit_score']}, "
+          f"Budget {default_ocr_settings['ocr_time_budget_ms']:.0f} ms")
     
     return default_ocr_settings
 
 
-def load_commercial_licenses() -> set:
-    """Load commercial license numbers from Azure SQL Database."""
+def load_performance_config(path: str = "config.ini") -> dict:
+    """Load runtime performance settings from config file.
+
+    Covers headless mode and preview rate, inference mode, backend and int8
+    quantization, ROI inference, the motion gate and the central engine's
+    batch wait.
+    """
+    cfg = configparser.ConfigParser()
+    cfg.read(path, encoding='utf-8')
+    
+    performance_settings = {
+        'headless': 'auto',
+        'preview_fps': 10.0,
+        'inference_mode': 'local',
+        'inference_batch_wait_ms': 10.0,
+        'motion_gate': True,
+        'idle_inference_fps': 1.0,
+        'motion_hold_seconds': 3.0,
+        'roi_inference': True,
+        'roi_margin': 0.25,
+        'inference_backend': 'pytorch',
+        'inference_int8': False,
+        'int8_calibration_dir': 'saved_data',
+    }
+    
+    if 'performance' in cfg:
+        perf_sec = cfg['performance']
+        
+        if 'headless' in perf_sec:
+            headless = perf_sec.get('headless').strip().lower()
+            if headless in ('auto', ''):
+                performance_settings['headless'] = 'auto'
+            else:
+                performance_settings['headless'] = perf_sec.getboolean('headless')
+        
+        for key in ['motion_gate', 'roi_inference', 'inference_int8']:
+            if key in perf_sec:
+                performance_settings[key] = perf_sec.getboolean(key)
+        
+        for key in ['preview_fps', 'inference_batch_wait_ms', 'idle_inference_fps', 'motion_hold_seconds',
+                   'roi_margin']:
+            if key in perf_sec:
+                performance_settings[key] = perf_sec.getfloat(key)
+        
+        if 'int8_calibration_dir' in perf_sec:
+            performance_settings['int8_calibration_dir'] = perf_sec.get('int8_calibration_dir')
+        
+        if 'inference_backend' in perf_sec:
+            performance_settings['inference_backend'] = perf_sec.get('inference_backend').strip().lower()
+        
+        if 'inference_mode' in perf_sec:
+            inference_mode = perf_sec.get('inference_mode').strip().lower()
+            if inference_mode not in ('local', 'central'):
+                print(f"Unbekannter inference_mode '{inference_mode}', verwende 'local'")
+                inference_mode = 'local'
+            performance_settings['inference_mode'] = inference_mode
+    
+    return performance_settings
+
+
+def load_commercial_licenses() -> frozenset:
+    """Load commercial license numbers from Azure SQL Database.
+
+    Returns an immutable set so that the fuzzy-match index in ``image_utils``
+    is built only once per loaded licence set and can be shared safely.
+    """
     import pyodbc
     
     plates = set()
@@ -566,7 +654,7 @@ def load_commercial_licenses() -> set:
         print(f"Error loading commercial licenses: {e}")
         print("Commercial license checking disabled.")
     
-    return plates
+    return frozenset(plates)
 
 
 def create_ocr_performance_dashboard():
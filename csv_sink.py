@@ -0,0 +1,222 @@
+import io
+import os
+import csv
+import time
+
+from image_utils import sanitize_filename
+
+PART_SUFFIX = ".part"
+DONE_SUFFIX = ".done"
+# Neben dem CSV-Verzeichnis; dorthin verschiebt Azure_blob_upload.py hochgeladene Dateien
+BACKUP_DIRNAME = "csv_backup"
+
+
+def _fsync_dir(path: str):
+    """Macht ein Umbenennen im Verzeichnis dauerhaft (unter Windows nicht möglich)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def publish_file(part_path: str) -> str:
+    """``<name>.csv.part`` atomar in ``<name>.csv`` umbenennen und ``<name>.csv.done`` anlegen.
+
+    Die Markierung entsteht erst nach dem Umbenennen: eine vorhandene
+    ``.done``-Datei bedeutet immer eine vollständige CSV.
+    """
+    final_path = part_path[:-len(PART_SUFFIX)]
+    os.replace(part_path, final_path)
+    _fsync_dir(os.path.dirname(final_path) or ".")
+    with open(final_path + DONE_SUFFIX, "w", encoding="utf-8"):
+        pass
+    return final_path
+
+
+def _truncate_partial_line(path: str):
+    """Schneidet eine beim Absturz halb geschriebene letzte Zeile ab."""
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+
+class RollingCsvSink:
+    """Tägliche CSV pro Location, Zeile für Zeile angehängt.
+
+    Geschrieben wird in ``live_<location>_<YYYYMMDD>_<HHMMSS>_aggregated.csv.part``
+    (Startzeit der Datei); jede Zeile geht sofort an das Betriebssystem, ``fsync`` höchstens alle
+    ``fsync_interval`` Sekunden. Um Mitternacht oder ab ``max_bytes`` wird die
+    Datei mit ``publish_file`` abgeschlossen und eine neue begonnen. Der
+    Uploader lädt nur abgeschlossene Dateien (mit ``.done``-Markierung) hoch.
+
+    ``on_rotate`` wird nach jedem Abschluss aufgerufen, bevor die nächste Datei
+    geöffnet wird (der Aggregator vermerkt dort einen SYNC im Write-Ahead-Log).
+    """
+
+    def __init__(self, save_dir: str, location: str, fieldnames: list,
+                 max_bytes: int = 20 * 1024 * 1024, fsync_interval: float = 10.0, on_rotate=None):
+        self.save_dir = save_dir
+        self.backup_dir = os.path.join(os.path.dirname(os.path.normpath(save_dir)), BACKUP_DIRNAME)
+        self.prefix = f"live_{sanitize_filename(location)}_"
+        self.fieldnames = list(fieldnames)
+        self.max_bytes = max_bytes
+        self.fsync_interval = fsync_interval
+        self.on_rotate = on_rotate
+        self.rows_written = 0
+
+        self._file = None
+        self._writer = None
+        self._path = None
+        self._day = None
+        self._dirty = False
+        self._last_fsync = time.time()
+
+        os.makedirs(save_dir, exist_ok=True)
+        self._recover()
+
+    def _recover(self):
+        """Reste eines vorherigen Laufs veröffentlichen: offene ``.part``-Dateien
+        und ältere CSVs ohne Markierung (aus der Zeit vor dem Sink)."""
+        for filename in sorted(os.listdir(self.save_dir)):
+            path = os.path.join(self.save_dir, filename)
+            if filename.endswith(".csv" + PART_SUFFIX):
+                _truncate_partial_line(path)
+                print(f"Aggregator: Publishing unfinished CSV {filename}")
+                publish_file(path)
+            elif filename.endswith(".csv") and not os.path.exists(path + DONE_SUFFIX):
+                with open(path + DONE_SUFFIX, "w", encoding="utf-8"):
+                    pass
+
+    def _next_path(self, stamp: str) -> str:
+        """Pfad der nächsten Datei mit Startzeit ``stamp``.
+
+        Hochgeladene Dateien liegen nicht mehr im CSV-Verzeichnis; die Startzeit
+        im Namen hält die Namen trotzdem eindeutig. Nur bei mehreren Dateien in
+        derselben Sekunde kommt ein Zähler dazu, geprüft gegen beide Verzeichnisse.
+        """
+        existing = set(os.listdir(self.save_dir))
+        if os.path.isdir(self.backup_dir):
+            existing.update(os.listdir(self.backup_dir))
+        index = 0
+        while True:
+            suffix = f"_{index}" if index else ""
+            filename = f"{self.prefix}{stamp}{suffix}_aggregated.csv"
+            if filename not in existing and filename + PART_SUFFIX not in existing:
+                return os.path.join(self.save_dir, filename + PART_SUFFIX)
+            index += 1
+
+    def _open(self, day: str):
+        self._day = day
+        self._path = self._next_path(f"{day}_{time.strftime('%H%M%S')}")
+        self._file = open(self._path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, lineterminator="\n")
+        self._writer.writeheader()
+        self._file.flush()
+        print(f"Aggregator: Writing CSV {os.path.basename(self._path)}")
+
+    def sync(self) -> bool:
+        """``fsync`` der offenen Datei; True, wenn ungesicherte Zeilen geschrieben wurden."""
+        synced = self._file is not None and self._dirty
+        if synced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._dirty = False
+        self._last_fsync = time.time()
+        return synced
+
+    def rotate(self):
+        """Aktuelle Datei abschließen und veröffentlichen (falls offen)."""
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        final_path = publish_file(self._path)
+        print(f"Aggregator: Completed CSV {os.path.basename(final_path)}")
+        self._file = self._writer = self._path = self._day = None
+        if self.on_rotate is not None:
+            self.on_rotate()
+
+    def rotate_if_due(self) -> bool:
+        """Rotiert bei Tageswechsel bzw. Größenlimit; True, wenn rotiert wurde."""
+        if self._file is None:
+            return False
+        if self._day != time.strftime("%Y%m%d") or self._file.tell() >= self.max_bytes:
+            self.rotate()
+            return True
+        return False
+
+    def write(self, row: dict):
+        """Zeile an die offene Datei anhängen (bzw. eine neue beginnen).
+
+        Rotiert selbst nicht: ``rotate_if_due`` vorher aufrufen, damit der
+        SYNC der Rotation im Write-Ahead-Log vor dem Log-Eintrag dieser Zeile
+        steht.
+        """
+        if self._file is None:
+            self._open(time.strftime("%Y%m%d"))
+        self._writer.writerow(row)
+        self._file.flush()
+        self._dirty = True
+        self.rows_written += 1
+
+    def tick(self) -> bool:
+        """Periodisch aufrufen: fälliges ``fsync`` und Rotation um Mitternacht ohne neue Zeilen.
+
+        True, wenn dabei Zeilen per ``fsync`` gesichert wurden (nicht bei einer
+        Rotation - die meldet ``on_rotate``).
+        """
+        if self._file is None or self.rotate_if_due():
+            return False
+        if self._dirty and time.time() - self._last_fsync >= self.fsync_interval:
+            return self.sync()
+        return False
+
+    @property
+    def dirty(self) -> bool:
+        """Geschriebene, aber noch nicht per ``fsync`` gesicherte Zeilen vorhanden."""
+        return self._dirty
+
+    def _render(self, row: dict) -> str:
+        buffer = io.StringIO()
+        csv.DictWriter(buffer, fieldnames=self.fieldnames, lineterminator="\n").writerow(row)
+        return buffer.getvalue()
+
+    def _latest_published(self):
+        """Zuletzt geschriebene CSV dieser Location, auch wenn sie schon in ``csv_backup`` liegt."""
+        paths = []
+        for directory in (self.save_dir, self.backup_dir):
+            if os.path.isdir(directory):
+                paths.extend(
+                    os.path.join(directory, filename) for filename in os.listdir(directory)
+                    if filename.startswith(self.prefix) and filename.endswith(".csv")
+                )
+        return max(paths, key=os.path.getmtime, default=None)
+
+    def missing_rows(self, rows: list, tail_lines: int = 1000) -> list:
+        """Zeilen aus ``rows``, die nicht am Ende der zuletzt geschriebenen CSV stehen.
+
+        Für das Replay des Write-Ahead-Logs: nach einem Prozess-Absturz sind
+        die Zeilen meist schon in der Datei, nach einem Stromausfall nicht.
+        Jede Rotation schreibt vor dem Öffnen der nächsten Datei einen SYNC ins
+        Log, die Zeilen nach dem letzten SYNC stehen also höchstens in einer
+        Datei - der neuesten, die der Uploader womöglich schon verschoben hat.
+        """
+        if not rows:
+            return []
+        existing = set()
+        path = self._latest_published()
+        if path is not None:
+            with open(path, encoding="utf-8", newline="") as f:
+                existing.update(f.readlines()[-tail_lines:])
+        return [row for row in rows if self._render(row) not in existing]
+
+    def close(self):
+        self.rotate()
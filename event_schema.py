@@ -0,0 +1,184 @@
+import re
+import time
+import struct
+
+# Version des Binärformats (erstes Byte jedes Records)
+SCHEMA_VERSION = 2
+
+# Feste Felder, little-endian:
+# Version, Kamera, Richtung, Flags, Klassen-Code, Methoden-Code, Klassen-ID, Track-ID,
+# Methoden-Variante, Methoden-Score (Tausendstel), Zeitstempel (Epoch), Confidence,
+# OCR-Confidence, OCR-Zeit, Frame-Qualität, danach die Längen der Strings, die als
+# UTF-8 hinter den festen Feldern folgen
+_HEADER = struct.Struct('<BBBBBBhiHHddddd5H')
+
+# Codes für wiederkehrende Werte; 0xFF = Wert steht als String im Record
+INLINE = 0xFF
+DIRECTIONS = ('right', 'left', 'down', 'up')
+CLASS_NAMES = (
+    'muscle_boat',
+    'passenger_boat',
+    'motorboat_with_cabin',
+    'motorboat_without_cabin',
+    'sailboat_with_cabin',
+    'sailboat_without_cabin',
+    'licence',
+)
+# Methoden-Strings aus tracking.py und image_utils.py; Platzhalter {0} ist die
+# Variante (Bild-Index bzw. Anzahl Frames), {1} der Konsens-Score
+OCR_METHODS = (
+    'no_license',
+    'error',
+    'quality_too_low',
+    'no_results',
+    'no_data',
+    'recognizer_gray',
+    'recognizer_enhanced',
+    'recognizer_threshold',
+    'recognizer_morph',
+    'standard_img{0}',
+    'detailed_img{0}',
+    'paragraph_img{0}',
+    'enhanced_img{0}',
+    'consensus_{0}frames_score{1:.3f}',
+)
+
+_FLAG_IDENTIFIED = 0x01
+
+_DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+_CLASS_CODES = {name: code for code, name in enumerate(CLASS_NAMES)}
+_METHOD_CODES = {name: code for code, name in enumerate(OCR_METHODS) if '{' not in name}
+
+
+def _template_pattern(template: str):
+    """Regex zu einer Methoden-Vorlage: {0} als Ganzzahl, {1:.3f} als Dezimalzahl."""
+    parts = re.split(r'(\{\d(?::\.3f)?\})', template)
+    return re.compile(''.join(
+        (r'(\d+\.\d{3})' if ':' in part else r'(\d+)') if part.startswith('{') else re.escape(part)
+        for part in parts
+    ))
+
+
+_METHOD_PATTERNS = [
+    (code, _template_pattern(name)) for code, name in enumerate(OCR_METHODS) if '{' in name
+]
+
+
+def _intern(value: str, codes: dict):
+    """(Code, Inline-Bytes): bekannter Wert als Code, sonst als UTF-8-String."""
+    code = codes.get(value)
+    if code is not None:
+        return code, b''
+    return INLINE, value.encode('utf-8')
+
+
+def _lookup(code: int, table: tuple, inline: bytes) -> str:
+    return inline.decode('utf-8') if code == INLINE else table[code]
+
+
+def _intern_method(method: str):
+    """(Code, Variante, Score, Inline-Bytes) einer OCR-Methode.
+
+    Nur wenn die Vorlage den String exakt wieder erzeugt, wird er codiert;
+    alles andere (z.B. Werte außerhalb des Wertebereichs) steht inline im Record.
+    """
+    code = _METHOD_CODES.get(method)
+    if code is not None:
+        return code, 0, 0, b''
+    for code, pattern in _METHOD_PATTERNS:
+        match = pattern.fullmatch(method)
+        if match is None:
+            continue
+        values = match.groups()
+        variant = int(values[0])
+        score = round(float(values[1]) * 1000) if len(values) > 1 else 0
+        if variant <= 0xFFFF and score <= 0xFFFF and _method_name(code, variant, score) == method:
+            return code, variant, score, b''
+        break
+    return INLINE, 0, 0, method.encode('utf-8')
+
+
+def _method_name(code: int, variant: int, score: int) -> str:
+    return OCR_METHODS[code].format(variant, score / 1000)
+
+
+def encode_event(camera: int, track_id: int, class_id: int, class_name: str, direction: str,
+                 timestamp: float, location: str, extracted_text: str = '', identified: bool = False,
+                 ocr_confidence: float = 0.0, confidence: float = 0.0, ocr_method: str = 'no_license',
+                 ocr_processing_time: float = 0.0, frame_quality_score: float = 0.0,
+                 preprocessing_methods: str = '') -> bytes:
+    """Packt ein Linien-Event in einen kompakten Binär-Record.
+
+    ``timestamp`` ist der Aufnahmezeitpunkt als Epoch; formatiert wird erst
+    beim Schreiben der CSV. Der Record ist unabhängig vom Transport (Queue
+    oder Socket) und beginnt immer mit ``SCHEMA_VERSION``.
+    """
+    class_code, class_inline = _intern(class_name, _CLASS_CODES)
+    method_code, method_variant, method_score, method_inline = _intern_method(ocr_method)
+    text = extracted_text.encode('utf-8')
+    loc = location.encode('utf-8')
+    prep = preprocessing_methods.encode('utf-8')
+    header = _HEADER.pack(
+        SCHEMA_VERSION,
+        camera,
+        _DIRECTION_CODES[direction],
+        _FLAG_IDENTIFIED if identified else 0,
+        class_code,
+        method_code,
+        class_id,
+        track_id,
+        method_variant,
+        method_score,
+        timestamp,
+        confidence,
+        ocr_confidence,
+        ocr_processing_time,
+        frame_quality_score,
+        len(class_inline),
+        len(method_inline),
+        len(text),
+        len(loc),
+        len(prep),
+    )
+    return b''.join((header, class_inline, method_inline, text, loc, prep))
+
+
+def decode_event(record: bytes) -> dict:
+    """Entpackt einen Record zu einem Event-Dict (``timestamp`` als Epoch-Float)."""
+    if not record or record[0] != SCHEMA_VERSION:
+        raise ValueError(f"Unbekannte Event-Schema-Version {record[0] if record else None}")
+
+    (_, camera, direction, flags, class_code, method_code, class_id, track_id,
+     method_variant, method_score, timestamp, confidence, ocr_confidence, ocr_processing_time, frame_quality_score,
+     *lengths) = _HEADER.unpack_from(record)
+
+    strings = []
+    offset = _HEADER.size
+    for length in lengths:
+        strings.append(bytes(record[offset:offset + length]))
+        offset += length
+    class_inline, method_inline, text, loc, prep = strings
+
+    return {
+        'camera': camera,
+        'track_id': track_id,
+        'class_id': class_id,
+        'class_name': _lookup(class_code, CLASS_NAMES, class_inline),
+        'direction': DIRECTIONS[direction],
+        'timestamp': timestamp,
+        'location': loc.decode('utf-8'),
+        'extracted_text': text.decode('utf-8'),
+        'identified_licence_number': 'yes' if flags & _FLAG_IDENTIFIED else 'no',
+        'ocr_confidence': ocr_confidence,
+        'confidence': confidence,
+        'ocr_method_used': (method_inline.decode('utf-8') if method_code == INLINE
+                            else _method_name(method_code, method_variant, method_score)),
+        'ocr_processing_time': ocr_processing_time,
+        'frame_quality_score': frame_quality_score,
+        'preprocessing_methods': prep.decode('utf-8'),
+    }
+
+
+def format_timestamp(epoch: float) -> str:
+    """Zeitstempel für die CSV (lokale Zeit, wie bisher ``%Y-%m-%d %H:%M:%S``)."""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(epoch))
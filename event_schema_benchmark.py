@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark des Event-Schemas
+
+Vergleicht den bisherigen Event-Dict (formatierter Zeitstempel, 16 Felder mit
+String-Schlüsseln) mit dem Binär-Record aus ``event_schema.py`` auf dem Weg
+Track-Worker -> Queue -> Aggregator: Größe nach ``pickle`` und Zeit für einen
+kompletten Round-Trip (erzeugen, pickeln, entpickeln, auswerten).
+"""
+
+import time
+import pickle
+import random
+import argparse
+
+from event_schema import CLASS_NAMES, DIRECTIONS, SCHEMA_VERSION, decode_event, encode_event, format_timestamp
+
+
+def sample_events(count: int, seed: int = 0) -> list:
+    """Zufällige, realistische Event-Felder (Kennzeichen, Methoden, Zeitstempel)."""
+    rng = random.Random(seed)
+    start = time.time()
+    methods = ['recognizer_gray', 'recognizer_threshold', 'standard_img0', 'detailed_img1',
+               'consensus_3frames_score0.912']
+    events = []
+    for i in range(count):
+        has_text = rng.random() < 0.6
+        events.append({
+            'camera': rng.randint(1, 3),
+            'track_id': rng.randint(1, 5000),
+            'class_id': rng.randrange(len(CLASS_NAMES) - 1),
+            'direction': rng.choice(DIRECTIONS),
+            'timestamp': start + i * 7.5,
+            'location': 'Fürstenberg',
+            'extracted_text': f"B {rng.randint(100, 9999)}" if has_text else '',
+            'identified': has_text and rng.random() < 0.3,
+            'ocr_confidence': rng.random() if has_text else 0.0,
+            'confidence': rng.uniform(0.5, 1.0),
+            'ocr_method': rng.choice(methods) if has_text else 'no_license',
+            'ocr_processing_time': rng.uniform(0.0, 0.5),
+            'frame_quality_score': rng.uniform(50.0, 400.0),
+            'preprocessing_methods': 'clahe,tv_chambolle,adaptive_gaussian' if has_text else '',
+        })
+    return events
+
+
+def legacy_event(fields: dict) -> dict:
+    """Event im bisherigen Dict-Format des Track-Workers."""
+    return {
+        'camera': fields['camera'],
+        'track_id': fields['track_id'],
+        'class_id': fields['class_id'],
+        'class_name': CLASS_NAMES[fields['class_id']],
+        'direction': fields['direction'],
+        'timestamp': format_timestamp(fields['timestamp']),
+        'location': fields['location'],
+        'extracted_text': fields['extracted_text'],
+        'identified_licence_number': 'yes' if fields['identified'] else 'no',
+        'ocr_confidence': fields['ocr_confidence'],
+        'confidence': fields['confidence'],
+        'ocr_method_used': fields['ocr_method'],
+        'ocr_processing_time': fields['ocr_processing_time'],
+        'frame_quality_score': fields['frame_quality_score'],
+        'preprocessing_methods': fields['preprocessing_methods'],
+    }
+
+
+def record_event(fields: dict) -> bytes:
+    return encode_event(class_name=CLASS_NAMES[fields['class_id']], **fields)
+
+
+def legacy_receive(payload: bytes) -> float:
+    """Aggregator-Seite bisher: Dict entpickeln und Zeitstempel zurückparsen."""
+    evt = pickle.loads(payload)
+    return time.mktime(time.strptime(evt['timestamp'], '%Y-%m-%d %H:%M:%S'))
+
+
+def record_receive(payload: bytes) -> float:
+    return decode_event(pickle.loads(payload))['timestamp']
+
+
+def round_trip(events: list, build, receive, repeat: int):
+    """(Bytes pro Event nach pickle, Mikrosekunden pro Round-Trip)."""
+    size = sum(len(pickle.dumps(build(fields), pickle.HIGHEST_PROTOCOL)) for fields in events) / len(events)
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for fields in events:
+            receive(pickle.dumps(build(fields), pickle.HIGHEST_PROTOCOL))
+    elapsed = time.perf_counter() - start_time
+    return size, elapsed / (repeat * len(events)) * 1e6
+
+
+def main():
+    """Hauptfunktion für Command-Line Interface."""
+    parser = argparse.ArgumentParser(description='Benchmark des Event-Schemas (Dict vs. Binär-Record)')
+    parser.add_argument('--events', type=int, default=1000,
+                       help='Anzahl synthetischer Events')
+    parser.add_argument('--repeat', type=int, default=20,
+                       help='Wiederholungen des Round-Trips')
+    args = parser.parse_args()
+
+    events = sample_events(args.events)
+    # Vorab prüfen, dass der Record verlustfrei ist
+    for fields in events:
+        decoded = decode_event(record_event(fields))
+        assert decoded['timestamp'] == fields['timestamp']
+        assert decoded['ocr_method_used'] == fields['ocr_method']
+
+    legacy_size, legacy_us = round_trip(events, legacy_event, legacy_receive, args.repeat)
+    record_size, record_us = round_trip(events, record_event, record_receive, args.repeat)
+
+    print(f"\nEvent-Transport ({args.events} Events, {args.repeat} Wiederholungen)")
+    print("-" * 60)
+    print(f"{'dict (bisher)':<16} {legacy_size:7.1f} Bytes  {legacy_us:7.2f} µs/Event")
+    print(f"{f'record v{SCHEMA_VERSION}':<16} {record_size:7.1f} Bytes  {record_us:7.2f} µs/Event")
+    print(f"Ersparnis: {1 - record_size / legacy_size:.0%} Bytes, x{legacy_us / record_us:.2f} schneller")
+
+
+if __name__ == "__main__":
+    main()
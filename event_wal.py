@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import zlib
+import struct
+
+# Record-Kopf: Typ, Länge und CRC32 der Nutzdaten
+_RECORD = struct.Struct('<BII')
+_SEQ = struct.Struct('<q')
+
+# Record-Typen
+EVENT = 1    # Camera-2-Event wartet auf eine Exit-Kamera (Sequenznummer + event_schema-Record)
+ROW = 2      # CSV-Zeile erzeugt, Pending-Event verbraucht (JSON)
+SYNC = 3     # CSV-Datei per fsync gesichert, alle vorherigen Zeilen sind auf der Platte
+COUNTER = 4  # Tageszähler zum Zeitpunkt der Kompaktierung (JSON)
+
+
+def _fsync_dir(path: str):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class EventWal:
+    """Write-Ahead-Log des Aggregators.
+
+    Jeder angenommene Camera-2-Event und jede erzeugte CSV-Zeile wird vor der
+    Verarbeitung angehängt und per ``fsync`` gesichert; jeder Record trägt
+    eine CRC32-Prüfsumme. ``replay`` baut daraus nach einem Neustart die
+    Pending-Events, die noch nicht gesicherten CSV-Zeilen und den Tageszähler
+    wieder auf. ``compact`` ersetzt das Log atomar durch einen Snapshot des
+    aktuellen Zustands.
+    """
+
+    def __init__(self, path: str, compact_records: int = 1000, compact_interval: float = 600.0):
+        self.path = path
+        self.compact_records = compact_records
+        self.compact_interval = compact_interval
+        # Angehängte Records seit der letzten Kompaktierung
+        self.records = 0
+        self.last_compaction = time.time()
+        self._file = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _read_records(self):
+        """Gültige Records (Typ, Nutzdaten) und Länge des gültigen Teils.
+
+        Das Lesen endet am ersten unvollständigen oder beschädigten Record
+        (z.B. beim Absturz halb geschrieben).
+        """
+        records = []
+        if not os.path.exists(self.path):
+            return records, 0
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset + _RECORD.size <= len(data):
+            rtype, length, crc = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            payload = data[start:start + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break
+            records.append((rtype, payload))
+            offset = start + length
+        if offset != len(data):
+            print(f"Aggregator WAL: {len(data) - offset} beschädigte Bytes am Ende verworfen")
+        return records, offset
+
+    def replay(self, day: str = None) -> dict:
+        """Zustand aus dem Log und Öffnen zum Anhängen.
+
+        Rückgabe: ``pending`` (Liste von (Sequenznummer, Event-Record)),
+        ``unsynced_rows`` (CSV-Zeilen nach dem letzten ``SYNC``),
+        ``rows_today`` (Zeilen am Tag ``day``) und ``records``.
+        """
+        day = day or time.strftime('%Y%m%d')
+        records, valid_length = self._read_records()
+
+        pending = {}
+        unsynced_rows = []
+        rows_by_day = {}
+        for rtype, payload in records:
+            if rtype == EVENT:
+                seq, = _SEQ.unpack_from(payload)
+                pending[seq] = payload[_SEQ.size:]
+            elif rtype == ROW:
+                entry = json.loads(payload)
+                pending.pop(entry['seq'], None)
+                rows_by_day[entry['day']] = rows_by_day.get(entry['day'], 0) + 1
+                unsynced_rows.append(entry['row'])
+            elif rtype == SYNC:
+                unsynced_rows.clear()
+            elif rtype == COUNTER:
+                entry = json.loads(payload)
+                rows_by_day = {entry['day']: entry['rows']}
+
+        if os.path.exists(self.path):
+            with open(self.path, 'rb+') as f:
+                f.truncate(valid_length)
+        self._file = open(self.path, 'ab')
+        self.records = len(records)
+
+        return {
+            'pending': sorted(pending.items()),
+            'unsynced_rows': unsynced_rows,
+            'rows_today': rows_by_day.get(day, 0),
+            'records': len(records),
+        }
+
+    @staticmethod
+    def _encode(rtype: int, payload: bytes) -> bytes:
+        return _RECORD.pack(rtype, len(payload), zlib.crc32(payload)) + payload
+
+    def _append(self, rtype: int, payload: bytes, sync: bool = True):
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+        self._file.write(self._encode(rtype, payload))
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        self.records += 1
+
+    def log_event(self, seq: int, record: bytes):
+        """Camera-2-Event (``event_schema``-Record), bevor es in die Pending-Events kommt."""
+        self._append(EVENT, _SEQ.pack(seq) + record)
+
+    def log_row(self, seq: int, row: dict):
+        """CSV-Zeile für das Pending-Event ``seq``, bevor sie geschrieben wird."""
+        entry = {'seq': seq, 'day': time.strftime('%Y%m%d'), 'row': row}
+        self._append(ROW, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def log_sync(self, durable: bool = False):
+        """Alle bisherigen Zeilen sind per fsync in der CSV.
+
+        Nach einem periodischen fsync ohne eigenes fsync: fehlt der Record,
+        werden die Zeilen beim Replay nur erneut geprüft. Bei einer Rotation
+        ``durable=True``, bevor die nächste Datei geöffnet wird.
+        """
+        self._append(SYNC, b'', sync=durable)
+
+    def should_compact(self) -> bool:
+        return self.records >= self.compact_records or (
+            self.records > 0 and time.time() - self.last_compaction >= self.compact_interval
+        )
+
+    def compact(self, pending: list, day: str, rows_today: int):
+        """Log atomar durch Tageszähler und Pending-Events ersetzen.
+
+        Nur aufrufen, wenn alle CSV-Zeilen gesichert sind.
+        """
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self._encode(COUNTER, json.dumps({'day': day, 'rows': rows_today}).encode('utf-8')))
+            for seq, record in pending:
+                f.write(self._encode(EVENT, _SEQ.pack(seq) + record))
+            f.flush()
+            os.fsync(f.fileno())
+        if self._file is not None:
+            self._file.close()
+        os.replace(tmp_path, self.path)
+        _fsync_dir(os.path.dirname(self.path) or ".")
+        self._file = open(self.path, 'ab')
+        self.records = 0
+        self.last_compaction = time.time()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
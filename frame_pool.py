@@ -0,0 +1,55 @@
+class FramePool:
+    """Referenzgezählte Frames eines Tracking-Workers.
+
+    Frames werden ohne Kopie aufgenommen und schreibgeschützt markiert; Tracks
+    halten nur die Referenz (Index) auf ihren letzten Frame. Ein Frame wird
+    freigegeben, sobald ihn niemand mehr referenziert. Pixel werden erst
+    kopiert, wenn ein Event sie wirklich über die Frame-Lebensdauer hinaus braucht.
+    """
+
+    def __init__(self):
+        self.frames = {}
+        self.refcounts = {}
+        self.next_ref = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def add(self, frame) -> int:
+        """Nimmt einen Frame auf (Referenzzähler 1 für den aktuellen Frame-Durchlauf)."""
+        ref = self.next_ref
+        self.next_ref += 1
+        # Schutz gegen versehentliches Zeichnen in den Original-Frame
+        frame.flags.writeable = False
+        self.frames[ref] = frame
+        self.refcounts[ref] = 1
+        return ref
+
+    def acquire(self, ref) -> int:
+        """Zusätzliche Referenz auf einen Frame (z.B. für einen Track)."""
+        self.refcounts[ref] += 1
+        return ref
+
+    def release(self, ref):
+        """Gibt eine Referenz frei; der Frame verschwindet mit der letzten."""
+        if ref is None or ref not in self.refcounts:
+            return
+        self.refcounts[ref] -= 1
+        if self.refcounts[ref] <= 0:
+            del self.refcounts[ref]
+            del self.frames[ref]
+
+    def get(self, ref):
+        """Frame ohne Kopie (schreibgeschützt) oder None."""
+        return self.frames.get(ref)
+
+    def copy(self, ref):
+        """Beschreibbare Kopie eines Frames, nur für Daten, die den Frame überleben."""
+        frame = self.frames.get(ref)
+        return None if frame is None else frame.copy()
+
+    def get_stats(self) -> dict:
+        return {
+            'frames': len(self.frames),
+            'references': sum(self.refcounts.values()),
+        }
@@ -0,0 +1,239 @@
+import json
+import time
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+
+# Header: [Slots, Höhe, Breite, Kanäle, letzter Slot, Anzahl Schreibvorgänge]
+_HEADER_FIELDS = 6
+_HEADER_BYTES = 64
+# Platz für die Objektliste (JSON) pro Slot
+OBJECTS_BYTES = 16 * 1024
+
+
+def frame_ring_name(prefix: str, cam_idx: int) -> str:
+    """Name des Shared-Memory-Segments einer Kamera."""
+    return f"{prefix}_cam{cam_idx}"
+
+
+def _open_untracked(name: str):
+    """Öffnet ein bestehendes Segment, ohne es dem resource_tracker zu überlassen.
+
+    Ab Python 3.13 über ``track=False``. Davor registriert ``SharedMemory``
+    jedes geöffnete Segment. Per "spawn" gestartete Worker teilen sich aber den
+    resource_tracker des Hauptprozesses, und dort ist das Segment schon vom
+    Schreiber registriert; ein ``unregister`` im Leser würde diese
+    Registrierung entfernen. Abgemeldet wird daher nur in Prozessen mit eigenem
+    Tracker (ohne Elternprozess). Ein Leser-Worker hinterlässt so einen
+    doppelten Eintrag im gemeinsamen Tracker - harmlos, denn der Tracker führt
+    die Namen als Menge und räumt erst beim Ende des Hauptprozesses auf.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    shm = shared_memory.SharedMemory(name=name)
+    if multiprocessing.parent_process() is None:
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
+class FrameRing:
+    """Ringpuffer für Kamera-Frames in ``multiprocessing.shared_memory``.
+
+    Ein Tracking-Worker schreibt (``create``/``write``), die anderen lesen
+    (``attach``/``read_latest``). Jeder Slot hat eine Sequenznummer nach dem
+    Seqlock-Prinzip: ungerade während des Schreibens, danach gerade. Leser
+    erkennen so einen zerrissenen Lesezugriff (``is_intact``), ohne dass der
+    Schreiber je blockiert oder Frames serialisiert werden.
+    """
+
+    def __init__(self, shm, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.name = shm.name
+
+        buf = shm.buf
+        self.header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=buf, offset=0)
+        slots, height, width, channels = (int(value) for value in self.header[:4])
+        self.slots = slots
+        self.frame_shape = (height, width, channels) if channels > 1 else (height, width)
+
+        offset = _HEADER_BYTES
+        self.seqs = np.ndarray((slots,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += slots * 8
+        self.timestamps = np.ndarray((slots,), dtype=np.float64, buffer=buf, offset=offset)
+        offset += slots * 8
+        self.object_lengths = np.ndarray((slots,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += slots * 8
+        self.objects = np.ndarray((slots, OBJECTS_BYTES), dtype=np.uint8, buffer=buf, offset=offset)
+        offset += slots * OBJECTS_BYTES
+        self.frames = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=buf, offset=offset)
+
+    @staticmethod
+    def _size(slots: int, frame_shape) -> int:
+        frame_bytes = int(np.prod(frame_shape))
+        return _HEADER_BYTES + slots * (3 * 8 + OBJECTS_BYTES + frame_bytes)
+
+    @classmethod
+    def create(cls, name: str, frame_shape, slots: int = 4) -> "FrameRing":
+        """Legt den Ringpuffer an (Schreiber). Reste eines abgestürzten Laufs werden ersetzt."""
+        try:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls._size(slots, frame_shape))
+        height, width = frame_shape[:2]
+        channels = frame_shape[2] if len(frame_shape) == 3 else 1
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf, offset=0)
+        header[:] = (slots, height, width, channels, -1, 0)
+        ring = cls(shm, owner=True)
+        ring.seqs[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str):
+        """Verbindet sich mit einem bestehenden Ringpuffer (Leser) oder liefert None."""
+        try:
+            shm = _open_untracked(name)
+        except FileNotFoundError:
+            return None
+
+        if shm.size < _HEADER_BYTES or np.ndarray((1,), dtype=np.int64, buffer=shm.buf)[0] <= 0:
+            shm.close()
+            return None
+        return cls(shm, owner=False)
+
+    @property
+    def write_count(self) -> int:
+        """Anzahl bisheriger Schreibvorgänge; Leser erkennen daran neue Frames."""
+        return int(self.header[5])
+
+    def write(self, frame, objects, timestamp: float = None) -> bool:
+        """Schreibt einen Frame samt Objektliste in den nächsten Slot."""
+        if frame.shape != self.frame_shape:
+            return False
+
+        payload = json.dumps(objects).encode("utf-8")
+        if len(payload) > OBJECTS_BYTES:
+            payload = b"[]"
+
+        slot = (int(self.header[4]) + 1) % self.slots
+        self.seqs[slot] += 1  # ungerade: Slot wird beschrieben
+        self.frames[slot] = frame
+        self.objects[slot, :len(payload)] = np.frombuffer(payload, dtype=np.uint8)
+        self.object_lengths[slot] = len(payload)
+        self.timestamps[slot] = time.time() if timestamp is None else timestamp
+        self.seqs[slot] += 1  # gerade: Slot konsistent
+        self.header[4] = slot
+        self.header[5] += 1
+        return True
+
+    def read_latest(self, copy: bool = False, retries: int = 3):
+        """Liest den neuesten Slot.
+
+        Ohne ``copy`` ist ``frame`` eine Sicht direkt in den Shared Memory; nach
+        der Verwendung mit ``is_intact`` prüfen. Mit ``copy`` wird kopiert und
+        sofort geprüft. Rückgabe: dict mit frame, objects, timestamp, slot, seq
+        oder None.
+        """
+        for _ in range(retries):
+            slot = int(self.header[4])
+            if slot < 0:
+                return None
+            seq = int(self.seqs[slot])
+            if seq % 2:
+                continue
+
+            length = int(self.object_lengths[slot])
+            snapshot = {
+                'frame': self.frames[slot].copy() if copy else self.frames[slot],
+                'objects': json.loads(self.objects[slot, :length].tobytes().decode("utf-8")) if length else [],
+                'timestamp': float(self.timestamps[slot]),
+                'slot': slot,
+                'seq': seq,
+            }
+            if self.is_intact(snapshot):
+                return snapshot
+        return None
+
+    def is_intact(self, snapshot) -> bool:
+        """True, wenn der Slot seit dem Lesen nicht überschrieben wurde."""
+        return int(self.seqs[snapshot['slot']]) == snapshot['seq']
+
+    def close(self):
+        """Trennt die Verbindung; der Schreiber entfernt das Segment zusätzlich."""
+        self.header = self.seqs = self.timestamps = self.object_lengths = None
+        self.objects = self.frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Noch gehaltene Zero-Copy-Sichten; das Mapping endet mit dem Prozess
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class FrameRingReader:
+    """Liest neue Frames aus dem Ring eines anderen Prozesses (neuester Frame gewinnt).
+
+    Verbindet sich selbstständig, sobald der Ring existiert, und neu, wenn er
+    ``stale_after`` Sekunden nicht beschrieben wurde (z.B. Schreiber neu
+    gestartet). ``skipped`` zählt Frames, die überschrieben wurden, bevor sie
+    gelesen werden konnten.
+    """
+
+    def __init__(self, name: str, stale_after: float = 5.0):
+        self.name = name
+        self.stale_after = stale_after
+        self.ring = None
+        self.last_count = 0
+        self.last_key = None
+        self.last_update = time.time()
+        self.skipped = 0
+
+    def poll(self, copy: bool = True):
+        """Neuer Snapshot (siehe ``FrameRing.read_latest``) oder None, wenn nichts Neues da ist."""
+        now = time.time()
+        if self.ring is None:
+            self.ring = FrameRing.attach(self.name)
+            if self.ring is None:
+                return None
+            self.last_count = 0
+            self.last_key = None
+            self.last_update = now
+
+        count = self.ring.write_count
+        if count == self.last_count:
+            if now - self.last_update > self.stale_after:
+                self.close()
+            return None
+        if count < self.last_count:
+            self.last_count = 0
+
+        snapshot = self.ring.read_latest(copy=copy)
+        if snapshot is None or (snapshot['slot'], snapshot['seq']) == self.last_key:
+            return None
+        if self.last_count:
+            self.skipped += max(0, count - self.last_count - 1)
+        self.last_count = count
+        self.last_key = (snapshot['slot'], snapshot['seq'])
+        self.last_update = now
+        return snapshot
+
+    def close(self):
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
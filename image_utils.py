@@ -34,32 +34,264 @@ class OCRResult:
     final_score: float
 
 
+def _char_counts(text: str) -> Dict[str, int]:
+    """Zeichen-Multimenge eines Strings."""
+    counts = defaultdict(int)
+    for char in text:
+        counts[char] += 1
+    return counts
+
+
+class LicenseMatchIndex:
+    """Vorberechneter Zeichen-Index über die gewerblichen Kennzeichen.
+
+    Ersetzt den linearen ``SequenceMatcher``-Scan in
+    ``SmartOCRValidator.similarity_matching_enhanced``. Für eine Ratio > 0.75
+    müssen mindestens ``M_min`` Zeichen übereinstimmen; diese Schranke gilt
+    auch für die Zeichen-Multimenge (``quick_ratio``). Über Postings je
+    (Zeichen, Vorkommen, Länge) und einen Präfix-Filter auf den seltensten
+    Zeichen der Anfrage werden nur Kennzeichen angefasst, die sie erreichen
+    können; die Multimengen-Schnittmenge wird per Bit-Signatur geprüft und nur
+    die verbleibenden Kandidaten werden exakt wie bisher bewertet. Match und
+    Ratio sind damit identisch zum linearen Scan.
+    """
+
+    MIN_RATIO = 0.75
+
+    def __init__(self, licenses):
+        # Reihenfolge einfrieren: bei gleicher Ratio gewinnt wie bisher das
+        # zuerst iterierte Kennzeichen
+        self.licenses = list(licenses)
+        self._folds = {
+            TextType.LICENSE_PLATE: self._build(str.upper),
+            TextType.BOAT_NAME: self._build(str.lower),
+        }
+
+    def __len__(self):
+        return len(self.licenses)
+
+    def _build(self, fold) -> Dict:
+        keys = [fold(license_num) for license_num in self.licenses]
+        key_chars = [_char_counts(key) for key in keys]
+
+        # Bit-Signatur: jedes Zeichen bekommt so viele Bits wie sein maximales
+        # Vorkommen, popcount(a & b) ist dann die Größe der Multimengen-Schnittmenge
+        widths = defaultdict(int)
+        for counts in key_chars:
+            for char, count in counts.items():
+                widths[char] = max(widths[char], count)
+        slots = {}
+        offset = 0
+        for char, width in widths.items():
+            slots[char] = (offset, width)
+            offset += width
+
+        exact = {}
+        lengths = set()
+        signatures = []
+        # Postings je (Zeichen, Vorkommen, Länge), damit der Präfix-Filter pro
+        # Längen-Bucket greift
+        postings = defaultdict(list)
+        irregular = []
+
+        for idx, (license_num, key, counts) in enumerate(zip(self.licenses, keys, key_chars)):
+            exact.setdefault(key, idx)
+            lengths.add(len(key))
+            # Kennzeichen, deren Länge sich durch upper()/lower() ändert (z.B. 'ß'),
+            # werden immer exakt geprüft
+            if len(key) != len(license_num):
+                irregular.append(idx)
+            signatures.append(self._signature(counts, slots))
+            for char, count in counts.items():
+                for occurrence in range(1, count + 1):
+                    postings[(char, occurrence, len(key))].append(idx)
+
+        return {
+            'fold': fold,
+            'keys': keys,
+            'slots': slots,
+            'signatures': signatures,
+            'exact': exact,
+            'lengths': sorted(lengths),
+            'postings': dict(postings),
+            'irregular': irregular,
+        }
+
+    @staticmethod
+    def _signature(counts: Dict[str, int], slots: Dict[str, Tuple[int, int]]) -> int:
+        signature = 0
+        for char, count in counts.items():
+            slot = slots.get(char)
+            if slot is not None:
+                offset, width = slot
+                signature |= ((1 << min(count, width)) - 1) << offset
+        return signature
+
+    @staticmethod
+    def _min_matches(len_a: int, len_b: int) -> int:
+        """Kleinste Trefferzahl M mit 2*M/(la+lb) > 0.75."""
+        # Gilt auch für den Zeichenvergleich bei gleicher Länge: matches/L > 0.75
+        return 3 * (len_a + len_b) // 8 + 1
+
+    def _candidates(self, key: str, index: Dict) -> Dict[int, float]:
+        """Kandidaten mit oberer Schranke ihrer Ratio."""
+        # Irreguläre Kennzeichen ohne gültige Schranke immer prüfen
+        candidates = dict.fromkeys(index['irregular'], 1.0)
+        postings = index['postings']
+        signatures = index['signatures']
+        query_chars = _char_counts(key)
+        query_signature = self._signature(query_chars, index['slots'])
+        items = [(char, occurrence) for char, count in query_chars.items()
+                 for occurrence in range(1, count + 1)]
+
+        for len_b in index['lengths']:
+            min_matches = self._min_matches(len(key), len_b)
+            if min_matches > min(len(key), len_b):
+                continue
+
+            # Präfix-Filter: wer mindestens M_min Zeichen teilt, teilt eines der
+            # (la - M_min + 1) seltensten Zeichen der Anfrage
+            bucket_items = sorted(items, key=lambda item: len(postings.get((*item, len_b), ())))
+            seen = set()
+            for char, occurrence in bucket_items[:len(items) - min_matches + 1]:
+                for idx in postings.get((char, occurrence, len_b), ()):
+                    if idx in seen:
+                        continue
+                    seen.add(idx)
+                    shared = (signatures[idx] & query_signature).bit_count()
+                    if shared >= min_matches:
+                        candidates[idx] = 2.0 * shared / (len(key) + len_b)
+
+        return candidates
+
+    def best_match(self, text: str, text_type: TextType) -> Tuple[str, float]:
+        """Bester Treffer mit Ratio > 0.75, sonst ``(text, 0.0)``."""
+        if not text or not self.licenses:
+            return text, 0.0
+
+        is_license = text_type == TextType.LICENSE_PLATE
+        index = self._folds[TextType.LICENSE_PLATE if is_license else TextType.BOAT_NAME]
+        key = index['fold'](text)
+
+        if len(key) != len(text):
+            # Sonderfall: Faltung ändert die Länge - linearer Scan bleibt exakt
+            candidates = dict.fromkeys(range(len(self.licenses)), 1.0)
+        else:
+            exact_idx = index['exact'].get(key)
+            if exact_idx is not None and not index['irregular']:
+                return self.licenses[exact_idx], 1.0
+            candidates = self._candidates(key, index)
+
+        # Höchste Schranke zuerst prüfen; bei gleicher Ratio gewinnt wie im
+        # linearen Scan das Kennzeichen mit dem kleineren Index
+        best_idx = None
+        best_ratio = 0.0
+        keys = index['keys']
+        for idx, bound in sorted(candidates.items(), key=lambda item: (-item[1], item[0])):
+            if bound < best_ratio:
+                break
+
+            char_ratio = 0.0
+            if is_license and len(text) == len(self.licenses[idx]):
+                char_matches = sum(1 for a, b in zip(key, keys[idx]) if a == b)
+                char_ratio = char_matches / len(text)
+            ratio = max(difflib.SequenceMatcher(None, key, keys[idx]).ratio(), char_ratio)
+
+            if ratio <= self.MIN_RATIO:
+                continue
+            if ratio > best_ratio or (ratio == best_ratio and idx < best_idx):
+                best_ratio = ratio
+                best_idx = idx
+
+        if best_idx is None:
+            return text, 0.0
+        return self.licenses[best_idx], best_ratio
+
+
+_LICENSE_INDEX_CACHE: Dict[frozenset, LicenseMatchIndex] = {}
+
+
+def get_license_match_index(commercial_licenses) -> Optional[LicenseMatchIndex]:
+    """Liefert den (einmalig gebauten) Index für ein Kennzeichen-Set."""
+    if not commercial_licenses:
+        return None
+    key = commercial_licenses if isinstance(commercial_licenses, frozenset) else frozenset(commercial_licenses)
+    index = _LICENSE_INDEX_CACHE.get(key)
+    if index is None:
+        start_time = time.time()
+        index = LicenseMatchIndex(key)
+        # Nur wenige Kennzeichen-Versionen gleichzeitig im Speicher halten
+        if len(_LICENSE_INDEX_CACHE) >= 4:
+            _LICENSE_INDEX_CACHE.pop(next(iter(_LICENSE_INDEX_CACHE)))
+        _LICENSE_INDEX_CACHE[key] = index
+        print(f"Kennzeichen-Index aufgebaut: {len(index)} Einträge in {time.time() - start_time:.3f}s")
+    return index
+
+
+# Deutsche Bootsnamen-Patterns (erweitert)
+BOAT_NAME_PATTERNS = (
+    r'^[A-Z]{2,4}\s*\d{1,4}$',        # MS 123, ABC 1234
+    r'^[A-Z][a-z]+\s*\d*$',           # Marina, Seeadler
+    r'^[A-Z][a-z]+\s+[A-Z][a-z]+$',   # Blaue Adria
+    r'^[A-Z]{2,8}$',                  # NORDWIND
+    r'^\d{1,4}\s*[A-Z]{2,4}$',       # 123 MS
+    r'^[A-Z][a-z]+\s+[IV]+$',        # Maria II
+)
+
+# Erweiterte Kennzeichen-Patterns für deutsche Bootslizenzen
+LICENSE_PATTERNS = (
+    r'^[A-Z]{1,3}-[A-Z]{1,2}\s?\d{1,4}$',     # AB-A 170
+    r'^[A-Z]{1,3}-\d{1,4}\s{0,2}V?$',         # BAR-3097 V
+    r'^\d{6}-[A-Z]$',                          # 123456-A
+    r'^[A-Z]{3}\s\d{5}$',                     # BSR 24138
+    r'^[A-Z]{3}\s\d{3}-\d{3}$',              # HST 433-100
+    r'^[A-Z]{2}\s[A-Z]\s\d{5}[A-Z]?$',       # TO E 48620F
+    r'^[A-Z]{2,4}\s?\d{2,6}[A-Z]?$',         # Allgemein flexibler
+)
+
+
+def _compile_pattern_automaton(patterns) -> "re.Pattern":
+    """Fasst Patterns zu einer Alternation mit benannten Gruppen zusammen.
+
+    Die Alternativen werden von links nach rechts probiert, ``lastgroup``
+    liefert also wie die bisherige Schleife den Index des ersten passenden
+    Patterns - mit einem einzigen Regex-Durchlauf.
+    """
+    return re.compile(
+        "|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(patterns)),
+        re.IGNORECASE,
+    )
+
+
+def _match_pattern_index(automaton: "re.Pattern", text: str) -> Optional[int]:
+    """Index des ersten passenden Patterns oder None."""
+    match = automaton.match(text)
+    if match is None:
+        return None
+    return int(match.lastgroup[1:])
+
+
+_BOAT_NAME_AUTOMATON = _compile_pattern_automaton(BOAT_NAME_PATTERNS)
+_LICENSE_AUTOMATON = _compile_pattern_automaton(LICENSE_PATTERNS)
+
+_LICENSE_PREFIX_RE = re.compile(r'^[A-Z]{1,3}-')
+_DIGIT_RUN_RE = re.compile(r'\d{3,6}')
+_CAPITALIZED_RE = re.compile(r'^[A-Z][a-z]+')
+_DIGIT_GAP_RE = re.compile(r'(\d)\s+(\w)')
+_LETTER_DIGIT_GAP_RE = re.compile(r'([A-Z])\s+(\d)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
 class SmartOCRValidator:
     """Intelligente OCR-Validierung mit korrigierter Sonderzeichen-Filterung."""
     
     def __init__(self, commercial_licenses: set = None):
         self.commercial_licenses = commercial_licenses or set()
+        self.license_index = get_license_match_index(self.commercial_licenses)
         
-        # Deutsche Bootsnamen-Patterns (erweitert)
-        self.boat_name_patterns = [
-            r'^[A-Z]{2,4}\s*\d{1,4}$',        # MS 123, ABC 1234
-            r'^[A-Z][a-z]+\s*\d*$',           # Marina, Seeadler
-            r'^[A-Z][a-z]+\s+[A-Z][a-z]+$',   # Blaue Adria
-            r'^[A-Z]{2,8}$',                  # NORDWIND
-            r'^\d{1,4}\s*[A-Z]{2,4}$',       # 123 MS
-            r'^[A-Z][a-z]+\s+[IV]+$',        # Maria II
-        ]
-        
-        # Erweiterte Kennzeichen-Patterns für deutsche Bootslizenzen
-        self.license_patterns = [
-            r'^[A-Z]{1,3}-[A-Z]{1,2}\s?\d{1,4}$',     # AB-A 170
-            r'^[A-Z]{1,3}-\d{1,4}\s{0,2}V?$',         # BAR-3097 V
-            r'^\d{6}-[A-Z]$',                          # 123456-A
-            r'^[A-Z]{3}\s\d{5}$',                     # BSR 24138
-            r'^[A-Z]{3}\s\d{3}-\d{3}$',              # HST 433-100
-            r'^[A-Z]{2}\s[A-Z]\s\d{5}[A-Z]?$',       # TO E 48620F
-            r'^[A-Z]{2,4}\s?\d{2,6}[A-Z]?$',         # Allgemein flexibler
-        ]
+        # Patterns liegen vorkompiliert als Modul-Konstanten vor (oberhalb der Klasse)
+        self.boat_name_patterns = BOAT_NAME_PATTERNS
+        self.license_patterns = LICENSE_PATTERNS
         
         # Format-spezifische Korrekturen für OCR-Fehler
         self.license_corrections = {
@@ -92,25 +324,22 @@ class SmartOCRValidator:
         
         text_clean = text.strip()
         
-        # Kennzeichen-Erkennung
+        # Kennzeichen-Erkennung (ein Durchlauf über alle Patterns)
         license_score = 0.0
-        for pattern in self.license_patterns:
-            if re.match(pattern, text_clean, re.IGNORECASE):
-                license_score = 0.9
-                break
+        if _LICENSE_AUTOMATON.match(text_clean):
+            license_score = 0.9
         
         # Zusätzliche Kennzeichen-Indikatoren
-        if re.search(r'^[A-Z]{1,3}-', text_clean):
+        has_license_prefix = _LICENSE_PREFIX_RE.search(text_clean) is not None
+        if has_license_prefix:
             license_score = max(license_score, 0.7)
-        if re.search(r'\d{3,6}', text_clean) and len(text_clean) <= 12:
+        if _DIGIT_RUN_RE.search(text_clean) and len(text_clean) <= 12:
             license_score = max(license_score, 0.6)
         
         # Bootsnamen-Erkennung
         boat_score = 0.0
-        for pattern in self.boat_name_patterns:
-            if re.match(pattern, text_clean, re.IGNORECASE):
-                boat_score = 0.8
-                break
+        if _BOAT_NAME_AUTOMATON.match(text_clean):
+            boat_score = 0.8
         
         # Erweiterte Bootsnamen-Erkennung
         text_lower = text_clean.lower()
@@ -120,7 +349,7 @@ class SmartOCRValidator:
                 break
         
         # Längere Texte sind eher Bootsnamen
-        if len(text_clean) > 8 and not re.search(r'^[A-Z]{1,3}-', text_clean):
+        if len(text_clean) > 8 and not has_license_prefix:
             boat_score = max(boat_score, 0.6)
         
         # Entscheidung basierend auf höchster Confidence
@@ -169,8 +398,8 @@ class SmartOCRValidator:
                 corrected = corrected.replace(wrong, right)
             
             # Spezielle Kennzeichen-Korrekturen
-            corrected = re.sub(r'(\d)\s+(\w)', r'\1\2', corrected)  # Lücken schließen
-            corrected = re.sub(r'([A-Z])\s+(\d)', r'\1 \2', corrected)  # Korrekte Lücken
+            corrected = _DIGIT_GAP_RE.sub(r'\1\2', corrected)  # Lücken schließen
+            corrected = _LETTER_DIGIT_GAP_RE.sub(r'\1 \2', corrected)  # Korrekte Lücken
             
         elif text_type == TextType.BOAT_NAME:
             # Bootsnamen-spezifische Korrekturen
@@ -193,7 +422,7 @@ class SmartOCRValidator:
         corrected = self.remove_invalid_special_chars(corrected, text_type)
         
         # SCHRITT 3: Mehrfache Leerzeichen normalisieren
-        corrected = re.sub(r'\s+', ' ', corrected).strip()
+        corrected = _WHITESPACE_RE.sub(' ', corrected).strip()
         
         return corrected
     
@@ -236,18 +465,17 @@ class SmartOCRValidator:
         confidence = 0.0
         
         # Pattern-Matching
-        for i, pattern in enumerate(self.license_patterns):
-            if re.match(pattern, text, re.IGNORECASE):
-                confidence = 0.9 - (i * 0.05)  # Erste Patterns haben höhere Confidence
-                details['matched_pattern'] = i
-                break
+        i = _match_pattern_index(_LICENSE_AUTOMATON, text)
+        if i is not None:
+            confidence = 0.9 - (i * 0.05)  # Erste Patterns haben höhere Confidence
+            details['matched_pattern'] = i
         
         # Zusätzliche Validierungen
-        if re.search(r'^[A-Z]{1,3}-', text):
+        if _LICENSE_PREFIX_RE.search(text):
             confidence = max(confidence, 0.7)
             details['has_prefix'] = True
         
-        if re.search(r'\d{3,6}', text):
+        if _DIGIT_RUN_RE.search(text):
             confidence = max(confidence, 0.6)
             details['has_numbers'] = True
         
@@ -266,11 +494,10 @@ class SmartOCRValidator:
         confidence = 0.0
         
         # Pattern-Matching
-        for i, pattern in enumerate(self.boat_name_patterns):
-            if re.match(pattern, text, re.IGNORECASE):
-                confidence = 0.8 - (i * 0.05)
-                details['matched_pattern'] = i
-                break
+        i = _match_pattern_index(_BOAT_NAME_AUTOMATON, text)
+        if i is not None:
+            confidence = 0.8 - (i * 0.05)
+            details['matched_pattern'] = i
         
         # Wort-basierte Erkennung
         text_lower = text.lower()
@@ -281,7 +508,7 @@ class SmartOCRValidator:
                 break
         
         # Struktur-Validierung
-        if re.search(r'^[A-Z][a-z]+', text):  # Kapitalisiert
+        if _CAPITALIZED_RE.search(text):  # Kapitalisiert
             confidence += 0.1
             details['properly_capitalized'] = True
         
@@ -297,34 +524,14 @@ class SmartOCRValidator:
         return confidence > 0.4, confidence, details
     
     def similarity_matching_enhanced(self, text: str, text_type: TextType) -> Tuple[str, float]:
-        """Erweiterte Ähnlichkeitssuche mit bekannten Lizenzen."""
+        """Erweiterte Ähnlichkeitssuche mit bekannten Lizenzen (über ``LicenseMatchIndex``:
+        Zeichen-Postings mit Präfix-Filter und Multimengen-Signatur)."""
         if not text or not self.commercial_licenses:
             return text, 0.0
         
-        best_match = text
-        best_ratio = 0.0
-        
-        # Verschiedene Matching-Strategien je nach Text-Typ
-        for license_num in self.commercial_licenses:
-            if text_type == TextType.LICENSE_PLATE:
-                # Exakte und fuzzy Matches für Kennzeichen
-                ratio = difflib.SequenceMatcher(None, text.upper(), license_num.upper()).ratio()
-                
-                # Zusätzlich: Levenshtein-ähnliche Bewertung
-                if len(text) == len(license_num):
-                    char_matches = sum(1 for a, b in zip(text.upper(), license_num.upper()) if a == b)
-                    char_ratio = char_matches / len(text)
-                    ratio = max(ratio, char_ratio)
-                
-            else:
-                # Für Bootsnamen: Lockerere Ähnlichkeits-Kriterien
-                ratio = difflib.SequenceMatcher(None, text.lower(), license_num.lower()).ratio()
-            
-            if ratio > best_ratio and ratio > 0.75:  # Höhere Schwelle für bessere Qualität
-                best_ratio = ratio
-                best_match = license_num
-        
-        return best_match, best_ratio
+        # Kennzeichen: SequenceMatcher + Zeichenvergleich bei gleicher Länge,
+        # Bootsnamen: lockerer Vergleich in Kleinschreibung; Schwelle jeweils 0.75
+        return self.license_index.best_match(text, text_type)
     
     def calculate_comprehensive_score(self, ocr_result: OCRResult) -> float:
         """Berechnet einen umfassenden Score für das OCR-Ergebnis."""
@@ -460,6 +667,28 @@ class SmartOCRValidator:
         return " | ".join(summary_parts)
 
 
+_VALIDATOR_CACHE: Dict[frozenset, SmartOCRValidator] = {}
+
+
+def get_shared_validator(commercial_licenses=None) -> SmartOCRValidator:
+    """Prozessweit geteilter SmartOCRValidator je Kennzeichen-Set-Version.
+
+    Der Validator ist zustandslos; Patterns und Kennzeichen-Index werden so
+    einmal pro Worker aufgebaut statt bei jedem OCR-Aufruf. Als Version dient
+    das eingefrorene Kennzeichen-Set (``frozenset`` cached seinen Hash).
+    """
+    licenses = commercial_licenses or frozenset()
+    version = licenses if isinstance(licenses, frozenset) else frozenset(licenses)
+    validator = _VALIDATOR_CACHE.get(version)
+    if validator is None:
+        # Nur wenige Kennzeichen-Versionen gleichzeitig im Speicher halten
+        if len(_VALIDATOR_CACHE) >= 4:
+            _VALIDATOR_CACHE.pop(next(iter(_VALIDATOR_CACHE)))
+        validator = SmartOCRValidator(version)
+        _VALIDATOR_CACHE[version] = validator
+    return validator
+
+
 # ========================================================================================
 # LEGACY-FUNKTIONEN FÜR KOMPATIBILITÄT (unverändert - bleiben bestehen)
 # ========================================================================================
@@ -496,99 +725,440 @@ def get_adaptive_ocr_params(hour=None, weather_condition="sunny"):
     return {"brightness_boost": 1.0, "contrast_factor": 1.0}
 
 
+def _gray_quality_score(gray) -> float:
+    """Quality Score eines Graustufen-Crops (float32, Statistik über cv2.meanStdDev)."""
+    if gray.size == 0:
+        return 0.0
+    
+    # Berechne Schärfe (Varianz des Laplacian)
+    _, laplacian_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_32F))
+    sharpness = float(laplacian_std[0, 0]) ** 2
+    
+    # Berechne Kontrast und Helligkeit in einem Durchlauf
+    mean, std = cv2.meanStdDev(gray)
+    contrast = float(std[0, 0])
+    brightness = float(mean[0, 0])
+    
+    # Kombinierter Quality Score
+    return (sharpness * 0.5) + (contrast * 0.3) + (min(brightness, 255 - brightness) * 0.2)
+
+
 def calculate_frame_quality(crop):
     """Bewertet die Bildqualität für OCR."""
     if len(crop.shape) == 3:
         gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
     else:
         gray = crop
+    return _gray_quality_score(gray)
+
+
+def calculate_frame_qualities(frame, bboxes) -> List[Tuple[float, np.ndarray]]:
+    """Bewertet alle Kennzeichen-Crops eines Frames in einem Aufruf.
+
+    Liegen die Crops dicht beieinander, wird nur ihr gemeinsamer Bereich einmal
+    in Graustufen umgerechnet. Rückgabe pro Box: (Quality Score, Graustufen-Crop),
+    der Crop kann direkt an OCR und Vorverarbeitung weitergegeben werden.
+    """
+    h, w = frame.shape[:2]
+    boxes = []
+    for bbox in bboxes:
+        x1, y1, x2, y2 = map(int, bbox)
+        boxes.append((max(0, x1), max(0, y1), min(w, x2), min(h, y2)))
     
-    # Berechne Schärfe (Varianz des Laplacian)
-    sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
+    valid = [box for box in boxes if box[2] > box[0] and box[3] > box[1]]
+    if not valid:
+        return [(0.0, np.zeros((0, 0), np.uint8)) for _ in boxes]
     
-    # Berechne Kontrast
-    contrast = gray.std()
+    ux1, uy1 = min(box[0] for box in valid), min(box[1] for box in valid)
+    ux2, uy2 = max(box[2] for box in valid), max(box[3] for box in valid)
+    crop_area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in valid)
+    shared = (ux2 - ux1) * (uy2 - uy1) <= 2 * crop_area
     
-    # Berechne Helligkeit
-    brightness = gray.mean()
+    if shared:
+        region = frame[uy1:uy2, ux1:ux2]
+        union_gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else region
     
-    # Kombinierter Quality Score
-    quality_score = (sharpness * 0.5) + (contrast * 0.3) + (min(brightness, 255-brightness) * 0.2)
-    return quality_score
+    results = []
+    for x1, y1, x2, y2 in boxes:
+        if x2 <= x1 or y2 <= y1:
+            results.append((0.0, np.zeros((0, 0), np.uint8)))
+            continue
+        if shared:
+            gray = union_gray[y1 - uy1:y2 - uy1, x1 - ux1:x2 - ux1]
+        elif len(frame.shape) == 3:
+            gray = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+        else:
+            gray = frame[y1:y2, x1:x2]
+        results.append((_gray_quality_score(gray), gray))
+    return results
+
+
+# Gemeinsames CLAHE-Objekt (pro Prozess, statt bei jedem Crop neu erzeugt)
+_CLAHE = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+
+
+def _tv_chambolle_float32(image, weight=0.1, eps=0.0002, n_iter_max=50):
+    """TV-Denoising nach Chambolle (wie skimage) in float32 für 2D-Graustufenbilder.
+
+    Liefert wie ``denoise_tv_chambolle`` ein Bild im Bereich [0, 1].
+    """
+    image = image.astype(np.float32) / 255.0
+    p = np.zeros((2,) + image.shape, dtype=np.float32)
+    g = np.zeros_like(p)
+    out = image
+    tau = np.float32(0.25)
+    
+    for i in range(n_iter_max):
+        if i > 0:
+            # Divergenz von p
+            d = -p.sum(axis=0)
+            d[1:, :] += p[0, :-1, :]
+            d[:, 1:] += p[1, :, :-1]
+            out = image + d
+            energy = float((d * d).sum())
+        else:
+            energy = 0.0
+        
+        # Gradient von out
+        g[0, :-1, :] = np.diff(out, axis=0)
+        g[1, :, :-1] = np.diff(out, axis=1)
+        norm = np.sqrt((g * g).sum(axis=0))[np.newaxis, ...]
+        energy = (energy + weight * float(norm.sum())) / image.size
+        
+        norm *= tau / weight
+        norm += 1.0
+        p -= tau * g
+        p /= norm
+        
+        if i == 0:
+            energy_init = energy_previous = energy
+        elif abs(energy_previous - energy) < eps * energy_init:
+            break
+        else:
+            energy_previous = energy
+    
+    return out
+
+
+def _denoise_tv_chambolle(image):
+    try:
+        enhanced = denoise_tv_chambolle(image, weight=0.1, eps=0.0002, n_iter_max=50)
+        return (enhanced * 255).astype(np.uint8), "denoising"
+    except:
+        # Fallback zu cv2 denoising
+        return cv2.fastNlMeansDenoising(image), "cv2_denoising"
+
+
+def _denoise_tv_float32(image):
+    enhanced = _tv_chambolle_float32(image)
+    return (np.clip(enhanced, 0.0, 1.0) * 255).astype(np.uint8), "denoising_tv_float32"
+
+
+def _adaptive_threshold(method):
+    def threshold(image):
+        return cv2.adaptiveThreshold(image, 255, method, cv2.THRESH_BINARY, 11, 2), "adaptive_threshold"
+    return threshold
+
+
+def _otsu_threshold(image):
+    _, binary = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary, "otsu_threshold"
+
+
+# Austauschbare Backends je Vorverarbeitungs-Schritt: Funktion(Bild) -> (Bild, Methodenname|None)
+PREPROCESSING_BACKENDS = {
+    'contrast': {
+        'clahe': lambda image: (_CLAHE.apply(image), "CLAHE"),
+        'none': lambda image: (image, None),
+    },
+    'denoise': {
+        'tv_chambolle': _denoise_tv_chambolle,
+        'tv_float32': _denoise_tv_float32,
+        'bilateral': lambda image: (cv2.bilateralFilter(image, 5, 50, 50), "bilateral_denoising"),
+        'nlmeans': lambda image: (cv2.fastNlMeansDenoising(image), "cv2_denoising"),
+        'none': lambda image: (image, None),
+    },
+    'threshold': {
+        'adaptive_gaussian': _adaptive_threshold(cv2.ADAPTIVE_THRESH_GAUSSIAN_C),
+        'adaptive_mean': _adaptive_threshold(cv2.ADAPTIVE_THRESH_MEAN_C),
+        'otsu': _otsu_threshold,
+    },
+}
+
+DEFAULT_PREPROCESSING_BACKENDS = {
+    'contrast': 'clahe',
+    'denoise': 'tv_chambolle',
+    'threshold': 'adaptive_gaussian',
+}
+
+# Prozessweite Auswahl (siehe configure_preprocessing_backends)
+_PREPROCESSING_BACKENDS = dict(DEFAULT_PREPROCESSING_BACKENDS)
+
+
+def preprocessing_backends_from_config(ocr_config: dict) -> Dict[str, str]:
+    """Backend-Auswahl aus ``load_ocr_config()``.
+
+    ``enable_clahe = false`` bzw. ``enable_denoising = false`` schalten den
+    jeweiligen Schritt ab, sonst gilt ``preprocessing_<schritt>``.
+    """
+    backends = {
+        operation: ocr_config.get(f'preprocessing_{operation}', default)
+        for operation, default in DEFAULT_PREPROCESSING_BACKENDS.items()
+    }
+    if not ocr_config.get('enable_clahe', True):
+        backends['contrast'] = 'none'
+    if not ocr_config.get('enable_denoising', True):
+        backends['denoise'] = 'none'
+    return backends
+
+
+def configure_preprocessing_backends(backends: Dict[str, str]) -> Dict[str, str]:
+    """Setzt die Standard-Backends dieses Prozesses; unbekannte Namen werden abgewiesen."""
+    for operation, backend in backends.items():
+        if backend not in PREPROCESSING_BACKENDS.get(operation, {}):
+            raise ValueError(f"Unbekanntes Vorverarbeitungs-Backend {operation}={backend}, "
+                             f"verfügbar: {sorted(PREPROCESSING_BACKENDS.get(operation, {}))}")
+    _PREPROCESSING_BACKENDS.update(backends)
+    return dict(_PREPROCESSING_BACKENDS)
+
+
+class PreprocessingVariants:
+    """Lazy Bildvorverarbeitung: Varianten eines Crops werden erst bei Bedarf berechnet.
+
+    Die Stufen bilden einen Abhängigkeitsgraphen (Graustufen -> Kontrast ->
+    Helligkeit/Kontrast -> Denoising -> Skalierungen / Threshold -> Morphologie /
+    Kanten). Jede Stufe wird höchstens einmal berechnet und gecacht; Varianten,
+    die die OCR nie anfragt, entstehen gar nicht. Zugriff per Name oder per Index
+    in ``VARIANTS`` (Reihenfolge wie die Liste von ``enhance_image_preprocessing``).
+    Kontrast, Denoising und Threshold laufen über ``PREPROCESSING_BACKENDS``;
+    ohne ``backends`` gilt die prozessweite Auswahl.
+    """
+    
+    VARIANTS = ('enhanced', 'scale_1.5', 'scale_2.0', 'scale_2.5',
+                'adaptive_threshold', 'morphology', 'edge_enhancement')
+    
+    def __init__(self, crop, params=None, backends=None):
+        self.crop = crop
+        self.params = params if params is not None else get_adaptive_ocr_params()
+        self.backends = dict(_PREPROCESSING_BACKENDS)
+        if backends:
+            self.backends.update(backends)
+        self.methods_used = []
+        self._cache = {}
+    
+    def __len__(self):
+        return len(self.VARIANTS)
+    
+    def __getitem__(self, key):
+        name = self.VARIANTS[key] if isinstance(key, int) else key
+        if name not in self._cache:
+            self._cache[name] = self._build(name)
+        return self._cache[name]
+    
+    def _run_backend(self, operation, image):
+        image, method = PREPROCESSING_BACKENDS[operation][self.backends[operation]](image)
+        if method:
+            self.methods_used.append(method)
+        return image
+    
+    def _build(self, name):
+        if name == 'gray':
+            # Graustufen-Crops (z.B. aus calculate_frame_qualities) direkt übernehmen
+            if len(self.crop.shape) == 3:
+                return cv2.cvtColor(self.crop, cv2.COLOR_BGR2GRAY)
+            return self.crop
+        
+        if name == 'contrast':
+            # 1. CLAHE (Contrast Limited Adaptive Histogram Equalization)
+            return self._run_backend('contrast', self['gray'])
+        
+        if name == 'brightness_contrast':
+            # 2. Brightness und Contrast Anpassung
+            self.methods_used.append("brightness_contrast")
+            return cv2.convertScaleAbs(self['contrast'],
+                                       alpha=self.params["contrast_factor"],
+                                       beta=(self.params["brightness_boost"] - 1.0) * 50)
+        
+        if name == 'enhanced':
+            # 3. Denoising
+            return self._run_backend('denoise', self['brightness_contrast'])
+        
+        if name == 'adaptive_threshold':
+            # 4. Adaptive Thresholding
+            return self._run_backend('threshold', self['enhanced'])
+        
+        if name == 'morphology':
+            # 5. Morphological Operations
+            self.methods_used.append("morphology")
+            kernel = np.ones((2, 2), np.uint8)
+            morph = cv2.morphologyEx(self['adaptive_threshold'], cv2.MORPH_CLOSE, kernel)
+            return cv2.morphologyEx(morph, cv2.MORPH_OPEN, kernel)
+        
+        if name == 'edge_enhancement':
+            # 6. Edge Enhancement
+            self.methods_used.append("edge_enhancement")
+            enhanced = self['enhanced']
+            edges = cv2.Canny(enhanced, 50, 150)
+            return cv2.addWeighted(enhanced, 0.8, edges, 0.2, 0)
+        
+        if name.startswith('scale_'):
+            # 7. Multiple Scale Processing
+            if "multi_scale" not in self.methods_used:
+                self.methods_used.append("multi_scale")
+            scale = float(name[len('scale_'):])
+            h, w = self['enhanced'].shape
+            return cv2.resize(self['enhanced'], (int(w * scale), int(h * scale)),
+                              interpolation=cv2.INTER_CUBIC)
+        
+        raise KeyError(name)
 
 
 def enhance_image_preprocessing(crop, params=None):
-    """Erweiterte Bildvorverarbeitung für bessere OCR-Ergebnisse."""
-    if params is None:
-        params = get_adaptive_ocr_params()
+    """Erweiterte Bildvorverarbeitung für bessere OCR-Ergebnisse.
+
+    Berechnet alle Varianten sofort; die OCR-Pfade nutzen stattdessen
+    ``PreprocessingVariants`` und bauen nur, was sie tatsächlich brauchen.
+    """
+    variants = PreprocessingVariants(crop, params)
+    # Berechnungsreihenfolge wie bisher (Skalierungen zuletzt), damit methods_used gleich bleibt
+    for name in ('enhanced', 'adaptive_threshold', 'morphology', 'edge_enhancement'):
+        variants[name]
+    processed_images = [variants[name] for name in PreprocessingVariants.VARIANTS]
+    return processed_images, variants.methods_used
+
+
+# Konfigurationen für reader.readtext (Reihenfolge = Standard-Reihenfolge der Kaskade)
+OCR_METHODS = (
+    {'detail': 0, 'paragraph': False, 'name': 'standard'},
+    {'detail': 1, 'paragraph': False, 'name': 'detailed'},
+    {'detail': 0, 'paragraph': True, 'name': 'paragraph'},
+    {'detail': 1, 'paragraph': True, 'name': 'enhanced'},
+)
+
+
+class OCRCascadeStats:
+    """Historische Gewinnraten der (Bild, Methode)-Paare für die OCR-Kaskade.
+
+    Ein Paar "gewinnt", wenn sein Kandidat das beste ``final_score`` eines
+    Crops liefert. Die Kaskade probiert Paare mit hoher Gewinnrate zuerst.
+    """
     
-    methods_used = []
+    def __init__(self):
+        self.attempts = defaultdict(int)
+        self.wins = defaultdict(int)
     
-    # Zu Graustufen konvertieren
-    if len(crop.shape) == 3:
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-    else:
-        gray = crop.copy()
+    def win_rate(self, key) -> float:
+        """Geglättete Gewinnrate (Laplace), unbekannte Paare starten bei 0.5."""
+        return (self.wins.get(key, 0) + 1) / (self.attempts.get(key, 0) + 2)
+    
+    def order(self, keys) -> list:
+        """Sortiert Paare nach Gewinnrate; bei Gleichstand bleibt die Standard-Reihenfolge."""
+        return sorted(keys, key=lambda key: -self.win_rate(key))
     
-    # 1. CLAHE (Contrast Limited Adaptive Histogram Equalization)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-    enhanced = clahe.apply(gray)
-    methods_used.append("CLAHE")
+    def record(self, attempted, winner=None):
+        """Verbucht die probierten Paare und optional den Gewinner."""
+        for key in attempted:
+            self.attempts[key] += 1
+        if winner is not None:
+            self.wins[winner] += 1
+
+
+# Prozessweite Statistik (ein Tracking-Worker pro Prozess)
+_OCR_CASCADE_STATS = OCRCascadeStats()
+
+
+# Zeichensatz der Kennzeichen (Großbuchstaben, Ziffern, Bindestrich, Leerzeichen)
+LICENSE_CHARSET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789- "
+
+# Ab diesem Seitenverhältnis (Breite/Höhe) wird ein Crop an Spaltenlücken geteilt
+LINE_SPLIT_ASPECT = 6.0
+
+
+def _split_wide_crop(binary, max_aspect=LINE_SPLIT_ASPECT) -> List[Tuple[int, int]]:
+    """Günstiger Zeilen-Split sehr breiter Crops über das Spaltenprofil.
+
+    Liefert (x_start, x_end)-Segmente, getrennt an leeren Spalten, die breiter
+    als die halbe Crop-Höhe sind. Schmale Crops bleiben ein einziges Segment.
+    """
+    h, w = binary.shape[:2]
+    if w < h * max_aspect:
+        return [(0, w)]
     
-    # 2. Brightness und Contrast Anpassung
-    enhanced = cv2.convertScaleAbs(enhanced, 
-                                  alpha=params["contrast_factor"], 
-                                  beta=(params["brightness_boost"] - 1.0) * 50)
-    methods_used.append("brightness_contrast")
+    # Schrift ist die Minderheitsfarbe - unabhängig von hell/dunkel
+    ink = binary < 128
+    if ink.mean() > 0.5:
+        ink = ~ink
+    filled = np.flatnonzero(ink.sum(axis=0) > max(1, h // 20))
+    if filled.size == 0:
+        return [(0, w)]
     
-    # 3. Denoising
-    try:
-        enhanced = denoise_tv_chambolle(enhanced, weight=0.1, eps=0.0002, n_iter_max=50)
-        enhanced = (enhanced * 255).astype(np.uint8)
-        methods_used.append("denoising")
-    except:
-        # Fallback zu cv2 denoising
-        enhanced = cv2.fastNlMeansDenoising(enhanced)
-        methods_used.append("cv2_denoising")
-    
-    # 4. Adaptive Thresholding
-    adaptive_thresh = cv2.adaptiveThreshold(enhanced, 255, 
-                                          cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                          cv2.THRESH_BINARY, 11, 2)
-    methods_used.append("adaptive_threshold")
-    
-    # 5. Morphological Operations
-    kernel = np.ones((2,2), np.uint8)
-    morph = cv2.morphologyEx(adaptive_thresh, cv2.MORPH_CLOSE, kernel)
-    morph = cv2.morphologyEx(morph, cv2.MORPH_OPEN, kernel)
-    methods_used.append("morphology")
-    
-    # 6. Edge Enhancement
-    edges = cv2.Canny(enhanced, 50, 150)
-    enhanced_edges = cv2.addWeighted(enhanced, 0.8, edges, 0.2, 0)
-    methods_used.append("edge_enhancement")
-    
-    # 7. Multiple Scale Processing
-    scales = [1.0, 1.5, 2.0, 2.5]
-    processed_images = []
-    
-    for scale in scales:
-        if scale != 1.0:
-            h, w = enhanced.shape
-            new_h, new_w = int(h * scale), int(w * scale)
-            scaled = cv2.resize(enhanced, (new_w, new_h), interpolation=cv2.INTER_CUBIC)
-        else:
-            scaled = enhanced
-        processed_images.append(scaled)
+    breaks = np.flatnonzero(np.diff(filled) > max(2, h // 2))
+    starts = np.concatenate(([filled[0]], filled[breaks + 1]))
+    ends = np.concatenate((filled[breaks], [filled[-1]])) + 1
+    pad = max(1, h // 8)
+    return [(max(0, int(start) - pad), min(w, int(end) + pad)) for start, end in zip(starts, ends)]
+
+
+def recognize_license_variants(reader, variants, segments, allowlist=LICENSE_CHARSET) -> List[Tuple[str, float]]:
+    """Erkennt viele Crop-Varianten in einem Recognizer-Batch ohne Textdetektion.
+
+    Die Graustufen-Varianten werden untereinander auf eine Fläche gelegt (rechts
+    mit Weiß aufgefüllt), jedes Segment aus ``segments[i]`` geht als fertige
+    Textbox an ``reader.recognize``. Die Varianten dürfen unterschiedlich groß
+    sein und von verschiedenen Crops stammen. Rückgabe pro Variante:
+    (Text, mittlere Confidence).
+    """
+    max_width = max(variant.shape[1] for variant in variants)
+    
+    rows = []
+    boxes = []
+    box_owner = {}
+    y_offset = 0
+    for variant_idx, (variant, variant_segments) in enumerate(zip(variants, segments)):
+        h, w = variant.shape[:2]
+        rows.append(np.pad(variant, ((0, 0), (0, max_width - w)), constant_values=255))
+        for x_start, x_end in variant_segments:
+            boxes.append([x_start, x_end, y_offset, y_offset + h])
+            box_owner[(x_start, y_offset)] = variant_idx
+        y_offset += h
+    canvas = np.vstack(rows)
+    
+    results = reader.recognize(canvas, horizontal_list=boxes, free_list=[],
+                               batch_size=len(boxes), allowlist=allowlist,
+                               detail=1, paragraph=False)
     
-    processed_images.extend([adaptive_thresh, morph, enhanced_edges])
-    methods_used.append("multi_scale")
+    texts = [[] for _ in variants]
+    confidences = [[] for _ in variants]
+    for box, text, confidence in results:
+        variant_idx = box_owner.get((int(box[0][0]), int(box[0][1])))
+        if variant_idx is None:
+            continue
+        texts[variant_idx].append((int(box[0][0]), text.strip()))
+        confidences[variant_idx].append(float(confidence))
     
-    return processed_images, methods_used
+    recognized = []
+    for segment_texts, segment_confidences in zip(texts, confidences):
+        text = " ".join(part for _, part in sorted(segment_texts) if part)
+        confidence = float(np.mean(segment_confidences)) if segment_confidences else 0.0
+        recognized.append((text, confidence))
+    return recognized
 
 
-def perform_ocr_on_license_enhanced(frame, bbox, reader, commercial_licenses=None, quality_threshold=100.0):
-    """VERBESSERTE HAUPTFUNKTION: OCR mit korrigierter Sonderzeichen-Filterung."""
+def perform_ocr_on_license_enhanced(frame, bbox, reader, commercial_licenses=None, quality_threshold=100.0,
+                                    early_exit_score=None, time_budget_ms=None, cascade_stats=None,
+                                    recognizer_only=False):
+    """VERBESSERTE HAUPTFUNKTION: OCR mit korrigierter Sonderzeichen-Filterung.
+
+    Die (Bild, Methode)-Paare laufen als Kaskade, sortiert nach historischer
+    Gewinnrate. Mit ``early_exit_score`` endet sie, sobald ein Kandidat diesen
+    ``final_score`` erreicht oder exakt ein gewerbliches Kennzeichen trifft;
+    mit ``time_budget_ms`` endet sie, sobald das Zeitbudget des Crops
+    aufgebraucht ist. Ohne beide Parameter werden alle Paare ausgewertet.
+
+    Mit ``recognizer_only`` entfällt die Textdetektion: der YOLO-Crop und seine
+    Varianten gehen als ein Batch direkt in den Recognizer (Reader ohne
+    Detektor, siehe ``recognize_license_variants``).
+    """
     x1, y1, x2, y2 = map(int, bbox)
     h, w = frame.shape[:2]
     x1, x2 = max(0, x1), min(w - 1, x2)
@@ -598,67 +1168,199 @@ def perform_ocr_on_license_enhanced(frame, bbox, reader, commercial_licenses=Non
         return "", 0.0, "error", []
     
     crop = frame[y1:y2, x1:x2]
+    return ocr_license_crop(crop, reader, commercial_licenses, quality_threshold,
+                            early_exit_score=early_exit_score, time_budget_ms=time_budget_ms,
+                            cascade_stats=cascade_stats, recognizer_only=recognizer_only)
+
+
+def ocr_license_crop(crop, reader, commercial_licenses=None, quality_threshold=100.0,
+                     early_exit_score=None, time_budget_ms=None, cascade_stats=None,
+                     recognizer_only=False, quality_score=None):
+    """OCR auf einem bereits ausgeschnittenen Kennzeichen-Crop.
+
+    Parameter wie bei ``perform_ocr_on_license_enhanced``; wird auch vom
+    OCR-Service genutzt, der nur Crops statt ganzer Frames erhält. Der Crop
+    darf bereits in Graustufen vorliegen; ein schon berechneter
+    ``quality_score`` (``calculate_frame_qualities``) wird übernommen.
+    """
+    if recognizer_only:
+        return ocr_license_crops_batch([crop], reader, commercial_licenses, quality_threshold,
+                                       recognizer_only=True, quality_scores=[quality_score])[0]
     
     # Bildqualität prüfen
-    quality_score = calculate_frame_quality(crop)
+    if quality_score is None:
+        quality_score = calculate_frame_quality(crop)
     if quality_score < quality_threshold:
         return "", 0.0, "quality_too_low", []
     
-    # Smart Validator initialisieren - JETZT MIT KORRIGIERTER SONDERZEICHEN-FILTERUNG
-    validator = SmartOCRValidator(commercial_licenses)
+    # Geteilter Smart Validator - JETZT MIT KORRIGIERTER SONDERZEICHEN-FILTERUNG
+    validator = get_shared_validator(commercial_licenses)
+    cascade_stats = cascade_stats or _OCR_CASCADE_STATS
     
     # Adaptive Parameter basierend auf Tageszeit
     params = get_adaptive_ocr_params()
     
-    # Erweiterte Bildvorverarbeitung
-    processed_images, methods_used = enhance_image_preprocessing(crop, params)
+    # Erweiterte Bildvorverarbeitung (lazy: nur die Varianten, die die Kaskade erreicht)
+    variants = PreprocessingVariants(crop, params)
+    num_images = 6  # Limitiere auf 6 Bilder
     
-    # Multi-Method OCR Ansatz
+    # Multi-Method OCR Ansatz als Kaskade
     ocr_candidates = []
-    ocr_methods = [
-        {'detail': 0, 'paragraph': False, 'name': 'standard'},
-        {'detail': 1, 'paragraph': False, 'name': 'detailed'},
-        {'detail': 0, 'paragraph': True, 'name': 'paragraph'},
-        {'detail': 1, 'paragraph': True, 'name': 'enhanced'}
-    ]
-    
-    for img_idx, processed_img in enumerate(processed_images[:6]):  # Limitiere auf 6 Bilder
-        for method in ocr_methods:
-            try:
-                start_time = time.time()
-                results = reader.readtext(processed_img, 
-                                        detail=method['detail'],
-                                        paragraph=method['paragraph'])
-                execution_time = time.time() - start_time
+    cascade = cascade_stats.order(
+        [(img_idx, method['name']) for img_idx in range(num_images) for method in OCR_METHODS]
+    )
+    methods_by_name = {method['name']: method for method in OCR_METHODS}
+    attempted = []
+    stop_reason = "exhausted"
+    cascade_start = time.time()
+    
+    for img_idx, method_name in cascade:
+        method = methods_by_name[method_name]
+        attempted.append((img_idx, method_name))
+        try:
+            processed_img = variants[img_idx]
+            start_time = time.time()
+            results = reader.readtext(processed_img, 
+                                    detail=method['detail'],
+                                    paragraph=method['paragraph'])
+            execution_time = time.time() - start_time
+            
+            if results:
+                if method['detail'] == 0:
+                    # Paragraph mode - results ist direkt der Text
+                    text = results.strip() if isinstance(results, str) else str(results).strip()
+                    confidence = 0.7  # Default confidence für paragraph mode
+                else:
+                    # Detail mode - results ist Liste von (bbox, text, conf)
+                    best = max(results, key=lambda x: x[2])
+                    text = best[1].strip()
+                    confidence = best[2]
                 
-                if results:
-                    if method['detail'] == 0:
-                        # Paragraph mode - results ist direkt der Text
-                        text = results.strip() if isinstance(results, str) else str(results).strip()
-                        confidence = 0.7  # Default confidence für paragraph mode
-                    else:
-                        # Detail mode - results ist Liste von (bbox, text, conf)
-                        best = max(results, key=lambda x: x[2])
-                        text = best[1].strip()
-                        confidence = best[2]
+                if text:  # Nur nicht-leere Texte verarbeiten
+                    # KRITISCH: SmartOCRValidator mit korrigierter Sonderzeichen-Filterung
+                    ocr_result = validator.process_ocr_result(
+                        text, confidence, f"{method_name}_img{img_idx}", quality_score
+                    )
                     
-                    if text:  # Nur nicht-leere Texte verarbeiten
-                        # KRITISCH: SmartOCRValidator mit korrigierter Sonderzeichen-Filterung
-                        method_name = f"{method['name']}_img{img_idx}"
-                        ocr_result = validator.process_ocr_result(text, confidence, method_name, quality_score)
-                        
-                        ocr_candidates.append({
-                            'ocr_result': ocr_result,
-                            'execution_time': execution_time,
-                            'original_text': text,
-                            'original_confidence': confidence
-                        })
-                        
-            except Exception as e:
-                print(f"OCR Fehler bei {method['name']}: {e}")
-                continue
+                    ocr_candidates.append({
+                        'ocr_result': ocr_result,
+                        'execution_time': execution_time,
+                        'original_text': text,
+                        'original_confidence': confidence,
+                        'cascade_key': (img_idx, method_name),
+                    })
+                    
+                    # Early Exit: sicherer Kandidat gefunden
+                    if early_exit_score is not None and (
+                        ocr_result.final_score >= early_exit_score
+                        or ocr_result.corrected_text in validator.commercial_licenses
+                    ):
+                        stop_reason = "score"
+                        break
+                    
+        except Exception as e:
+            print(f"OCR Fehler bei {method_name}: {e}")
+        
+        # Zeitbudget pro Crop
+        if time_budget_ms and (time.time() - cascade_start) * 1000.0 >= time_budget_ms:
+            stop_reason = "time_budget"
+            break
+    
+    # Früher Abbruch per Score ist der Normalfall; nur ein gerissenes Zeitbudget melden
+    if stop_reason == "time_budget":
+        print(f"OCR-Kaskade: Zeitbudget nach {len(attempted)}/{len(cascade)} Aufrufen erschöpft")
     
     # Bestes Ergebnis auswählen basierend auf final_score
+    if not ocr_candidates:
+        cascade_stats.record(attempted)
+    else:
+        best_candidate = max(ocr_candidates, key=lambda x: x['ocr_result'].final_score)
+        cascade_stats.record(attempted, best_candidate['cascade_key'])
+    
+    return _finish_license_ocr(crop, validator, variants.methods_used, ocr_candidates)
+
+
+def ocr_license_crops_batch(crops, reader, commercial_licenses=None, quality_threshold=100.0,
+                            recognizer_only=False, quality_scores=None, **cascade_kwargs) -> list:
+    """OCR für mehrere Kennzeichen-Crops (z.B. von verschiedenen Kameras).
+
+    Mit ``recognizer_only`` laufen die Varianten aller Crops in einem einzigen
+    Recognizer-Batch; sonst wird die readtext-Kaskade je Crop ausgeführt
+    (``cascade_kwargs`` wie bei ``ocr_license_crop``). ``quality_scores``
+    enthält optional bereits berechnete Scores (None = neu berechnen).
+    Rückgabe: ein (Text, Confidence, Methode, Vorverarbeitung)-Tupel pro Crop.
+    """
+    if quality_scores is None:
+        quality_scores = [None] * len(crops)
+    
+    if not recognizer_only:
+        return [
+            ocr_license_crop(crop, reader, commercial_licenses, quality_threshold,
+                             quality_score=quality_score, **cascade_kwargs)
+            for crop, quality_score in zip(crops, quality_scores)
+        ]
+    
+    validator = get_shared_validator(commercial_licenses)
+    params = get_adaptive_ocr_params()
+    results = [None] * len(crops)
+    
+    prepared = []
+    all_variants = []
+    all_segments = []
+    for crop_idx, (crop, quality_score) in enumerate(zip(crops, quality_scores)):
+        if quality_score is None:
+            quality_score = calculate_frame_quality(crop)
+        if quality_score < quality_threshold:
+            results[crop_idx] = ("", 0.0, "quality_too_low", [])
+            continue
+        
+        preprocessing = PreprocessingVariants(crop, params)
+        names, variants, segments = _recognizer_variants(preprocessing)
+        prepared.append((crop_idx, quality_score, preprocessing.methods_used, names, len(all_variants)))
+        all_variants.extend(variants)
+        all_segments.extend([segments] * len(variants))
+    
+    if not prepared:
+        return results
+    
+    try:
+        start_time = time.time()
+        recognized = recognize_license_variants(reader, all_variants, all_segments)
+        execution_time = (time.time() - start_time) / len(prepared)
+    except Exception as e:
+        print(f"OCR Fehler im Recognizer-Batch: {e}")
+        recognized = [("", 0.0)] * len(all_variants)
+        execution_time = 0.0
+    
+    for crop_idx, quality_score, methods_used, names, offset in prepared:
+        ocr_candidates = []
+        for name, (text, confidence) in zip(names, recognized[offset:offset + len(names)]):
+            if text:
+                ocr_result = validator.process_ocr_result(
+                    text, confidence, f"recognizer_{name}", quality_score
+                )
+                ocr_candidates.append({
+                    'ocr_result': ocr_result,
+                    'execution_time': execution_time,
+                    'original_text': text,
+                    'original_confidence': confidence,
+                })
+        results[crop_idx] = _finish_license_ocr(crops[crop_idx], validator, methods_used, ocr_candidates)
+    
+    return results
+
+
+def _recognizer_variants(preprocessing):
+    """Varianten eines Crops für den Recognizer: (Namen, Bilder, Segmente)."""
+    # Skalierte Kopien und Kanten entfallen: der Recognizer normiert ohnehin auf seine Zeilenhöhe
+    names = ('gray', 'enhanced', 'threshold', 'morph')
+    variants = [preprocessing['gray'], preprocessing['enhanced'],
+                preprocessing['adaptive_threshold'], preprocessing['morphology']]
+    return names, variants, _split_wide_crop(preprocessing['adaptive_threshold'])
+
+
+def _finish_license_ocr(crop, validator, methods_used, ocr_candidates):
+    """Wählt den besten Kandidaten, protokolliert und liefert das OCR-Tupel."""
     if not ocr_candidates:
         return "", 0.0, "no_results", methods_used
     
@@ -756,7 +1458,7 @@ class MultiFrameOCRTracker:
     def __init__(self, max_frame_history=5, commercial_licenses=None):
         self.max_frame_history = max_frame_history
         self.detections = defaultdict(lambda: deque(maxlen=max_frame_history))
-        self.validator = SmartOCRValidator(commercial_licenses)
+        self.validator = get_shared_validator(commercial_licenses)
     
     def add_detection(self, track_id, text, confidence, method):
         """Füge eine neue OCR-Erkennung hinzu mit Validierung."""
@@ -827,38 +1529,6 @@ class MultiFrameOCRTracker:
             del self.detections[track_id]
 
 
-def enhanced_find_license_for_boat(boat_bbox, licenses_data, raw_frame, ocr_reader, commercial_licenses=None):
-    """Erweiterte Lizenz-Suche mit SmartOCRValidator."""
-    best_lic = None
-    best_score = 0.0
-    validator = SmartOCRValidator(commercial_licenses)
-    
-    for lic in licenses_data:
-        if is_license_completely_inside_boat(lic['bbox'], boat_bbox):
-            # Verwende die verbesserte OCR mit SmartOCRValidator
-            text, confidence, method, preprocessing_methods = perform_ocr_on_license_enhanced(
-                raw_frame, lic['bbox'], ocr_reader, commercial_licenses
-            )
-            
-            # Der finale Score kommt bereits aus SmartOCRValidator
-            # Zusätzlich Detection-Confidence einbeziehen
-            combined_score = (lic['conf'] * 0.2) + (confidence * 0.8)
-            
-            if combined_score > best_score:
-                best_score = combined_score
-                best_lic = {
-                    'bbox': lic['bbox'],
-                    'conf': lic['conf'],
-                    'text': text,
-                    'ocr_confidence': confidence,
-                    'method': method,
-                    'preprocessing_methods': preprocessing_methods,
-                    'combined_score': combined_score
-                }
-    
-    return best_lic
-
-
 # Legacy-Funktionen für Kompatibilität (bleiben unverändert)
 def correct_common_ocr_errors(text):
     """Legacy-Funktion - jetzt durch SmartOCRValidator ersetzt."""
@@ -879,7 +1549,7 @@ def correct_common_ocr_errors(text):
 
 def validate_german_boat_name_format(text):
     """Legacy-Funktion - jetzt durch SmartOCRValidator ersetzt."""
-    validator = SmartOCRValidator()
+    validator = get_shared_validator()
     text_type, type_conf = validator.detect_text_type(text)
     if text_type == TextType.BOAT_NAME:
         return True, type_conf
@@ -888,7 +1558,7 @@ def validate_german_boat_name_format(text):
 
 def validate_license_plate_format(text):
     """Legacy-Funktion - jetzt durch SmartOCRValidator ersetzt."""
-    validator = SmartOCRValidator()
+    validator = get_shared_validator()
     text_type, type_conf = validator.detect_text_type(text)
     if text_type == TextType.LICENSE_PLATE:
         return True, type_conf
@@ -897,14 +1567,14 @@ def validate_license_plate_format(text):
 
 def similarity_check_with_known_licenses(text, known_licenses):
     """Legacy-Funktion - jetzt durch SmartOCRValidator ersetzt."""
-    validator = SmartOCRValidator(known_licenses)
+    validator = get_shared_validator(known_licenses)
     corrected_text, similarity_score = validator.similarity_matching_enhanced(text, TextType.LICENSE_PLATE)
     return corrected_text, similarity_score
 
 
 def score_ocr_result(text, confidence, method, quality_score):
     """Legacy-Funktion - jetzt durch SmartOCRValidator ersetzt."""
-    validator = SmartOCRValidator()
+    validator = get_shared_validator()
     ocr_result = validator.process_ocr_result(text, confidence, method, quality_score)
     return ocr_result.final_score
 
@@ -917,7 +1587,7 @@ def save_difficult_cases(crop, ocr_results, confidence_threshold=0.5):
 def log_ocr_performance(text, confidence, method, execution_time):
     """Legacy-Funktion für Kompatibilität."""
     # Erstelle ein einfaches OCRResult für Legacy-Unterstützung
-    validator = SmartOCRValidator()
+    validator = get_shared_validator()
     ocr_result = validator.process_ocr_result(text, confidence, method, 150.0)
     log_ocr_performance_enhanced(ocr_result, execution_time)
 
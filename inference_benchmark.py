@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark der YOLO-Inference-Backends
+
+Dieses Script vergleicht PyTorch mit den exportierten Backends (ONNX Runtime,
+OpenVINO, optional int8) auf gespeicherten Event-Frames: Durchsatz (FPS) und
+Übereinstimmung der Detektionen mit der PyTorch-Baseline. So lässt sich
+prüfen, ob ein schnelleres Backend (``inference_backend`` in ``[performance]``)
+dieselben Boote und Kennzeichen findet.
+"""
+
+import csv
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+from model_export import calibration_images, export_model
+
+
+def box_iou(boxes_a, boxes_b):
+    """IoU-Matrix zweier Box-Arrays (x1, y1, x2, y2)."""
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(1, -1, 4)
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-9)
+
+
+def match_detections(reference, candidate, iou_threshold=0.5):
+    """Anzahl gleicher Detektionen (gleiche Klasse, IoU >= Schwelle, jede Box höchstens einmal)."""
+    ref_boxes, ref_cls = reference
+    cand_boxes, cand_cls = candidate
+    if len(ref_boxes) == 0 or len(cand_boxes) == 0:
+        return 0
+
+    iou = box_iou(ref_boxes, cand_boxes)
+    iou[ref_cls[:, None] != cand_cls[None, :]] = 0.0
+    matches = 0
+    # Gierig nach absteigender IoU zuordnen
+    for flat in np.argsort(iou, axis=None)[::-1]:
+        i, j = np.unravel_index(flat, iou.shape)
+        if iou[i, j] < iou_threshold:
+            break
+        matches += 1
+        iou[i, :] = 0.0
+        iou[:, j] = 0.0
+    return matches
+
+
+class InferenceBenchmark:
+    """Vergleicht Inference-Backends nach Durchsatz und Übereinstimmung mit PyTorch."""
+
+    def __init__(self, frames_dir="saved_data", limit=200, imgsz=640, conf=0.5, warmup=5):
+        self.frames_dir = frames_dir
+        self.limit = limit
+        self.imgsz = imgsz
+        self.conf = conf
+        self.warmup = warmup
+
+    def load_frames(self):
+        """Lade gespeicherte Event-Frames (gleichmäßig verteilt, höchstens ``limit``)."""
+        frames = []
+        for path in calibration_images(self.frames_dir, self.limit):
+            frame = cv2.imread(path)
+            if frame is not None:
+                frames.append(frame)
+        return frames
+
+    def run_backend(self, model, frames, device):
+        """Detektionen aller Frames und Durchsatz in FPS."""
+        for frame in frames[:self.warmup]:
+            model.predict(frame, imgsz=self.imgsz, conf=self.conf, device=device, verbose=False)
+
+        detections = []
+        start_time = time.perf_counter()
+        for frame in frames:
+            boxes = model.predict(frame, imgsz=self.imgsz, conf=self.conf, device=device, verbose=False)[0].boxes
+            detections.append((boxes.xyxy.cpu().numpy(), boxes.cls.cpu().numpy().astype(int)))
+        elapsed = time.perf_counter() - start_time
+        return detections, len(frames) / elapsed if elapsed > 0 else 0.0
+
+    @staticmethod
+    def agreement(reference, candidate):
+        """Recall und Precision gegenüber der Referenz über alle Frames."""
+        matched = sum(match_detections(ref, cand) for ref, cand in zip(reference, candidate))
+        ref_total = sum(len(ref[0]) for ref in reference)
+        cand_total = sum(len(cand[0]) for cand in candidate)
+        recall = matched / ref_total if ref_total else 1.0
+        precision = matched / cand_total if cand_total else 1.0
+        return recall, precision
+
+
+def main():
+    """Hauptfunktion für Command-Line Interface."""
+    parser = argparse.ArgumentParser(description='Benchmark der YOLO-Inference-Backends')
+    parser.add_argument('--weights', type=str, default='best.pt',
+                       help='PyTorch-Gewichte (Baseline und Quelle für den Export)')
+    parser.add_argument('--frames', type=str, default='saved_data',
+                       help='Verzeichnis mit gespeicherten Event-Frames')
+    parser.add_argument('--backends', nargs='+', default=['onnx', 'openvino'],
+                       help='Zu vergleichende Backends (onnx, openvino)')
+    parser.add_argument('--int8', action='store_true',
+                       help='Zusätzlich int8-quantisierte Exporte vergleichen')
+    parser.add_argument('--limit', type=int, default=200,
+                       help='Maximale Anzahl Frames')
+    parser.add_argument('--device', type=str, default='cpu',
+                       help='Gerät für die Inference (cpu oder cuda)')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Ergebnisse zusätzlich als CSV speichern')
+
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+
+    benchmark = InferenceBenchmark(args.frames, args.limit)
+    frames = benchmark.load_frames()
+    if not frames:
+        print(f"Keine Frames in {args.frames} gefunden.")
+        return
+    print(f"{len(frames)} Frames geladen")
+
+    baseline, baseline_fps = benchmark.run_backend(YOLO(args.weights), frames, args.device)
+    rows = [{'backend': 'pytorch', 'fps': baseline_fps, 'speedup': 1.0, 'recall': 1.0, 'precision': 1.0}]
+
+    variants = [(backend, False) for backend in args.backends]
+    if args.int8:
+        variants += [(backend, True) for backend in args.backends]
+
+    for backend, int8 in variants:
+        name = f"{backend}{'-int8' if int8 else ''}"
+        try:
+            path = export_model(args.weights, backend, int8, args.frames)
+            detections, fps = benchmark.run_backend(YOLO(path, task='detect'), frames, args.device)
+        except Exception as e:
+            print(f"{name}: fehlgeschlagen ({e})")
+            continue
+        recall, precision = benchmark.agreement(baseline, detections)
+        rows.append({
+            'backend': name,
+            'fps': fps,
+            'speedup': fps / baseline_fps if baseline_fps else 0.0,
+            'recall': recall,
+            'precision': precision,
+        })
+
+    print("\nInference-Backends im Vergleich zu PyTorch")
+    print("-" * 60)
+    for row in rows:
+        print(f"{row['backend']:<16} {row['fps']:7.1f} FPS  x{row['speedup']:.2f}  "
+              f"Übereinstimmung: Recall {row['recall']:.1%}  Precision {row['precision']:.1%}")
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['backend', 'fps', 'speedup', 'recall', 'precision'])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nErgebnisse gespeichert: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
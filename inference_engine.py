@@ -0,0 +1,222 @@
+import time
+import multiprocessing as mp
+
+import yaml
+import numpy as np
+import torch
+
+from config_utils import load_ocr_config, load_performance_config
+from motion_gate import create_motion_gate
+from roi import resolve_roi, crop_roi
+from capture import LatestFrameCapture
+from model_export import load_detection_model
+from frame_ring import FrameRing, FrameRingReader, frame_ring_name
+from track_state import FrameDetections
+
+
+def capture_ring_name(prefix: str, cam_idx: int) -> str:
+    """Ring, in den der Capture-Prozess einer Kamera die rohen Frames schreibt."""
+    return frame_ring_name(f"{prefix}_capture", cam_idx)
+
+
+def tracks_ring_name(prefix: str, cam_idx: int) -> str:
+    """Ring, in den die Inference-Engine Frame und getrackte Boxen einer Kamera schreibt."""
+    return frame_ring_name(f"{prefix}_tracks", cam_idx)
+
+
+def create_tracker(tracker_config: str = "botsort.yaml", frame_rate: int = 30):
+    """Eigener BoT-SORT/ByteTrack-Tracker mit den Einstellungen aus ``tracker_config``."""
+    from ultralytics.trackers.bot_sort import BOTSORT
+    from ultralytics.trackers.byte_tracker import BYTETracker
+    from ultralytics.utils import IterableSimpleNamespace
+
+    with open(tracker_config, encoding="utf-8") as f:
+        args = IterableSimpleNamespace(**yaml.safe_load(f))
+    tracker_cls = {'botsort': BOTSORT, 'bytetrack': BYTETracker}[args.tracker_type]
+    return tracker_cls(args=args, frame_rate=frame_rate)
+
+
+def capture_worker(cam_idx: int, stream_url: str, frame_ring_prefix: str, stop_event: mp.Event):
+    """Liest den RTSP-Stream einer Kamera und legt jeden Frame samt Aufnahmezeitpunkt in deren Capture-Ring."""
+    capture = LatestFrameCapture(stream_url, f"Capture {cam_idx}").start()
+    ring = None
+    last_stats = time.time()
+    try:
+        while not stop_event.is_set():
+            frame, captured_at = capture.read(timeout=1.0)
+            if frame is None:
+                continue
+
+            if ring is None or frame.shape != ring.frame_shape:
+                if ring is not None:
+                    ring.close()
+                ring = FrameRing.create(capture_ring_name(frame_ring_prefix, cam_idx), frame.shape)
+            ring.write(frame, [], timestamp=captured_at)
+
+            if time.time() - last_stats > 60:
+                print(f"Capture {cam_idx}: {capture.stats}")
+                last_stats = time.time()
+    finally:
+        capture.stop()
+        if ring is not None:
+            ring.close()
+        print(f"Capture {cam_idx}: beendet")
+
+
+def inference_engine_worker(streams: list, frame_ring_prefix: str, stop_event: mp.Event):
+    """Zentrale YOLO-Inference für alle Kameras.
+
+    Holt den jeweils neuesten Frame jeder Kamera aus deren Capture-Ring, rechnet
+    die Inference-Bereiche (ROI) aller Kameras in einem gebündelten Forward-Pass
+    und führt pro Kamera einen eigenen BoT-SORT-Tracker. Frame und getrackte
+    Boxen (Vollbild-Koordinaten) gehen über den Tracks-Ring an den
+    Tracking-Worker der Kamera zurück.
+    """
+    num_cams = len(streams)
+    performance_config = load_performance_config()
+    batch_wait = performance_config['inference_batch_wait_ms'] / 1000.0
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = load_detection_model(performance_config, device)
+    names = {int(cls_id): name for cls_id, name in model.names.items()}
+    trackers = {cam_idx: create_tracker() for cam_idx in range(1, num_cams + 1)}
+    # Ruhige Kameras nur im Herzschlag-Takt rechnen; Tracker sehen die Lücken nicht
+    gates = {}
+    if performance_config['motion_gate']:
+        ocr_config = load_ocr_config()
+        gates = {cam_idx: create_motion_gate(ocr_config, performance_config) for cam_idx in trackers}
+    active_tracks = {cam_idx: True for cam_idx in trackers}
+
+    def roi_for(cam_idx, frame_shape):
+        stream = streams[cam_idx - 1]
+        return resolve_roi(
+            frame_shape, stream['orientation'], stream['line1'], stream['line2'],
+            stream.get('roi') if performance_config['roi_inference'] else 'full',
+            performance_config['roi_margin'],
+        )
+    readers = {
+        cam_idx: FrameRingReader(capture_ring_name(frame_ring_prefix, cam_idx))
+        for cam_idx in range(1, num_cams + 1)
+    }
+    track_rings = {}
+    print(f"Inference Engine: bereit ({num_cams} Kameras, Gerät {device})")
+
+    frames = 0
+    batches = 0
+    last_stats = time.time()
+
+    try:
+        while not stop_event.is_set():
+            # Neueste Frames aller Kameras einsammeln; nach dem ersten kurz auf die übrigen warten
+            batch = {}
+            deadline = None
+            while len(batch) < num_cams and not stop_event.is_set():
+                for cam_idx, reader in readers.items():
+                    if cam_idx not in batch:
+                        snapshot = reader.poll(copy=True)
+                        if snapshot is not None:
+                            batch[cam_idx] = snapshot
+                if batch and deadline is None:
+                    deadline = time.time() + batch_wait
+                if deadline is not None and time.time() >= deadline:
+                    break
+                time.sleep(0.001)
+            if not batch:
+                continue
+
+            cam_ids = list(batch)
+            regions = {cam_idx: roi_for(cam_idx, batch[cam_idx]['frame'].shape) for cam_idx in cam_ids}
+            crops = {cam_idx: crop_roi(batch[cam_idx]['frame'], regions[cam_idx]) for cam_idx in cam_ids}
+            infer_ids = [
+                cam_idx for cam_idx in cam_ids
+                if cam_idx not in gates or gates[cam_idx].should_infer(crops[cam_idx], active_tracks[cam_idx])
+            ]
+            results = {}
+            if infer_ids:
+                predictions = model.predict(
+                    [crops[cam_idx] for cam_idx in infer_ids],
+                    conf=0.5, imgsz=640, device=device, verbose=False,
+                )
+                results = dict(zip(infer_ids, predictions))
+
+            for cam_idx in cam_ids:
+                image = batch[cam_idx]['frame']
+                result = results.get(cam_idx)
+                if result is None:
+                    # Inference ausgelassen: Frame ohne Boxen weitergeben
+                    rows = np.empty((0, 7))
+                else:
+                    boxes = result.boxes.cpu().numpy()
+                    tracks = trackers[cam_idx].update(boxes, crops[cam_idx])
+                    active_tracks[cam_idx] = len(tracks) > 0
+                    if len(tracks):
+                        # [x1, y1, x2, y2, id, conf, cls, idx]
+                        rows = np.asarray(tracks)[:, :7]
+                    else:
+                        # Wie im Ultralytics-Track-Modus: ohne Tracks die Detektionen ohne ID weitergeben
+                        rows = np.column_stack([
+                            boxes.xyxy, np.full(len(boxes), -1.0), boxes.conf, boxes.cls,
+                        ]) if len(boxes) else np.empty((0, 7))
+                    # ROI- in Vollbild-Koordinaten
+                    x1, y1 = regions[cam_idx][:2]
+                    rows[:, :4] += (x1, y1, x1, y1)
+
+                ring = track_rings.get(cam_idx)
+                if ring is None or image.shape != ring.frame_shape:
+                    if ring is not None:
+                        ring.close()
+                    ring = track_rings[cam_idx] = FrameRing.create(
+                        tracks_ring_name(frame_ring_prefix, cam_idx), image.shape
+                    )
+                ring.write(image, {'tracks': rows.tolist(), 'names': names}, timestamp=batch[cam_idx]['timestamp'])
+
+            if infer_ids:
+                frames += len(infer_ids)
+                batches += 1
+            if batches and time.time() - last_stats > 60:
+                skipped = {cam_idx: reader.skipped for cam_idx, reader in readers.items()}
+                print(f"Inference Engine: {frames} Frames in {batches} Batches "
+                      f"(Ø {frames / batches:.1f} pro Batch), übersprungen: {skipped}")
+                if gates:
+                    print(f"Inference Engine: Motion-Gate: { {cam_idx: gate.stats for cam_idx, gate in gates.items()} }")
+                last_stats = time.time()
+    finally:
+        for reader in readers.values():
+            reader.close()
+        for ring in track_rings.values():
+            ring.close()
+        print("Inference Engine: beendet")
+
+
+def engine_frames(frame_ring_prefix: str, cam_idx: int, max_stall: float = 60.0):
+    """Frames und getrackte Boxen einer Kamera von der Inference-Engine.
+
+    Liefert (Frame, FrameDetections, Aufnahmezeitpunkt) wie der lokale Tracking-Stream.
+    Kommt ``max_stall`` Sekunden lang kein Frame (Kamera tot oder Engine beendet),
+    endet der Stream und damit der Worker - wie bei ``local_frames``.
+    """
+    reader = FrameRingReader(tracks_ring_name(frame_ring_prefix, cam_idx))
+    names = None
+    last_frame_time = time.time()
+    try:
+        while True:
+            snapshot = reader.poll(copy=True)
+            if snapshot is None:
+                if time.time() - last_frame_time > max_stall:
+                    print(f"Track Worker {cam_idx}: Seit {max_stall:.0f} s kein Frame von der Inference-Engine, "
+                          f"Stream beendet")
+                    return
+                time.sleep(0.002)
+                continue
+            last_frame_time = time.time()
+            objects = snapshot['objects']
+            if not isinstance(objects, dict):
+                # Boxen passten nicht in den Slot - Frame ohne Boxen weitergeben
+                if names is None:
+                    continue
+                objects = {'tracks': []}
+            if names is None:
+                names = {int(cls_id): name for cls_id, name in objects['names'].items()}
+            yield snapshot['frame'], FrameDetections.from_tracks(objects['tracks'], names), snapshot['timestamp']
+    finally:
+        reader.close()
@@ -5,11 +5,16 @@ from config_utils import (
     load_active_location,
     load_config,
     load_commercial_licenses,
+    load_ocr_config,
+    load_performance_config,
 )
 from image_utils import sanitize_filename
 from preview import preview_worker
 from tracking import track_worker
 from aggregator_events import aggregator_worker
+from ocr_service import ocr_service_worker
+from inference_engine import capture_worker, inference_engine_worker
+from model_export import export_model
 
 # Ensure UDP transport for RTSP
 os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "rtsp_transport;udp"
@@ -19,6 +24,8 @@ def main():
     location = load_active_location()
     cfg = load_config(location)
     commercial = load_commercial_licenses()
+    ocr_config = load_ocr_config()
+    performance_config = load_performance_config()
 
     # Use the location name directly from active_location.txt
     # Only apply sanitize_filename to dynamic content, not location names
@@ -27,13 +34,17 @@ def main():
     manager = mp.Manager()
     daily_counter = manager.Value('i', 0)
     daily_lock = manager.Lock()
-    # Shared dict für Event-Screenshots von allen Kameras
-    screenshot_events = manager.dict()
+    # Shared-Memory-Ringpuffer für Event-Screenshots und Vorschau (je Kamera, Präfix pro Lauf)
+    frame_ring_prefix = f"wsv_frames_{os.getpid()}"
     
     num_cams = len(cfg['streams'])
-    queues = [mp.Queue(maxsize=2) for _ in cfg['streams']]
     event_queue = mp.Queue()
     stop_event = mp.Event()
+    # OCR-Service: eine Anfrage-Queue für alle Kameras, Ergebnisse je Kamera
+    ocr_request_queue = mp.Queue(maxsize=ocr_config['ocr_queue_size'])
+    ocr_result_queues = [mp.Queue() for _ in cfg['streams']]
+    # Lebenszeichen der Vorschau; ohne Vorschau zeichnen die Worker keine Overlays
+    preview_heartbeat = mp.Value('d', 0.0)
 
     # Erstelle zentrale Verzeichnisse mit original location name
     base_save_dir = os.path.join("saved_data", location_for_paths)
@@ -47,17 +58,60 @@ def main():
     print("Primary detection: Camera 2")
     print("License matching: Camera 1 & 3")
 
-    # Preview Process
-    preview = mp.Process(target=preview_worker, args=(queues, daily_counter))
-    preview.start()
+    # Preview Process (nicht im Headless-Betrieb bzw. ohne Display)
+    headless = performance_config['headless']
+    if headless == 'auto':
+        headless = os.name != 'nt' and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    preview = None
+    if headless:
+        print("Headless-Betrieb: keine Vorschau, keine Overlays")
+    else:
+        preview = mp.Process(target=preview_worker, args=(num_cams, frame_ring_prefix, daily_counter, preview_heartbeat))
+        preview.start()
 
     # Aggregator Process with original location name
     aggregator = mp.Process(
         target=aggregator_worker,
-        args=(event_queue, location_for_paths, stop_event, daily_counter, daily_lock, 120, 20),
+        args=(event_queue, location_for_paths, stop_event, daily_counter, daily_lock, 10, 20),
     )
     aggregator.start()
 
+    # OCR Service Process (ein EasyOCR-Reader für alle Kameras)
+    ocr_service = mp.Process(
+        target=ocr_service_worker,
+        args=(ocr_request_queue, ocr_result_queues, commercial, stop_event),
+    )
+    ocr_service.start()
+
+    # Modell einmalig für das gewählte Backend exportieren, bevor die Worker es laden
+    if performance_config['inference_backend'] != 'pytorch':
+        try:
+            model_path = export_model(
+                "best.pt",
+                performance_config['inference_backend'],
+                performance_config['inference_int8'],
+                performance_config['int8_calibration_dir'],
+            )
+            print(f"Inference-Backend {performance_config['inference_backend']}: {model_path}")
+        except Exception as e:
+            print(f"Modell-Export fehlgeschlagen, Worker verwenden PyTorch: {e}")
+
+    # Zentrale Inference: Capture-Prozesse pro Kamera und ein gebündelter YOLO-Prozess
+    engine_procs = []
+    if performance_config['inference_mode'] == 'central':
+        print("Inference: zentrale Engine für alle Kameras")
+        for i, stream in enumerate(cfg['streams'], start=1):
+            engine_procs.append(mp.Process(
+                target=capture_worker,
+                args=(i, stream['url'], frame_ring_prefix, stop_event),
+            ))
+        engine_procs.append(mp.Process(
+            target=inference_engine_worker,
+            args=(cfg['streams'], frame_ring_prefix, stop_event),
+        ))
+        for p in engine_procs:
+            p.start()
+
     # Tracking Processes für alle Kameras with original location name
     procs = []
     for i, stream in enumerate(cfg['streams'], start=1):
@@ -72,12 +126,15 @@ def main():
                 stream['line2'],
                 stream['orientation'],
                 commercial,
-                queues[i - 1],
                 event_queue,
-                screenshot_events,
+                frame_ring_prefix,
                 num_cams,
                 daily_counter,
                 daily_lock,
+                ocr_request_queue,
+                ocr_result_queues[i - 1],
+                preview_heartbeat,
+                stream['roi'],
             ),
         )
         p.start()
@@ -95,12 +152,18 @@ def main():
             p.terminate()
 
     # Stoppe Preview
-    preview.terminate()
-    preview.join()
+    if preview is not None:
+        preview.terminate()
+        preview.join()
 
-    # Stoppe Aggregator
+    # Stoppe Aggregator, OCR Service und Inference
     stop_event.set()
     aggregator.join()
+    ocr_service.join()
+    for p in engine_procs:
+        p.join(timeout=10)
+        if p.is_alive():
+            p.terminate()
 
     print("All processes terminated. System shutdown complete.")
 
@@ -0,0 +1,162 @@
+import os
+import glob
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+# Unterstützte Inference-Backends und ihr Ultralytics-Exportformat
+INFERENCE_BACKENDS = {
+    'pytorch': None,
+    'onnx': 'onnx',
+    'openvino': 'openvino',
+}
+
+
+def exported_model_path(weights: str, backend: str, int8: bool = False) -> str:
+    """Pfad des exportierten Modells neben den Gewichten (z.B. ``best_int8.onnx``)."""
+    if backend == 'pytorch':
+        return weights
+    stem = os.path.splitext(weights)[0] + ("_int8" if int8 else "")
+    if backend == 'onnx':
+        return stem + ".onnx"
+    return stem + "_openvino_model"
+
+
+def calibration_images(calibration_dir: str, limit: int = 300) -> list:
+    """Bilder für die int8-Kalibrierung, z.B. die gespeicherten Event-Screenshots."""
+    paths = sorted(
+        glob.glob(os.path.join(calibration_dir, "**", "*.jpg"), recursive=True)
+        + glob.glob(os.path.join(calibration_dir, "**", "*.png"), recursive=True)
+    )
+    if len(paths) > limit:
+        # Gleichmäßig über den Zeitraum verteilen statt nur die ersten Events
+        step = len(paths) / limit
+        paths = [paths[int(i * step)] for i in range(limit)]
+    return paths
+
+
+def _letterbox(image, imgsz: int):
+    """Wie die Ultralytics-Vorverarbeitung: Seitenverhältnis halten, mit Grau (114) auffüllen."""
+    h, w = image.shape[:2]
+    scale = min(imgsz / h, imgsz / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - new_h) // 2, (imgsz - new_w) // 2
+    canvas[top:top + new_h, left:left + new_w] = resized
+    return canvas
+
+
+class _OnnxCalibrationReader:
+    """Kalibrierdaten für ``onnxruntime.quantization.quantize_static``."""
+
+    def __init__(self, input_name: str, paths: list, imgsz: int):
+        self.input_name = input_name
+        self.paths = iter(paths)
+        self.imgsz = imgsz
+
+    def get_next(self):
+        for path in self.paths:
+            image = cv2.imread(path)
+            if image is None:
+                continue
+            blob = _letterbox(image, self.imgsz)[:, :, ::-1].transpose(2, 0, 1)
+            blob = np.ascontiguousarray(blob, dtype=np.float32)[None] / 255.0
+            return {self.input_name: blob}
+        return None
+
+    def rewind(self):
+        pass
+
+
+def _quantize_onnx(fp32_path: str, int8_path: str, paths: list, imgsz: int):
+    import onnxruntime
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+    input_name = onnxruntime.InferenceSession(fp32_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    quantize_static(
+        fp32_path,
+        int8_path,
+        _OnnxCalibrationReader(input_name, paths, imgsz),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+
+
+def export_model(weights: str = "best.pt", backend: str = "onnx", int8: bool = False,
+                 calibration_dir: str = "saved_data", imgsz: int = 640) -> str:
+    """Exportiert ``weights`` einmalig und liefert den Pfad des Modells.
+
+    Ein vorhandener Export, der jünger als die Gewichte ist, wird
+    wiederverwendet. Für int8 wird mit den Bildern aus ``calibration_dir``
+    kalibriert; ohne Bilder fällt der Export auf FP32 zurück.
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unbekanntes Inference-Backend '{backend}' (erlaubt: {', '.join(INFERENCE_BACKENDS)})")
+    if backend == 'pytorch':
+        return weights
+
+    paths = calibration_images(calibration_dir) if int8 else []
+    if int8 and not paths:
+        print(f"Modell-Export: keine Kalibrierbilder in {calibration_dir}, exportiere ohne int8")
+        int8 = False
+
+    target = exported_model_path(weights, backend, int8)
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(weights):
+        return target
+
+    from ultralytics import YOLO
+
+    print(f"Modell-Export: {weights} -> {target} ({backend}{', int8' if int8 else ''})")
+    model = YOLO(weights)
+
+    if backend == 'onnx':
+        fp32_path = model.export(format='onnx', imgsz=imgsz, dynamic=True, simplify=True)
+        if int8:
+            _quantize_onnx(fp32_path, target, paths, imgsz)
+        elif os.path.abspath(fp32_path) != os.path.abspath(target):
+            shutil.move(fp32_path, target)
+        return target
+
+    # OpenVINO: int8 über NNCF, Kalibrierung mit einem temporären Datensatz aus den Event-Frames
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        export_args = dict(format='openvino', imgsz=imgsz, dynamic=True)
+        if int8:
+            image_dir = os.path.join(tmp_dir, "images")
+            os.makedirs(image_dir)
+            for i, path in enumerate(paths):
+                shutil.copy(path, os.path.join(image_dir, f"{i:05d}{os.path.splitext(path)[1]}"))
+            data_yaml = os.path.join(tmp_dir, "calibration.yaml")
+            with open(data_yaml, "w", encoding="utf-8") as f:
+                f.write(f"path: {tmp_dir}\ntrain: images\nval: images\n")
+                f.write("names:\n" + "".join(f"  {cls_id}: {name}\n" for cls_id, name in model.names.items()))
+            export_args.update(int8=True, data=data_yaml)
+        exported = model.export(**export_args)
+
+    if os.path.abspath(exported) != os.path.abspath(target):
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        shutil.move(exported, target)
+    return target
+
+
+def load_detection_model(performance_config: dict, device: str, weights: str = "best.pt"):
+    """YOLO-Modell im konfigurierten Backend; exportiert beim ersten Start.
+
+    Fällt bei einem fehlgeschlagenen Export auf PyTorch zurück.
+    """
+    from ultralytics import YOLO
+
+    backend = performance_config['inference_backend']
+    if backend != 'pytorch':
+        try:
+            path = export_model(weights, backend, performance_config['inference_int8'],
+                                performance_config['int8_calibration_dir'])
+            return YOLO(path, task='detect')
+        except Exception as e:
+            print(f"Modell-Export für Backend '{backend}' fehlgeschlagen, verwende PyTorch: {e}")
+    return YOLO(weights).to(device)
@@ -0,0 +1,67 @@
+import time
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Entscheidet pro Frame, ob YOLO laufen muss.
+
+    Auf einem verkleinerten Graustufenbild wird gegen einen gleitenden
+    Hintergrund verglichen; auch langsam fahrende Boote fallen so auf. Ohne
+    Bewegung und ohne aktive Tracks läuft die Inference nur noch mit
+    ``idle_fps`` (Herzschlag). Bei Bewegung oder einem aktiven Track geht es
+    sofort zurück auf volle Rate und bleibt dort mindestens ``hold_seconds``.
+    """
+
+    def __init__(self, threshold: float = 50.0, idle_fps: float = 1.0, hold_seconds: float = 3.0,
+                 width: int = 160, pixel_delta: int = 25, learning_rate: float = 0.05):
+        # Mindestanzahl geänderter Pixel im verkleinerten Bild
+        self.threshold = threshold
+        self.idle_interval = 1.0 / max(0.01, idle_fps)
+        self.hold_seconds = hold_seconds
+        self.width = width
+        self.pixel_delta = pixel_delta
+        self.learning_rate = learning_rate
+        self.background = None
+        self.active_until = 0.0
+        self.last_inference = 0.0
+        self.stats = {'inferred': 0, 'skipped': 0}
+
+    def motion(self, frame) -> bool:
+        """True, wenn sich das Bild gegenüber dem Hintergrund sichtbar verändert hat."""
+        h, w = frame.shape[:2]
+        small = cv2.resize(frame, (self.width, max(1, h * self.width // w)), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        gray = cv2.GaussianBlur(gray, (5, 5), 0)
+
+        if self.background is None or self.background.shape != gray.shape:
+            self.background = gray.astype(np.float32)
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        cv2.accumulateWeighted(gray, self.background, self.learning_rate)
+        changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_delta, 255, cv2.THRESH_BINARY)[1])
+        return changed >= self.threshold
+
+    def should_infer(self, frame, active_tracks: bool, now: float = None) -> bool:
+        """True, wenn für diesen Frame YOLO laufen soll."""
+        now = time.time() if now is None else now
+        if self.motion(frame) or active_tracks:
+            self.active_until = now + self.hold_seconds
+
+        if now < self.active_until or now - self.last_inference >= self.idle_interval:
+            self.last_inference = now
+            self.stats['inferred'] += 1
+            return True
+        self.stats['skipped'] += 1
+        return False
+
+
+def create_motion_gate(ocr_config: dict, performance_config: dict) -> MotionGate:
+    """MotionGate mit ``frame_skip_threshold`` aus ``[ocr_settings]`` und den Raten aus ``[performance]``."""
+    return MotionGate(
+        threshold=ocr_config['frame_skip_threshold'],
+        idle_fps=performance_config['idle_inference_fps'],
+        hold_seconds=performance_config['motion_hold_seconds'],
+    )
@@ -0,0 +1,272 @@
+import time
+import queue
+import multiprocessing as mp
+from collections import defaultdict, deque
+
+import torch
+import easyocr
+
+from config_utils import load_ocr_config
+from image_utils import (
+    ocr_license_crops_batch,
+    get_shared_validator,
+    configure_preprocessing_backends,
+    preprocessing_backends_from_config,
+)
+
+
+def create_ocr_reader(ocr_config: dict):
+    """Erstellt den EasyOCR-Reader passend zur OCR-Konfiguration."""
+    gpu = torch.cuda.is_available() and ocr_config['enable_gpu_acceleration']
+    if ocr_config['ocr_recognizer_only']:
+        # YOLO liefert die Kennzeichen-Box bereits: kein Textdetektor, nur das kompakte en-Modell
+        return easyocr.Reader(["en"], gpu=gpu, detector=False)
+    return easyocr.Reader(["en", "de"], gpu=gpu)
+
+
+def ocr_service_worker(
+    request_queue: mp.Queue,
+    result_queues: list,
+    commercial_licenses: set,
+    stop_event: mp.Event,
+):
+    """Zentraler OCR-Prozess für alle Kameras.
+
+    Sammelt Kennzeichen-Crops aller Tracking-Worker zu Batches (höchstens
+    ``ocr_batch_size`` Crops bzw. ``ocr_batch_wait_ms`` Wartezeit nach dem
+    ersten Crop) und schickt jedes Ergebnis an die Ergebnis-Queue der
+    anfragenden Kamera zurück.
+    """
+    ocr_config = load_ocr_config()
+    batch_size = max(1, ocr_config['ocr_batch_size'])
+    batch_wait = ocr_config['ocr_batch_wait_ms'] / 1000.0
+
+    # Ergebnisse sind verzichtbar: beim Beenden nicht auf nie abgeholte Ergebnisse warten
+    for result_queue in result_queues:
+        result_queue.cancel_join_thread()
+
+    backends = configure_preprocessing_backends(preprocessing_backends_from_config(ocr_config))
+    reader = create_ocr_reader(ocr_config)
+    get_shared_validator(commercial_licenses)
+    print(f"OCR Service: Vorverarbeitung {backends}")
+    print(f"OCR Service: bereit (Batch bis {batch_size} Crops, "
+          f"Recognizer-only: {ocr_config['ocr_recognizer_only']})")
+
+    processed = 0
+    batches = 0
+    last_stats = time.time()
+
+    while not stop_event.is_set():
+        try:
+            batch = [request_queue.get(timeout=0.5)]
+        except queue.Empty:
+            continue
+
+        # Weitere Anfragen (auch anderer Kameras) für denselben Batch einsammeln
+        deadline = time.time() + batch_wait
+        while len(batch) < batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(request_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            results = ocr_license_crops_batch(
+                [request['crop'] for request in batch],
+                reader,
+                commercial_licenses,
+                ocr_config['min_frame_quality'],
+                recognizer_only=ocr_config['ocr_recognizer_only'],
+                quality_scores=[request['quality_score'] for request in batch],
+                early_exit_score=ocr_config['ocr_early_exit_score'],
+                time_budget_ms=ocr_config['ocr_time_budget_ms'],
+            )
+        except Exception as e:
+            print(f"OCR Service: Fehler im Batch: {e}")
+            results = [("", 0.0, "error", [])] * len(batch)
+
+        for request, (text, confidence, method, preprocessing_methods) in zip(batch, results):
+            result_queues[request['cam_idx'] - 1].put({
+                'cam_idx': request['cam_idx'],
+                'tid': request['tid'],
+                'frame_id': request['frame_id'],
+                'text': text,
+                'conf': confidence,
+                'method': method,
+                'quality_score': request['quality_score'],
+                'preprocessing_methods': preprocessing_methods,
+                'submitted': request['submitted'],
+            })
+
+        processed += len(batch)
+        batches += 1
+        if time.time() - last_stats > 60:
+            print(f"OCR Service: {processed} Crops in {batches} Batches "
+                  f"(Ø {processed / batches:.1f} pro Batch)")
+            last_stats = time.time()
+
+    print("OCR Service: beendet")
+
+
+class OCRClient:
+    """Nicht-blockierende Anbindung eines Tracking-Workers an den OCR-Service.
+
+    Pro Track ist höchstens eine Anfrage unterwegs; ist die Anfrage-Queue voll,
+    wird der Crop verworfen statt den Frame-Loop aufzuhalten. Teilen sich
+    mehrere Tracks ein Kennzeichen, geht eine Anfrage raus und ``poll``
+    liefert das Ergebnis an jeden dieser Tracks.
+    """
+
+    def __init__(self, cam_idx: int, request_queue: mp.Queue, result_queue: mp.Queue,
+                 pending_timeout: float = 5.0):
+        self.cam_idx = cam_idx
+        self.request_queue = request_queue
+        self.result_queue = result_queue
+        self.pending_timeout = pending_timeout
+        self.pending = {}
+        # Track-ID der Anfrage -> weitere Tracks, die dasselbe Kennzeichen gewählt haben
+        self.shared = {}
+        self.dropped = 0
+
+    def submit(self, tids, crop, quality_score: float, frame_id: int) -> list:
+        """Schickt einen Kennzeichen-Crop (Graustufen oder BGR) für die Tracks ``tids`` an den Service.
+
+        Rückgabe: die Tracks, für die der Crop angefordert wurde (ohne Tracks
+        mit noch offener Anfrage); leer, wenn nichts gesendet wurde.
+        """
+        now = time.time()
+        tids = [tid for tid in tids
+                if tid not in self.pending or now - self.pending[tid] >= self.pending_timeout]
+        if not tids:
+            return []
+
+        try:
+            self.request_queue.put_nowait({
+                'cam_idx': self.cam_idx,
+                'tid': tids[0],
+                'frame_id': frame_id,
+                'crop': crop.copy(),
+                'quality_score': quality_score,
+                'submitted': now,
+            })
+        except queue.Full:
+            self.dropped += 1
+            return []
+
+        for tid in tids:
+            self.pending[tid] = now
+        self.shared[tids[0]] = tids[1:]
+        return tids
+
+    def poll(self) -> list:
+        """Liefert alle inzwischen eingetroffenen Ergebnisse (eins pro Track), ohne zu warten."""
+        results = []
+        while True:
+            try:
+                result = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+            for tid in [result['tid']] + self.shared.pop(result['tid'], []):
+                self.pending.pop(tid, None)
+                results.append(dict(result, tid=tid))
+        return results
+
+    def forget(self, tid):
+        """Vergisst einen verschwundenen Track (offene Anfrage, geteilte Ergebnisse)."""
+        self.pending.pop(tid, None)
+        self.shared.pop(tid, None)
+
+
+class OCRScheduler:
+    """Entscheidet pro Frame, welche Tracks einen OCR-Auftrag bekommen.
+
+    - Tracks mit feststehendem Ergebnis (``settle``) bekommen keine OCR mehr
+    - höchstens ``max_attempts_per_second`` Aufträge pro Track und Sekunde
+    - höchstens ``max_requests_per_frame`` Aufträge pro Frame, Tracks nahe
+      den Zähllinien (kleinste Priorität) zuerst
+    - Tracks mit demselben Kennzeichen (``key``) teilen sich einen Auftrag;
+      ``licence_hits``/``licence_misses`` zählen geteilte bzw. eigene Aufträge
+    """
+
+    def __init__(self, max_attempts_per_second: int = 3, max_requests_per_frame: int = 2):
+        self.max_attempts_per_second = max(1, max_attempts_per_second)
+        self.max_requests_per_frame = max(1, max_requests_per_frame)
+        self.attempts = defaultdict(deque)
+        self.settled = set()
+        self.last_seen = {}
+        self.stats = {'submitted': 0, 'settled': 0, 'rate_limited': 0, 'deferred': 0,
+                      'licence_hits': 0, 'licence_misses': 0}
+
+    def settle(self, tid):
+        """Markiert einen Track als fertig - keine weiteren OCR-Aufträge."""
+        if tid not in self.settled:
+            # Gezählt wird der Übergang pro Track, nicht jeder übersprungene Frame
+            self.stats['settled'] += 1
+            self.settled.add(tid)
+        self.attempts.pop(tid, None)
+
+    def due(self, tid, now: float) -> bool:
+        """True, wenn der Track OCR braucht und sein Limit pro Sekunde nicht erreicht ist."""
+        self.last_seen[tid] = now
+        if tid in self.settled:
+            return False
+
+        attempts = self.attempts.get(tid)
+        if attempts:
+            while attempts and now - attempts[0] >= 1.0:
+                attempts.popleft()
+            if len(attempts) >= self.max_attempts_per_second:
+                self.stats['rate_limited'] += 1
+                return False
+        return True
+
+    def run(self, candidates, submit, now: float = None, key=None) -> int:
+        """Vergibt die OCR-Aufträge eines Frames.
+
+        ``candidates`` sind (Priorität, Track-ID, Nutzdaten)-Tupel. Kandidaten
+        mit gleichem ``key(payload)`` werden zu einem Auftrag zusammengefasst.
+        ``submit(tids, payload)`` liefert die Tracks, für die der Auftrag
+        angenommen wurde.
+        """
+        now = time.time() if now is None else now
+        ordered = sorted(
+            (candidate for candidate in candidates if self.due(candidate[1], now)),
+            key=lambda candidate: candidate[0],
+        )
+
+        # Ein Auftrag pro Kennzeichen, Priorität des Tracks, der den Linien am nächsten ist
+        requests = {}
+        for _, tid, payload in ordered:
+            request_key = key(payload) if key is not None else tid
+            if request_key in requests:
+                requests[request_key][0].append(tid)
+                self.stats['licence_hits'] += 1
+            else:
+                requests[request_key] = ([tid], payload)
+                self.stats['licence_misses'] += 1
+
+        submitted = 0
+        for rank, (tids, payload) in enumerate(requests.values()):
+            if submitted >= self.max_requests_per_frame:
+                self.stats['deferred'] += len(requests) - rank
+                break
+            accepted = submit(tids, payload)
+            if accepted:
+                for tid in accepted:
+                    self.attempts[tid].append(now)
+                submitted += 1
+
+        self.stats['submitted'] += submitted
+        return submitted
+
+    def cleanup(self, max_age_seconds=300):
+        """Vergisst Tracks, die länger nicht mehr gesehen wurden."""
+        current_time = time.time()
+        for tid, last_seen in list(self.last_seen.items()):
+            if current_time - last_seen > max_age_seconds:
+                del self.last_seen[tid]
+                self.attempts.pop(tid, None)
+                self.settled.discard(tid)
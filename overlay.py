@@ -0,0 +1,81 @@
+import cv2
+import numpy as np
+
+from preview import PREVIEW_SIZE
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT_SCALE = 0.4
+TEXT_COLOR = (255, 255, 255)  # Weiß für bessere Lesbarkeit auf farbigem Hintergrund
+
+
+class OverlayRenderer:
+    """Zeichnet Linien, Boxen und Texte auf den verkleinerten Vorschau-Frame.
+
+    Die farbige Label-Box mit dem Klassennamen wird pro Klasse nur einmal
+    gerendert (Sprite) und danach nur noch eingefügt; pro Box werden lediglich
+    Track-ID und Confidence als Text daneben geschrieben.
+    """
+
+    def __init__(self, color_mapper, size=PREVIEW_SIZE):
+        self.color_mapper = color_mapper
+        self.size = size
+        self.sprites = {}
+        self.frame = None
+        self.sx = self.sy = 1.0
+
+    def begin(self, frame):
+        """Verkleinert den Frame auf Vorschaugröße; alle Koordinaten bleiben im Originalmaßstab."""
+        h, w = frame.shape[:2]
+        self.sx, self.sy = self.size[0] / w, self.size[1] / h
+        self.frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        return self.frame
+
+    def point(self, x, y):
+        return int(x * self.sx), int(y * self.sy)
+
+    def _sprite(self, class_name):
+        sprite = self.sprites.get(class_name)
+        if sprite is None:
+            (text_width, text_height), baseline = cv2.getTextSize(class_name, FONT, FONT_SCALE, 1)
+            padding = 2
+            sprite = np.empty((text_height + baseline + 2 * padding, text_width + 2 * padding, 3), dtype=np.uint8)
+            sprite[:] = self.color_mapper.get_color(class_name)
+            cv2.putText(sprite, class_name, (padding, padding + text_height), FONT, FONT_SCALE, TEXT_COLOR, 1)
+            self.sprites[class_name] = sprite
+        return sprite
+
+    def lines(self, orientation, line1, line2):
+        preview_w, preview_h = self.size
+        if orientation == "vertical":
+            for line, color in ((line1, (0, 255, 255)), (line2, (0, 0, 255))):
+                x = int(line * self.sx)
+                cv2.line(self.frame, (x, 0), (x, preview_h), color, 2)
+        else:
+            for line, color in ((line1, (0, 255, 255)), (line2, (0, 0, 255))):
+                y = int(line * self.sy)
+                cv2.line(self.frame, (0, y), (preview_w, y), color, 2)
+
+    def box(self, bbox, class_name, tid, conf_score):
+        """Box mit Klassen-Sprite sowie ID und Confidence."""
+        box_color = self.color_mapper.get_color(class_name)
+        x1, y1 = self.point(bbox[0], bbox[1])
+        x2, y2 = self.point(bbox[2], bbox[3])
+        cv2.rectangle(self.frame, (x1, y1), (x2, y2), box_color, 1)
+
+        # Sprite oberhalb der Box, am Bildrand abgeschnitten
+        sprite = self._sprite(class_name)
+        sprite_h, sprite_w = sprite.shape[:2]
+        top = max(0, y1 - sprite_h)
+        left = max(0, min(x1, self.size[0] - 1))
+        width = min(sprite_w, self.size[0] - left)
+        height = min(sprite_h, self.size[1] - top)
+        if width > 0 and height > 0:
+            self.frame[top:top + height, left:left + width] = sprite[:height, :width]
+
+        detail = f"ID:{tid} {conf_score:.2f}" if tid is not None else f"{conf_score:.2f}"
+        self.text((left + sprite_w + 2, top + sprite_h - 4), detail, box_color, scaled=False)
+
+    def text(self, position, text, color, dy=0, scaled=True):
+        """Text an einer Position (Originalkoordinaten, außer ``scaled=False``), ``dy`` in Vorschau-Pixeln."""
+        x, y = self.point(*position) if scaled else position
+        cv2.putText(self.frame, text, (x, y + dy), FONT, FONT_SCALE, color, 1)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark für die OCR-Vorverarbeitung
+
+Dieses Script misst für jeden Vorverarbeitungs-Schritt die Kosten aller
+Backends auf gespeicherten Kennzeichen-Crops (z.B. ``difficult_cases/``)
+und optional die OCR-Genauigkeit je Backend. So lässt sich das günstigste
+Backend wählen, das die Genauigkeit hält (Einstellung in ``[ocr_settings]``).
+"""
+
+import os
+import re
+import csv
+import glob
+import time
+import argparse
+
+import cv2
+
+from config_utils import load_ocr_config
+from image_utils import (
+    PREPROCESSING_BACKENDS,
+    DEFAULT_PREPROCESSING_BACKENDS,
+    PreprocessingVariants,
+    configure_preprocessing_backends,
+    preprocessing_backends_from_config,
+    get_adaptive_ocr_params,
+    ocr_license_crop,
+)
+
+# Eingangsbild jedes Schritts innerhalb von PreprocessingVariants
+OPERATION_INPUTS = {
+    'contrast': 'gray',
+    'denoise': 'brightness_contrast',
+    'threshold': 'enhanced',
+}
+
+
+def normalize_text(text):
+    """Vergleichsform: Großbuchstaben ohne Leerzeichen."""
+    return re.sub(r'\s+', '', text or '').upper()
+
+
+class PreprocessingBenchmark:
+    """Vergleicht Vorverarbeitungs-Backends nach Laufzeit und OCR-Genauigkeit."""
+
+    def __init__(self, crop_dir="difficult_cases", labels_file=None, licenses_file=None, repeat=3):
+        self.crop_dir = crop_dir
+        self.labels_file = labels_file
+        self.licenses_file = licenses_file
+        self.repeat = max(1, repeat)
+        self.base_backends = dict(DEFAULT_PREPROCESSING_BACKENDS)
+
+    def load_crops(self):
+        """Lade alle Crops (jpg/png) aus dem Verzeichnis."""
+        paths = sorted(
+            glob.glob(os.path.join(self.crop_dir, "*.jpg")) + glob.glob(os.path.join(self.crop_dir, "*.png"))
+        )
+        crops = []
+        for path in paths:
+            crop = cv2.imread(path)
+            if crop is not None and crop.size:
+                crops.append((os.path.basename(path), crop))
+        return crops
+
+    def load_labels(self):
+        """Lade Soll-Texte aus einer CSV mit den Spalten ``filename,text``."""
+        if not self.labels_file:
+            return {}
+        with open(self.labels_file, newline='', encoding='utf-8') as f:
+            return {row['filename']: row['text'] for row in csv.DictReader(f)}
+
+    def load_licenses(self):
+        """Lade gewerbliche Kennzeichen (eine Zeile pro Kennzeichen)."""
+        if not self.licenses_file or not os.path.exists(self.licenses_file):
+            return frozenset()
+        with open(self.licenses_file, encoding='utf-8') as f:
+            return frozenset(line.strip() for line in f if line.strip())
+
+    def time_backends(self, crops):
+        """Kosten je Backend in ms pro Crop (bestes von ``repeat`` Läufen)."""
+        params = get_adaptive_ocr_params()
+        rows = []
+        for operation, backends in PREPROCESSING_BACKENDS.items():
+            # Eingangsbilder einmal mit den Basis-Backends erzeugen
+            inputs = [
+                PreprocessingVariants(crop, params, self.base_backends)[OPERATION_INPUTS[operation]]
+                for _, crop in crops
+            ]
+            for backend, func in backends.items():
+                best = None
+                for _ in range(self.repeat):
+                    start_time = time.perf_counter()
+                    for image in inputs:
+                        func(image)
+                    elapsed = time.perf_counter() - start_time
+                    best = elapsed if best is None else min(best, elapsed)
+                rows.append({
+                    'operation': operation,
+                    'backend': backend,
+                    'ms_per_crop': best * 1000.0 / max(1, len(inputs)),
+                })
+        return rows
+
+    def ocr_accuracy(self, crops, reader, ocr_config, labels, licenses):
+        """OCR-Ergebnisse je Backend (übrige Schritte auf den Basis-Backends)."""
+        rows = []
+        try:
+            for operation, backends in PREPROCESSING_BACKENDS.items():
+                for backend in backends:
+                    configure_preprocessing_backends({**self.base_backends, operation: backend})
+
+                    hits = labelled = commercial = non_empty = 0
+                    confidence_sum = 0.0
+                    start_time = time.perf_counter()
+                    for name, crop in crops:
+                        text, confidence, _, _ = ocr_license_crop(
+                            crop, reader, licenses, quality_threshold=0.0,
+                            recognizer_only=ocr_config['ocr_recognizer_only'],
+                        )
+                        confidence_sum += confidence
+                        non_empty += bool(text)
+                        commercial += text in licenses
+                        if name in labels:
+                            labelled += 1
+                            hits += normalize_text(text) == normalize_text(labels[name])
+                    elapsed = time.perf_counter() - start_time
+
+                    rows.append({
+                        'operation': operation,
+                        'backend': backend,
+                        'accuracy': hits / labelled if labelled else None,
+                        'commercial_rate': commercial / len(crops) if licenses else None,
+                        'text_rate': non_empty / len(crops),
+                        'avg_confidence': confidence_sum / len(crops),
+                        'ocr_ms_per_crop': elapsed * 1000.0 / len(crops),
+                    })
+        finally:
+            configure_preprocessing_backends(self.base_backends)
+        return rows
+
+
+def format_rate(value):
+    return "-" if value is None else f"{value:.1%}"
+
+
+def main():
+    """Hauptfunktion für Command-Line Interface."""
+    parser = argparse.ArgumentParser(description='Benchmark der OCR-Vorverarbeitungs-Backends')
+    parser.add_argument('--crops', type=str, default='difficult_cases',
+                       help='Verzeichnis mit gespeicherten Kennzeichen-Crops')
+    parser.add_argument('--labels', type=str, default=None,
+                       help='CSV mit Soll-Texten (Spalten: filename,text)')
+    parser.add_argument('--licenses', type=str, default='1.txt',
+                       help='Datei mit gewerblichen Kennzeichen (eine pro Zeile)')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Wiederholungen für die Zeitmessung')
+    parser.add_argument('--no-ocr', action='store_true',
+                       help='Nur Laufzeiten messen, keine OCR-Genauigkeit')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Ergebnisse zusätzlich als CSV speichern')
+
+    args = parser.parse_args()
+
+    ocr_config = load_ocr_config()
+    benchmark = PreprocessingBenchmark(args.crops, args.labels, args.licenses, args.repeat)
+    benchmark.base_backends = preprocessing_backends_from_config(ocr_config)
+
+    crops = benchmark.load_crops()
+    if not crops:
+        print(f"Keine Crops in {args.crops} gefunden.")
+        return
+    print(f"{len(crops)} Crops geladen, Basis-Backends: {benchmark.base_backends}")
+
+    print("\nLaufzeit je Backend")
+    print("-" * 50)
+    timing_rows = benchmark.time_backends(crops)
+    for row in timing_rows:
+        print(f"{row['operation']:<10} {row['backend']:<18} {row['ms_per_crop']:8.2f} ms/Crop")
+
+    accuracy_rows = []
+    if not args.no_ocr:
+        from ocr_service import create_ocr_reader
+
+        reader = create_ocr_reader(ocr_config)
+        labels = benchmark.load_labels()
+        licenses = benchmark.load_licenses()
+
+        print("\nOCR-Genauigkeit je Backend")
+        print("-" * 50)
+        accuracy_rows = benchmark.ocr_accuracy(crops, reader, ocr_config, labels, licenses)
+        for row in accuracy_rows:
+            print(f"{row['operation']:<10} {row['backend']:<18} "
+                  f"Genauigkeit: {format_rate(row['accuracy']):>6}  "
+                  f"Gewerblich: {format_rate(row['commercial_rate']):>6}  "
+                  f"Text: {format_rate(row['text_rate']):>6}  "
+                  f"Ø Conf: {row['avg_confidence']:.2f}  "
+                  f"OCR: {row['ocr_ms_per_crop']:.1f} ms/Crop")
+
+    if args.output:
+        accuracy = {(row['operation'], row['backend']): row for row in accuracy_rows}
+        fieldnames = ['operation', 'backend', 'ms_per_crop', 'accuracy', 'commercial_rate',
+                      'text_rate', 'avg_confidence', 'ocr_ms_per_crop']
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in timing_rows:
+                writer.writerow({**row, **accuracy.get((row['operation'], row['backend']), {})})
+        print(f"\nErgebnisse gespeichert: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
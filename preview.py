@@ -1,28 +1,38 @@
+import time
+
 import cv2
 import numpy as np
 
-def preview_worker(queues, daily_counter=None):
+from frame_ring import FrameRingReader, frame_ring_name
+
+# Größe, auf die die Tracking-Worker ihre Vorschau-Frames verkleinern (Breite, Höhe)
+PREVIEW_SIZE = (640, 360)
+
+
+def preview_worker(num_cams, frame_ring_prefix, daily_counter=None, heartbeat=None):
     """Display all camera feeds side by side in einem Fenster mit einer Titelleiste in RGB(239,239,239).
 
     Parameters
     ----------
-    queues : list[mp.Queue]
-        Queues containing JPEG-encoded frames for each stream.
+    num_cams : int
+        Anzahl der Kameras.
+    frame_ring_prefix : str
+        Präfix der Vorschau-Ringpuffer (``<prefix>_preview_cam<i>``), in die
+        die Tracking-Worker bereits verkleinerte Frames schreiben.
     daily_counter : multiprocessing.Value, optional
         Counter, wie viele Boote heute gezählt wurden.
+    heartbeat : multiprocessing.Value, optional
+        Zeitstempel der letzten Fensteraktualisierung; die Tracking-Worker
+        zeichnen Overlays nur, solange er aktuell ist.
     """
-    import queue
-
     window_name = "Live Preview - Alle Kameras"
 
     # Höhe der Leiste oberhalb der Kameraansichten, in der der gelbe Text stehen soll
     title_h = 30
     # Höhe der Infozeile über jeder Kamera (z.B. "Cam 1: 13.9 FPS")
     info_h = 30
-    # Höhe jeder einzelnen Kameradarstellung (jeweils 360 px)
-    cam_h = 360
-    # Breite jeder Kameradarstellung (jeweils 640 px)
-    cam_w = 640
+    # Größe jeder Kameradarstellung (640 x 360 px)
+    cam_w, cam_h = PREVIEW_SIZE
     # Breite des grauen Spacers zwischen den Kamerafenstern
     spacer_w = 20
 
@@ -35,34 +45,42 @@ def preview_worker(queues, daily_counter=None):
     cv2.resizeWindow(window_name, total_w, total_h)
 
     # Platzhalter für die letzten Frames + FPS
-    last_frames = [np.zeros((cam_h, cam_w, 3), dtype=np.uint8) for _ in queues]
-    last_fps = [0.0 for _ in queues]
+    last_frames = [np.zeros((cam_h, cam_w, 3), dtype=np.uint8) for _ in range(num_cams)]
+    last_fps = [0.0 for _ in range(num_cams)]
+
+    # Vorschau-Ringpuffer der Worker (werden angelegt, sobald der erste Frame da ist)
+    # (übersprungene Frames: geschrieben, aber nie angezeigt)
+    readers = [FrameRingReader(frame_ring_name(f"{frame_ring_prefix}_preview", i + 1)) for i in range(num_cams)]
+    last_stats = time.time()
 
     # Spacer zwischen den Kamerafenstern (hellgrau)
     spacer = np.full((info_h + cam_h, spacer_w, 3), 200, dtype=np.uint8)
 
     while True:
-        # 1) Aus jedem Queue das neueste Frame (JPEG) holen und decodieren
-        for i, q in enumerate(queues):
-            try:
-                item = q.get_nowait()
-                if isinstance(item, dict):
-                    jpg = item.get("frame")
-                    last_fps[i] = item.get("fps", 0.0)
-                else:
-                    jpg = item
-                frm = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_COLOR)
-                if frm is not None:
-                    last_frames[i] = cv2.resize(frm, (cam_w, cam_h))
-            except queue.Empty:
-                # Wenn kein neues Frame verfügbar, einfach den alten behalten
-                pass
+        # 1) Aus jedem Ringpuffer nur den neuesten Frame holen - keine Dekodierung
+        now = time.time()
+        if heartbeat is not None:
+            heartbeat.value = now
+        for i, reader in enumerate(readers):
+            snapshot = reader.poll(copy=True)
+            if snapshot is None:
+                continue
+
+            frm = snapshot['frame']
+            if frm.shape[:2] != (cam_h, cam_w):
+                frm = cv2.resize(frm, (cam_w, cam_h))
+            last_frames[i] = frm
+            last_fps[i] = snapshot['objects'].get('fps', 0.0)
+
+        if now - last_stats > 60:
+            print(f"Preview: übersprungene Frames je Kamera: {[reader.skipped for reader in readers]}")
+            last_stats = now
 
         # 2) Für jedes Kamerabild eine Infozeile (schwarz) mit FPS-Label oben hinzufügen
         frames_with_info = []
         for i, frm in enumerate(last_frames):
             info = np.zeros((info_h, cam_w, 3), dtype=np.uint8)
-            label = f"Cam {i + 1}: {last_fps[i]:.1f} FPS"
+            label = f"Cam {i + 1}: {last_fps[i]:.1f} FPS  Skip: {readers[i].skipped}"
             cv2.putText(
                 info,
                 label,
@@ -121,3 +139,5 @@ def preview_worker(queues, daily_counter=None):
             break
 
     cv2.destroyAllWindows()
+    for reader in readers:
+        reader.close()
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def parse_roi(value):
+    """ROI aus ``config.ini``: ``x1,y1,x2,y2``, ``full`` (ganzes Bild) oder leer (Band um die Linien)."""
+    if value is None or not value.strip():
+        return None
+    value = value.strip().lower()
+    if value == 'full':
+        return 'full'
+    coords = tuple(int(part) for part in value.split(','))
+    if len(coords) != 4:
+        raise ValueError(f"ROI '{value}' muss das Format x1,y1,x2,y2 haben")
+    return coords
+
+
+def resolve_roi(frame_shape, orientation: str, line1: int, line2: int, roi=None, margin: float = 0.25):
+    """Bildbereich (x1, y1, x2, y2), auf dem Detektion und Tracking laufen.
+
+    Ohne feste ROI ist das ein Band um die beiden Zähllinien: quer zu den
+    Linien über die ganze Bildhöhe bzw. -breite, entlang der Bewegungsrichtung
+    ``margin`` der Bildgröße vor und hinter den Linien.
+    """
+    h, w = frame_shape[:2]
+    if roi == 'full':
+        return 0, 0, w, h
+
+    if roi is not None:
+        x1, y1, x2, y2 = roi
+    elif orientation == "vertical":
+        pad = int(margin * w)
+        x1, x2 = min(line1, line2) - pad, max(line1, line2) + pad
+        y1, y2 = 0, h
+    else:
+        pad = int(margin * h)
+        x1, x2 = 0, w
+        y1, y2 = min(line1, line2) - pad, max(line1, line2) + pad
+
+    x1, x2 = max(0, x1), min(w, x2)
+    y1, y2 = max(0, y1), min(h, y2)
+    if x2 - x1 < 32 or y2 - y1 < 32:
+        # Linien außerhalb des Bildes o.ä.: lieber das ganze Bild
+        return 0, 0, w, h
+    return x1, y1, x2, y2
+
+
+def crop_roi(frame, roi):
+    """Zusammenhängender Ausschnitt für die Inference (das ganze Bild ohne Kopie)."""
+    x1, y1, x2, y2 = roi
+    h, w = frame.shape[:2]
+    if (x1, y1, x2, y2) == (0, 0, w, h):
+        return frame
+    return np.ascontiguousarray(frame[y1:y2, x1:x2])
@@ -0,0 +1,123 @@
+import os
+
+from csv_sink import DONE_SUFFIX, PART_SUFFIX, RollingCsvSink
+
+FIELDS = ["track_id", "class_name", "entry_timestamp"]
+
+
+def make_rows(start, count):
+    return [
+        {"track_id": i, "class_name": "sailboat_with_cabin", "entry_timestamp": f"2024-06-01 10:00:{i % 60:02d}"}
+        for i in range(start, start + count)
+    ]
+
+
+def make_sink(tmp_path, **kwargs):
+    return RollingCsvSink(str(tmp_path / "csv"), "Fürstenberg", FIELDS, **kwargs)
+
+
+def read_csv_files(directory):
+    lines = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".csv"):
+            with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                lines.extend(f.read().splitlines()[1:])
+    return lines
+
+
+def test_close_publishes_with_marker(tmp_path):
+    sink = make_sink(tmp_path)
+    for row in make_rows(0, 3):
+        sink.write(row)
+    sink.close()
+
+    files = sorted(os.listdir(tmp_path / "csv"))
+    assert len(files) == 2
+    csv_name, marker = files
+    assert csv_name.startswith("live_Fürstenberg_") and csv_name.endswith("_aggregated.csv")
+    assert marker == csv_name + DONE_SUFFIX
+    assert len(read_csv_files(tmp_path / "csv")) == 3
+
+
+def test_recover_publishes_part_without_duplicate_rows(tmp_path):
+    rows = make_rows(0, 5)
+    sink = make_sink(tmp_path)
+    for row in rows:
+        sink.write(row)
+    sink._file.write("7,torn")  # Absturz mitten in einer Zeile
+    sink._file.flush()
+    part_name = os.path.basename(sink._path)
+    assert part_name.endswith(PART_SUFFIX)
+    # Kein close(): der Prozess ist abgestürzt
+
+    recovered = make_sink(tmp_path)
+    csv_dir = tmp_path / "csv"
+    final_name = part_name[:-len(PART_SUFFIX)]
+    assert sorted(os.listdir(csv_dir)) == [final_name, final_name + DONE_SUFFIX]
+
+    # Replay: bereits geschriebene Zeilen fehlen nicht, nur die neue Zeile
+    extra = make_rows(5, 1)
+    missing = recovered.missing_rows(rows + extra)
+    assert missing == extra
+    for row in missing:
+        recovered.write(row)
+    recovered.close()
+
+    lines = read_csv_files(csv_dir)
+    assert len(lines) == 6
+    assert len(set(lines)) == 6
+
+
+def test_rotation_names_stay_unique(tmp_path):
+    rotations = []
+    sink = make_sink(tmp_path, max_bytes=1, on_rotate=lambda: rotations.append(sink._file))
+    for row in make_rows(0, 4):
+        sink.rotate_if_due()
+        sink.write(row)
+    sink.close()
+
+    names = [name for name in os.listdir(tmp_path / "csv") if name.endswith(".csv")]
+    assert len(names) == 4
+    assert len(read_csv_files(tmp_path / "csv")) == 4
+    # on_rotate kommt nach dem Abschluss, bevor die nächste Datei offen ist
+    assert rotations == [None] * 4
+
+
+def test_missing_rows_checks_uploaded_file(tmp_path):
+    rows = make_rows(0, 3)
+    sink = make_sink(tmp_path)
+    for row in rows:
+        sink.write(row)
+    sink.rotate()
+
+    # Absturz vor dem SYNC der Rotation; der Uploader hat die Datei schon verschoben
+    csv_dir = tmp_path / "csv"
+    backup_dir = tmp_path / "csv_backup"
+    backup_dir.mkdir()
+    for name in os.listdir(csv_dir):
+        if name.endswith(".csv"):
+            os.replace(csv_dir / name, backup_dir / name)
+            os.remove(csv_dir / (name + DONE_SUFFIX))
+
+    assert make_sink(tmp_path).missing_rows(rows) == []
+
+
+def test_names_do_not_collide_with_uploaded_files(tmp_path):
+    sink = make_sink(tmp_path)
+    sink.write(make_rows(0, 1)[0])
+    sink.close()
+
+    # Uploader verschiebt die Datei nach csv_backup
+    csv_dir = tmp_path / "csv"
+    backup_dir = tmp_path / "csv_backup"
+    backup_dir.mkdir()
+    uploaded = [name for name in os.listdir(csv_dir) if name.endswith(".csv")][0]
+    os.replace(csv_dir / uploaded, backup_dir / uploaded)
+    os.remove(csv_dir / (uploaded + DONE_SUFFIX))
+
+    sink = make_sink(tmp_path)
+    sink.write(make_rows(1, 1)[0])
+    sink.close()
+    new_names = [name for name in os.listdir(csv_dir) if name.endswith(".csv")]
+    assert len(new_names) == 1
+    assert new_names[0] != uploaded
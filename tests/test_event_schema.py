@@ -0,0 +1,92 @@
+import pytest
+
+from event_schema import CLASS_NAMES, DIRECTIONS, INLINE, decode_event, encode_event, format_timestamp
+
+# Methoden-Strings, wie sie tracking.py und image_utils.py tatsächlich liefern
+REAL_METHODS = [
+    'no_license',
+    'error',
+    'quality_too_low',
+    'no_results',
+    'no_data',
+    'recognizer_gray',
+    'recognizer_enhanced',
+    'recognizer_threshold',
+    'recognizer_morph',
+    'standard_img0',
+    'detailed_img5',
+    'paragraph_img2',
+    'enhanced_img3',
+    'consensus_3frames_score0.912',
+    'consensus_12frames_score1.000',
+    'consensus_2frames_score0.050',
+]
+
+
+def make_record(**overrides):
+    fields = dict(
+        camera=2, track_id=4711, class_id=1, class_name=CLASS_NAMES[1], direction='left',
+        timestamp=1718000000.25, location='Fürstenberg', extracted_text='B 1234', identified=True,
+        ocr_confidence=0.87, confidence=0.93, ocr_method='recognizer_gray',
+        ocr_processing_time=0.12, frame_quality_score=210.5, preprocessing_methods='clahe,morph',
+    )
+    fields.update(overrides)
+    return encode_event(**fields)
+
+
+def test_round_trip_all_fields():
+    evt = decode_event(make_record())
+    assert evt == {
+        'camera': 2,
+        'track_id': 4711,
+        'class_id': 1,
+        'class_name': 'passenger_boat',
+        'direction': 'left',
+        'timestamp': 1718000000.25,
+        'location': 'Fürstenberg',
+        'extracted_text': 'B 1234',
+        'identified_licence_number': 'yes',
+        'ocr_confidence': 0.87,
+        'confidence': 0.93,
+        'ocr_method_used': 'recognizer_gray',
+        'ocr_processing_time': 0.12,
+        'frame_quality_score': 210.5,
+        'preprocessing_methods': 'clahe,morph',
+    }
+
+
+@pytest.mark.parametrize('method', REAL_METHODS)
+def test_real_methods_are_coded(method):
+    record = make_record(ocr_method=method)
+    # Methoden-Code (Byte 5) statt Inline-String
+    assert record[5] != INLINE
+    assert decode_event(record)['ocr_method_used'] == method
+    assert len(record) == len(make_record(ocr_method='no_license'))
+
+
+@pytest.mark.parametrize('method', ['tesseract', 'standard_img007', 'consensus_3frames_score99.999', ''])
+def test_unknown_methods_are_inlined(method):
+    record = make_record(ocr_method=method)
+    assert record[5] == INLINE
+    assert decode_event(record)['ocr_method_used'] == method
+
+
+@pytest.mark.parametrize('direction', DIRECTIONS)
+def test_directions_and_unknown_class(direction):
+    evt = decode_event(make_record(direction=direction, class_name='kayak', identified=False))
+    assert evt['direction'] == direction
+    assert evt['class_name'] == 'kayak'
+    assert evt['identified_licence_number'] == 'no'
+
+
+def test_unknown_version_is_rejected():
+    record = bytearray(make_record())
+    record[0] = 1
+    with pytest.raises(ValueError):
+        decode_event(bytes(record))
+    with pytest.raises(ValueError):
+        decode_event(b'')
+
+
+def test_format_timestamp_matches_csv_format():
+    assert len(format_timestamp(0.0)) == len('2024-01-01 00:00:00')
@@ -0,0 +1,97 @@
+import os
+import time
+
+from event_wal import EventWal
+
+
+def make_wal(tmp_path):
+    return EventWal(str(tmp_path / "wal" / "aggregator.wal"))
+
+
+def write_log(tmp_path):
+    wal = make_wal(tmp_path)
+    wal.replay()
+    wal.log_event(0, b"record-0")
+    wal.log_event(1, b"record-1")
+    wal.log_row(0, {"track_id": 1})
+    wal.close()
+    return wal.path
+
+
+def test_replay_restores_pending_and_rows(tmp_path):
+    write_log(tmp_path)
+    state = make_wal(tmp_path).replay()
+    assert state["pending"] == [(1, b"record-1")]
+    assert state["unsynced_rows"] == [{"track_id": 1}]
+    assert state["rows_today"] == 1
+    assert state["records"] == 3
+
+
+def test_sync_clears_unsynced_rows(tmp_path):
+    path = write_log(tmp_path)
+    wal = make_wal(tmp_path)
+    wal.replay()
+    wal.log_sync(durable=True)
+    wal.log_row(1, {"track_id": 2})
+    wal.close()
+
+    state = EventWal(path).replay()
+    assert state["pending"] == []
+    assert state["unsynced_rows"] == [{"track_id": 2}]
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    path = write_log(tmp_path)
+    valid_size = os.path.getsize(path)
+    wal = make_wal(tmp_path)
+    wal.replay()
+    wal.log_event(2, b"record-2")
+    wal.close()
+    # Absturz mitten im letzten Record
+    with open(path, "rb+") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    state = make_wal(tmp_path).replay()
+    assert state["pending"] == [(1, b"record-1")]
+    assert state["records"] == 3
+    assert os.path.getsize(path) == valid_size
+
+
+def test_crc_mismatch_truncates_from_bad_record(tmp_path):
+    path = write_log(tmp_path)
+    size_before_row = os.path.getsize(path)
+    wal = make_wal(tmp_path)
+    wal.replay()
+    wal.log_event(2, b"record-2")
+    wal.log_event(3, b"record-3")
+    wal.close()
+    # Ein Byte in den Nutzdaten von Event 2 kippen
+    with open(path, "rb+") as f:
+        f.seek(size_before_row + 9 + 8)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+    wal = make_wal(tmp_path)
+    state = wal.replay()
+    assert state["pending"] == [(1, b"record-1")]
+    assert os.path.getsize(path) == size_before_row
+
+    # Neue Records werden hinter dem gültigen Teil angehängt
+    wal.log_event(4, b"record-4")
+    wal.close()
+    assert make_wal(tmp_path).replay()["pending"] == [(1, b"record-1"), (4, b"record-4")]
+
+
+def test_compact_keeps_state(tmp_path):
+    write_log(tmp_path)
+    wal = make_wal(tmp_path)
+    state = wal.replay()
+    wal.compact(state["pending"], time.strftime("%Y%m%d"), state["rows_today"])
+    wal.close()
+
+    compacted = make_wal(tmp_path).replay()
+    assert compacted["pending"] == [(1, b"record-1")]
+    assert compacted["unsynced_rows"] == []
+    assert compacted["rows_today"] == 1
+    assert compacted["records"] == 2
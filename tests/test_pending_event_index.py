@@ -0,0 +1,70 @@
+import random
+
+from aggregator_events import PendingEventIndex
+
+TIMEOUT = 30.0
+
+
+def linear_match(pending, class_id, direction, epoch):
+    """Referenz: ältestes passendes Event per linearer Suche (entfernt es aus ``pending``)."""
+    candidates = [
+        (evt_epoch, seq) for seq, (evt_epoch, evt) in pending.items()
+        if evt["class_id"] == class_id and evt["direction"] == direction
+        and abs(evt_epoch - epoch) < TIMEOUT
+    ]
+    if not candidates:
+        return None
+    _, seq = min(candidates)
+    return pending.pop(seq)[1]
+
+
+def test_match_equals_linear_scan():
+    rng = random.Random(42)
+    index = PendingEventIndex(TIMEOUT)
+    pending = {}
+    now = 0.0
+    for _ in range(5000):
+        now += rng.uniform(0.0, 3.0)
+        class_id = rng.randrange(3)
+        direction = rng.choice(("left", "right"))
+        # Exit-Events dürfen auch etwas vor dem Camera-2-Event liegen
+        epoch = now + rng.uniform(-5.0, 5.0)
+        if rng.random() < 0.5:
+            evt = {"class_id": class_id, "direction": direction, "id": len(pending)}
+            seq = index.add(evt, epoch)
+            pending[seq] = (epoch, evt)
+        else:
+            assert index.match(class_id, direction, epoch) is linear_match(pending, class_id, direction, epoch)
+        if rng.random() < 0.05:
+            expired = index.expire(now)
+            expected = sorted((e, seq) for seq, (e, _) in pending.items() if e < now - TIMEOUT)
+            assert expired == [pending.pop(seq)[1] for _, seq in expected]
+        assert len(index) == len(pending)
+
+
+def test_match_respects_timeout_window():
+    index = PendingEventIndex(TIMEOUT)
+    evt = {"class_id": 1, "direction": "left"}
+    index.add(evt, 100.0)
+    assert index.match(1, "left", 100.0 + TIMEOUT) is None
+    assert index.match(1, "left", 100.0 - TIMEOUT) is None
+    assert index.match(1, "right", 100.0) is None
+    assert index.match(1, "left", 100.0 + TIMEOUT - 0.001) is evt
+    assert not index
+
+
+def test_restored_seq_does_not_collide():
+    index = PendingEventIndex(TIMEOUT)
+    assert index.add({"class_id": 0, "direction": "up"}, 1.0, seq=41) == 41
+    assert index.add({"class_id": 0, "direction": "up"}, 1.0) == 42
+
+
+def test_drain_returns_oldest_first():
+    index = PendingEventIndex(TIMEOUT)
+    late = {"class_id": 0, "direction": "up"}
+    early = {"class_id": 1, "direction": "down"}
+    index.add(late, 20.0)
+    index.add(early, 10.0)
+    assert index.events() == [early, late]
+    assert index.drain() == [early, late]
+    assert len(index) == 0 and index.expire(1e9) == []
@@ -0,0 +1,51 @@
+from track_state import TrackStateTable
+
+
+def test_crossing_both_lines_reports_direction_once():
+    table = TrackStateTable(100, 200)
+    assert table.update([1], [50]).tolist() == [0]
+    assert table.update([1], [150]).tolist() == [0]
+    assert table.update([1], [250]).tolist() == [1]
+    table.mark_logged(1)
+    assert table.update([1], [300]).tolist() == [0]
+
+
+def test_crossing_left():
+    table = TrackStateTable(100, 200)
+    table.update([7], [250])
+    assert table.update([7], [50]).tolist() == [-1]
+
+
+def test_grows_beyond_capacity():
+    table = TrackStateTable(100, 200, capacity=2)
+    tids = list(range(10))
+    table.update(tids, [50] * 10)
+    assert table.update(tids, [250] * 10).tolist() == [1] * 10
+    assert len(table) == 10
+
+
+def test_discard_removes_rows_and_keeps_remaining_state():
+    table = TrackStateTable(100, 200)
+    table.update([1, 2, 3], [50, 50, 250])
+    # Track 3 hat Linie 2 schon nach links überquert, Track 1 Linie 1 nach rechts
+    table.update([1, 2, 3], [150, 50, 150])
+    table.mark_logged(2)
+
+    table.discard([2, 99])
+    assert 2 not in table
+    assert len(table) == 2
+
+    # Zeilen der verbliebenen Tracks sind unverändert
+    assert table.update([1, 3], [250, 50]).tolist() == [1, -1]
+
+
+def test_discarded_track_starts_fresh():
+    table = TrackStateTable(100, 200)
+    table.update([1], [50])
+    table.update([1], [250])
+    table.mark_logged(1)
+    table.discard([1])
+
+    assert table.update([1], [250]).tolist() == [0]
+    assert table.update([1], [50]).tolist() == [-1]
+    assert len(table) == 1
@@ -0,0 +1,189 @@
+import numpy as np
+
+
+class FrameDetections:
+    """Detektionen eines Frames als zusammenhängende NumPy-Arrays.
+
+    Die Ultralytics-Tensoren werden pro Frame genau einmal auf die CPU kopiert
+    statt pro Box einzeln ausgelesen. ``ids`` ist -1 für Boxen ohne Track-ID.
+    """
+
+    def __init__(self, xyxy, ids, cls, conf, class_names: dict):
+        # int() auf den Koordinaten schneidet ab - astype ebenso
+        self.xyxy = np.asarray(xyxy).reshape(-1, 4).astype(np.int64)
+        self.ids = np.asarray(ids).astype(np.int64)
+        self.cls = np.asarray(cls).astype(np.int64)
+        self.conf = np.asarray(conf).astype(np.float32)
+        self.class_names = [class_names.get(cls_id, 'unknown') for cls_id in self.cls.tolist()]
+
+    @classmethod
+    def empty(cls, class_names: dict) -> "FrameDetections":
+        """Frame ohne Detektionen (z.B. Inference ausgelassen)."""
+        return cls(np.empty((0, 4)), np.empty(0), np.empty(0), np.empty(0), class_names)
+
+    @classmethod
+    def from_boxes(cls, boxes, class_names: dict) -> "FrameDetections":
+        """Aus ``result.boxes`` von Ultralytics."""
+        if boxes is None or len(boxes) == 0:
+            return cls.empty(class_names)
+        ids = boxes.id.cpu().numpy() if boxes.id is not None else np.full(len(boxes), -1)
+        return cls(boxes.xyxy.cpu().numpy(), ids, boxes.cls.cpu().numpy(), boxes.conf.cpu().numpy(), class_names)
+
+    @classmethod
+    def from_tracks(cls, tracks, class_names: dict) -> "FrameDetections":
+        """Aus Tracker-Zeilen ``[x1, y1, x2, y2, id, conf, cls, ...]`` (id -1 = ohne Track)."""
+        if len(tracks) == 0:
+            return cls.empty(class_names)
+        tracks = np.asarray(tracks, dtype=np.float64)
+        return cls(tracks[:, :4], tracks[:, 4], tracks[:, 6], tracks[:, 5], class_names)
+
+    def __len__(self):
+        return len(self.cls)
+
+    def shift(self, dx: int, dy: int) -> "FrameDetections":
+        """Verschiebt alle Boxen, z.B. von ROI- in Vollbild-Koordinaten."""
+        if dx or dy:
+            self.xyxy += np.array([dx, dy, dx, dy], dtype=np.int64)
+        return self
+
+    @property
+    def has_tracks(self) -> bool:
+        """True, wenn mindestens eine Box eine Track-ID hat."""
+        return bool((self.ids >= 0).any())
+
+    def objects(self) -> list:
+        """Objektliste im bisherigen Format (Ringpuffer, YOLO-Labels, Overlays)."""
+        return [
+            {
+                'bbox': tuple(bbox),
+                'cls_id': cls_id,
+                'class_name': class_name,
+                'conf': conf,
+                'tid': tid if tid >= 0 else None,
+            }
+            for bbox, cls_id, class_name, conf, tid in zip(
+                self.xyxy.tolist(), self.cls.tolist(), self.class_names,
+                self.conf.tolist(), self.ids.tolist(),
+            )
+        ]
+
+
+def containment_matrix(inner, outer) -> np.ndarray:
+    """Bool-Matrix (len(inner) x len(outer)): Box ``inner[i]`` liegt vollständig in ``outer[j]``."""
+    inner = np.asarray(inner).reshape(-1, 4)[:, None, :]
+    outer = np.asarray(outer).reshape(-1, 4)[None, :, :]
+    return (
+        (inner[..., 0] >= outer[..., 0])
+        & (inner[..., 1] >= outer[..., 1])
+        & (inner[..., 2] <= outer[..., 2])
+        & (inner[..., 3] <= outer[..., 3])
+    )
+
+
+def best_license_per_boat(license_boxes, license_conf, license_ok, boat_boxes) -> np.ndarray:
+    """Index des Kennzeichens mit der höchsten Confidence je Boot oder -1.
+
+    Berücksichtigt nur Kennzeichen mit ``license_ok`` (z.B. ausreichende
+    Bildqualität), die vollständig im Boot liegen. Bei Gleichstand gewinnt
+    das erste Kennzeichen.
+    """
+    num_boats = len(boat_boxes)
+    if len(license_boxes) == 0 or num_boats == 0:
+        return np.full(num_boats, -1, dtype=np.int64)
+
+    valid = containment_matrix(license_boxes, boat_boxes) & np.asarray(license_ok, dtype=bool)[:, None]
+    scores = np.where(valid, np.asarray(license_conf, dtype=np.float64)[:, None], -np.inf)
+    best = scores.argmax(axis=0)
+    return np.where(valid.any(axis=0), best, -1)
+
+
+class TrackStateTable:
+    """Kompakte Zustandstabelle für die Linienüberquerung aller Tracks einer Kamera.
+
+    Pro Track eine Zeile mit letzter Position, Überquerungs-Flags je Linie und
+    Richtung sowie dem Log-Status. ``update`` wertet beide Linien für alle
+    Tracks eines Frames in einem Schritt aus.
+    """
+
+    RIGHT, LEFT = 0, 1
+
+    def __init__(self, line1, line2, capacity: int = 64):
+        self.lines = np.array([line1, line2], dtype=np.float64)
+        self.rows = {}
+        self.prev_pos = np.zeros(capacity, dtype=np.float64)
+        # crossed[row, Linie, Richtung]; Richtung 0 = rechts/unten, 1 = links/oben
+        self.crossed = np.zeros((capacity, 2, 2), dtype=bool)
+        self.logged = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, tid):
+        return tid in self.rows
+
+    def _grow(self, needed: int):
+        capacity = len(self.prev_pos)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        self.prev_pos = np.resize(self.prev_pos, new_capacity)
+        crossed = np.zeros((new_capacity, 2, 2), dtype=bool)
+        crossed[:capacity] = self.crossed
+        self.crossed = crossed
+        logged = np.zeros(new_capacity, dtype=bool)
+        logged[:capacity] = self.logged
+        self.logged = logged
+
+    def update(self, tids, positions) -> np.ndarray:
+        """Übernimmt die aktuellen Positionen und liefert je Track die Event-Richtung.
+
+        Rückgabe: int8-Array mit 1 (rechts/unten), -1 (links/oben) oder 0 (kein
+        neues Event). Neue Tracks starten an ihrer aktuellen Position. Die
+        Track-IDs eines Frames müssen eindeutig sein.
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        rows = np.empty(len(tids), dtype=np.int64)
+        is_new = np.zeros(len(tids), dtype=bool)
+        for i, tid in enumerate(tids):
+            row = self.rows.get(tid)
+            if row is None:
+                row = len(self.rows)
+                self._grow(row + 1)
+                self.rows[tid] = row
+                self.crossed[row] = False
+                self.logged[row] = False
+                is_new[i] = True
+            rows[i] = row
+
+        prev = np.where(is_new, positions, self.prev_pos[rows])[:, None]
+        cur = positions[:, None]
+        lines = self.lines[None, :]
+        self.crossed[rows, :, self.RIGHT] |= (prev <= lines) & (lines < cur)
+        self.crossed[rows, :, self.LEFT] |= (prev >= lines) & (lines > cur)
+        self.prev_pos[rows] = positions
+
+        crossed = self.crossed[rows].all(axis=1)
+        due = (crossed[:, self.RIGHT] | crossed[:, self.LEFT]) & ~self.logged[rows]
+        return np.where(due, np.where(crossed[:, self.RIGHT], 1, -1), 0).astype(np.int8)
+
+    def mark_logged(self, tid):
+        """Track wurde geloggt - keine weiteren Events."""
+        self.logged[self.rows[tid]] = True
+
+    def discard(self, tids):
+        """Entfernt die Zeilen verschwundener Tracks.
+
+        Die letzte Zeile rückt jeweils in die frei gewordene nach, die Tabelle
+        bleibt dadurch lückenlos.
+        """
+        for tid in tids:
+            row = self.rows.pop(tid, None)
+            if row is None:
+                continue
+            last = len(self.rows)
+            if row != last:
+                moved = next(t for t, r in self.rows.items() if r == last)
+                self.rows[moved] = row
+                self.prev_pos[row] = self.prev_pos[last]
+                self.crossed[row] = self.crossed[last]
+                self.logged[row] = self.logged[last]
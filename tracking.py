@@ -1,22 +1,83 @@
 import os
 import time
 import cv2
+import numpy as np
 import torch
-import easyocr
-import pandas as pd
 import multiprocessing as mp
 
-from ultralytics import YOLO
-
-from config_utils import get_global_class_colors
+from config_utils import get_global_class_colors, load_ocr_config, load_performance_config
 from image_utils import (
     sanitize_filename, 
-    perform_ocr_on_license_enhanced, 
-    enhanced_find_license_for_boat,
     MultiFrameOCRTracker,
-    calculate_frame_quality,
-    get_adaptive_ocr_params
+    calculate_frame_qualities,
+    get_adaptive_ocr_params,
 )
+from ocr_service import OCRClient, OCRScheduler
+from frame_pool import FramePool
+from frame_ring import FrameRing, frame_ring_name
+from overlay import OverlayRenderer
+from track_state import FrameDetections, TrackStateTable, best_license_per_boat
+from inference_engine import engine_frames
+from motion_gate import MotionGate, create_motion_gate
+from roi import resolve_roi, crop_roi
+from capture import LatestFrameCapture
+from model_export import load_detection_model
+from event_schema import encode_event
+
+
+def local_frames(cam_idx: int, det_model, capture: LatestFrameCapture, device: str,
+                 motion_gate: MotionGate = None, roi_for=None, max_stall: float = 60.0):
+    """Eigener YOLO-Tracking-Stream: liefert (Frame, FrameDetections, Aufnahmezeitpunkt) pro Frame.
+
+    ``capture`` dekodiert in einem eigenen Thread; verarbeitet wird immer der
+    neueste Frame.
+
+    Mit ``motion_gate`` läuft YOLO auf ruhigen Frames nur im Herzschlag-Takt;
+    ausgelassene Frames kommen ohne Detektionen. Der Tracker bleibt über
+    ``persist=True`` erhalten und sieht die Lücken nicht als verlorene Frames.
+    ``roi_for(frame_shape)`` liefert den Bildbereich für Detektion und
+    Tracking; die Boxen kommen immer in Vollbild-Koordinaten zurück.
+
+    Kommt ``max_stall`` Sekunden lang kein Frame (Kamera trotz Neuverbindungen
+    nicht erreichbar), endet der Stream und damit der Worker - wie zuvor beim
+    Abbruch des Ultralytics-Streams.
+    """
+    active_tracks = True
+    region = None
+    last_frame_time = time.time()
+    while True:
+        frame, captured_at = capture.read(timeout=1.0)
+        if frame is None:
+            if time.time() - last_frame_time > max_stall:
+                print(f"Track Worker {cam_idx}: Seit {max_stall:.0f} s kein Frame, Stream beendet")
+                return
+            continue
+        last_frame_time = time.time()
+
+        h, w = frame.shape[:2]
+        frame_region = roi_for(frame.shape) if roi_for is not None else (0, 0, w, h)
+        if frame_region != region:
+            region = frame_region
+            print(f"Track Worker {cam_idx}: Inference-Bereich {region} von {w}x{h}")
+        inference_frame = crop_roi(frame, region)
+
+        if motion_gate is not None and not motion_gate.should_infer(inference_frame, active_tracks):
+            yield frame, FrameDetections.empty(det_model.names), captured_at
+            continue
+
+        result = det_model.track(
+            inference_frame,
+            persist=True,
+            tracker="botsort.yaml",
+            conf=0.5,
+            imgsz=640,
+            device=device,
+            verbose=False,
+        )[0]
+        # Detektionen einmal pro Frame als NumPy-Arrays übernehmen
+        detections = FrameDetections.from_boxes(result.boxes, det_model.names).shift(region[0], region[1])
+        active_tracks = detections.has_tracks
+        yield frame, detections, captured_at
 
 
 def track_worker(
@@ -27,16 +88,45 @@ def track_worker(
     line2: int,
     orientation: str,
     commercial_licenses: set,
-    q: mp.Queue,
     event_queue: mp.Queue,
-    screenshot_events: dict,
+    frame_ring_prefix: str,
     num_cams: int,
     daily_counter: mp.Value,
     daily_lock: mp.Lock,
+    ocr_request_queue: mp.Queue,
+    ocr_result_queue: mp.Queue,
+    preview_heartbeat: mp.Value = None,
+    roi=None,
 ):
+    performance_config = load_performance_config()
+    # Zentrale Inference-Engine: Frames und getrackte Boxen kommen fertig, kein eigenes Modell
+    central_inference = performance_config['inference_mode'] == 'central'
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    det_model = YOLO("best.pt").to(device)
-    ocr_reader = easyocr.Reader(["en", "de"], gpu=torch.cuda.is_available())
+    det_model = None if central_inference else load_detection_model(performance_config, device)
+
+    # OCR-Konfiguration laden
+    ocr_config = load_ocr_config()
+    min_frame_quality = ocr_config['min_frame_quality']
+    max_ocr_attempts = ocr_config['max_ocr_attempts']
+    min_confidence = ocr_config['min_confidence']
+
+    # Detektion nur im Bereich um die Zähllinien (oder der ROI aus config.ini)
+    def roi_for(frame_shape):
+        return resolve_roi(
+            frame_shape, orientation, line1, line2,
+            roi if performance_config['roi_inference'] else 'full',
+            performance_config['roi_margin'],
+        )
+
+    # Ruhige Kameras: YOLO nur im Herzschlag-Takt (die Inference-Engine hat ihr eigenes Gate)
+    motion_gate = None
+    if performance_config['motion_gate'] and not central_inference:
+        motion_gate = create_motion_gate(ocr_config, performance_config)
+
+    # OCR läuft im zentralen OCR-Service; der Frame-Loop wartet nie auf Ergebnisse
+    ocr_client = OCRClient(cam_idx, ocr_request_queue, ocr_result_queue)
+    # Pro-Track-Planung: keine OCR für fertige Tracks, max_ocr_attempts pro Track und Sekunde
+    ocr_scheduler = OCRScheduler(max_ocr_attempts, ocr_config['ocr_requests_per_frame'])
     
     # Globale Farbverwaltung verwenden - jetzt konsistent über alle Streams
     global_color_mapper = get_global_class_colors()
@@ -44,6 +134,20 @@ def track_worker(
     print(f"Track Worker {cam_idx}: Globale Farbverwaltung initialisiert")
     print(f"Track Worker {cam_idx}: Bereits definierte Farben: {list(global_color_mapper.get_all_known_colors().keys())}")
 
+    # Overlays nur für eine laufende Vorschau und höchstens mit deren Bildrate zeichnen
+    headless = performance_config['headless']
+    render_interval = 1.0 / max(0.1, performance_config['preview_fps'])
+    last_render = 0.0
+    overlay = OverlayRenderer(global_color_mapper)
+
+    def preview_attached(now):
+        """True, wenn die Vorschau in den letzten Sekunden ein Lebenszeichen gegeben hat."""
+        if headless is True:
+            return False
+        if headless is False:
+            return True
+        return preview_heartbeat is not None and now - preview_heartbeat.value < 3.0
+
     # Multi-Frame OCR Tracker initialisieren
     ocr_tracker = MultiFrameOCRTracker(max_frame_history=5)
 
@@ -125,348 +229,344 @@ def track_worker(
     fps_val = 0.0
 
     track_info = {}
-    
-    # OCR-Konfiguration laden
-    min_frame_quality = 100.0  # Aus config.ini
-    max_ocr_attempts = 3       # Aus config.ini
-    min_confidence = 0.3       # Aus config.ini
-
-    print(f"Track Worker {cam_idx}: Initialisiere YOLO stream...")
+    # Linienüberquerung aller Tracks als kompakte Tabelle, pro Frame vektorisiert ausgewertet
+    track_states = TrackStateTable(line1, line2)
+
+    # Referenzgezählte Frames: Tracks halten nur Frame-Referenzen statt Kopien
+    frame_pool = FramePool()
+
+    # Shared-Memory-Ringpuffer für Event-Screenshots: eigener Ring (wird beim ersten
+    # Frame angelegt), Ringe der anderen Kameras werden bei Bedarf angebunden
+    own_ring = None
+    other_rings = {}
+    # Vorschau: verkleinerter Frame in einem eigenen Ring (neuester Frame gewinnt)
+    preview_ring = None
+
+    def latest_camera_frame(camera_id):
+        """Neuester Frame einer anderen Kamera aus deren Ringpuffer oder None."""
+        ring = other_rings.get(camera_id)
+        if ring is None:
+            ring = FrameRing.attach(frame_ring_name(frame_ring_prefix, camera_id))
+            if ring is None:
+                return None
+            other_rings[camera_id] = ring
+        
+        snapshot = ring.read_latest()
+        if snapshot is None or time.time() - snapshot['timestamp'] >= 5:
+            # Veraltet (z.B. Worker neu gestartet): beim nächsten Mal neu anbinden
+            snapshot = None
+            ring.close()
+            del other_rings[camera_id]
+            return None
+        return snapshot
+
+    capture = None
+    if central_inference:
+        print(f"Track Worker {cam_idx}: Verbinde mit zentraler Inference-Engine...")
+        stream = engine_frames(frame_ring_prefix, cam_idx)
+    else:
+        print(f"Track Worker {cam_idx}: Initialisiere YOLO stream...")
 
-    try:
-        stream = det_model.track(
-            source=stream_url,
-            tracker="botsort.yaml",
-            conf=0.5,
-            show=False,
-            stream=True,
-            imgsz=640,
-            device=device,
-        )
-    except Exception as e:
-        print(f"Track Worker {cam_idx}: Fehler beim Verbinden mit Stream {stream_url}: {e}")
-        return
+        try:
+            capture = LatestFrameCapture(stream_url, f"Track Worker {cam_idx}").start()
+            stream = local_frames(cam_idx, det_model, capture, device, motion_gate, roi_for)
+        except Exception as e:
+            print(f"Track Worker {cam_idx}: Fehler beim Verbinden mit Stream {stream_url}: {e}")
+            return
 
     print(f"Track Worker {cam_idx}: Stream gestartet, beginne Verarbeitung...")
 
     # Cleanup Timer für alte OCR-Tracks
     last_cleanup = time.time()
+    frame_id = 0
+    # Alter der Frames bei der Verarbeitung (Aufnahme bis Verarbeitung)
+    frame_age_sum = 0.0
+    frame_age_max = 0.0
+    frame_age_count = 0
+
+    def submit_ocr(tids, lic):
+        """Schickt den Graustufen-Crop des Kennzeichens einmal für alle Boote, die es gewählt haben."""
+        return ocr_client.submit(tids, lic['gray'], lic['quality_score'], frame_id)
 
     try:
-        for result in stream:
-            if result is None or result.boxes is None:
-                continue
+        for raw_frame, detections, captured_at in stream:
+            frame_id += 1
 
-            raw_frame = result.orig_img.copy()
-            disp_frame = raw_frame.copy()
-            h, w, _ = raw_frame.shape
+            # Jeder Frame ist ein neues Array (Ultralytics bzw. Kopie aus dem Ring) - keine Kopie nötig
+            frame_ref = frame_pool.add(raw_frame)
 
             fps_frames += 1
             now_f = time.time()
+            frame_age = now_f - captured_at
+            frame_age_sum += frame_age
+            frame_age_max = max(frame_age_max, frame_age)
+            frame_age_count += 1
             if now_f - fps_start >= 1.0:
                 fps_val = fps_frames / (now_f - fps_start)
                 fps_frames = 0
                 fps_start = now_f
 
+            # Overlays werden nur im Takt der Vorschau auf den verkleinerten Frame gezeichnet
+            render = now_f - last_render >= render_interval and preview_attached(now_f)
+            if render:
+                last_render = now_f
+                overlay.begin(raw_frame)
+                overlay.lines(orientation, line1, line2)
+
             # Cleanup alte OCR-Tracks alle 60 Sekunden
             if now_f - last_cleanup > 60:
                 ocr_tracker.cleanup_old_tracks()
+                ocr_scheduler.cleanup()
                 last_cleanup = now_f
-
-            if orientation == "vertical":
-                cv2.line(disp_frame, (line1, 0), (line1, h), (0, 255, 255), 2)
-                cv2.line(disp_frame, (line2, 0), (line2, h), (0, 0, 255), 2)
-            else:
-                cv2.line(disp_frame, (0, line1), (w, line1), (0, 255, 255), 2)
-                cv2.line(disp_frame, (0, line2), (w, line2), (0, 0, 255), 2)
-
-            # Sammle alle Objekte in diesem Frame
-            current_frame_objects = []
-            boats = []
-            licenses = []
-            
-            for box in result.boxes:
-                x1, y1, x2, y2 = box.xyxy[0]
-                tid = int(box.id.item()) if box.id is not None else None
-                cls_id = int(box.cls[0])
-                class_name = det_model.names.get(cls_id, 'unknown')
-                conf_score = float(box.conf[0])
-                bbox = (int(x1), int(y1), int(x2), int(y2))
-                
-                # Füge zu aktuellen Frame-Objekten hinzu
-                current_frame_objects.append({
-                    'bbox': bbox,
-                    'cls_id': cls_id,
-                    'class_name': class_name,
-                    'conf': conf_score,
-                    'tid': tid
-                })
-                
-                # Label-Erstellung - ID zuerst, dann Bootstyp, dann Confidence
-                if tid is not None:
-                    label = f"ID:{tid} {class_name} {conf_score:.2f}"
-                else:
-                    label = f"{class_name} {conf_score:.2f}"
-                
-                # ZENTRALE FARBZUWEISUNG - Konsistent über alle Streams
-                box_color = global_color_mapper.get_color(class_name)
                 
-                # Textfarbe: Weiß für bessere Lesbarkeit auf farbigem Hintergrund
-                text_color = (255, 255, 255)  # Weiß
-                
-                cv2.rectangle(disp_frame, (bbox[0], bbox[1]), (bbox[2], bbox[3]), box_color, 2)
+                # Lange nicht mehr gesehene Tracks vergessen: Frame-Referenz, Linien-Zustand, OCR-Anfrage
+                stale_tids = [tid for tid, tr in track_info.items() if now_f - tr['last_seen'] > 300]
+                for tid in stale_tids:
+                    tr = track_info.pop(tid)
+                    if tr['frame_ref'] is not None:
+                        frame_pool.release(tr['frame_ref'])
+                    ocr_client.forget(tid)
+                track_states.discard(stale_tids)
+                print(f"Track Worker {cam_idx}: Frame-Pool: {frame_pool.get_stats()}")
+                print(f"Track Worker {cam_idx}: OCR-Planung: {ocr_scheduler.stats}")
+                if motion_gate is not None:
+                    print(f"Track Worker {cam_idx}: Motion-Gate: {motion_gate.stats}")
+                if capture is not None:
+                    print(f"Track Worker {cam_idx}: Capture: {capture.stats}")
+                if frame_age_count:
+                    print(f"Track Worker {cam_idx}: Frame-Alter Ø {frame_age_sum / frame_age_count * 1000:.0f} ms, "
+                          f"max {frame_age_max * 1000:.0f} ms")
+                    frame_age_sum = frame_age_max = 0.0
+                    frame_age_count = 0
+                if ocr_client.dropped:
+                    print(f"Track Worker {cam_idx}: {ocr_client.dropped} OCR-Anfragen verworfen (Queue voll)")
+
+            current_frame_objects = detections.objects()
+            
+            if render:
+                for obj in current_frame_objects:
+                    overlay.box(obj['bbox'], obj['class_name'], obj['tid'], obj['conf'])
+
+            # Kennzeichen und Boote trennen (Qualität für alle gemeinsam, OCR läuft im OCR-Service)
+            licenses = [
+                {'bbox': obj['bbox'], 'conf': obj['conf']}
+                for obj in current_frame_objects if obj['class_name'] == 'licence'
+            ]
+            boats = [obj for obj in current_frame_objects if obj['class_name'] != 'licence' and obj['tid'] is not None]
+
+            # Bildqualität aller Kennzeichen in einem Aufruf prüfen; der Graustufen-Crop geht an die OCR
+            qualities = calculate_frame_qualities(raw_frame, [lic['bbox'] for lic in licenses])
+            for lic, (quality_score, gray_crop) in zip(licenses, qualities):
+                lic['quality_score'] = quality_score
+                lic['gray'] = gray_crop
                 
-                # Textgröße berechnen
-                (text_width, text_height), baseline = cv2.getTextSize(
-                    label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2
-                )
+                if render and quality_score <= min_frame_quality:
+                    # Niedrige Qualität - markiere als problematisch (Rot)
+                    overlay.text(
+                        (lic['bbox'][0], lic['bbox'][3]), f"Low Quality: {quality_score:.1f}", (0, 0, 255), dy=12
+                    )
+
+            # Aktuellen Frame in den eigenen Ringpuffer schreiben für Event-Screenshots
+            if own_ring is None:
+                own_ring = FrameRing.create(frame_ring_name(frame_ring_prefix, cam_idx), raw_frame.shape)
+            if not own_ring.write(raw_frame, current_frame_objects, timestamp=captured_at):
+                print(f"Track Worker {cam_idx}: Frame-Größe {raw_frame.shape} passt nicht in den Ringpuffer "
+                      f"{own_ring.frame_shape}, lege ihn neu an")
+                own_ring.close()
+                own_ring = FrameRing.create(frame_ring_name(frame_ring_prefix, cam_idx), raw_frame.shape)
+                own_ring.write(raw_frame, current_frame_objects, timestamp=captured_at)
+
+            # Eingetroffene OCR-Ergebnisse in Multi-Frame Tracking und Track-Infos übernehmen
+            for ocr_result in ocr_client.poll():
+                tid = ocr_result['tid']
+                lic_text = ocr_result['text']
+                lic_conf = ocr_result['conf']
+                if not lic_text:
+                    continue
                 
-                # Position für Text und Hintergrund-Box
-                text_x = bbox[0]
-                text_y = max(text_height + 5, bbox[1] - 5)
+                ocr_tracker.add_detection(tid, lic_text, lic_conf, ocr_result['method'])
                 
-                # Farbiger Hintergrund passend zum Rahmen für bessere Lesbarkeit
-                padding = 2
-                background_color = box_color
-                cv2.rectangle(
-                    disp_frame,
-                    (text_x - padding, text_y - text_height - padding),
-                    (text_x + text_width + padding, text_y + baseline + padding),
-                    background_color,  # Farbiger Hintergrund passend zum Rahmen
-                    -1  # Gefüllt
-                )
+                # Eindeutiges gewerbliches Kennzeichen: Track braucht keine weitere OCR
+                final_text, final_conf, _ = ocr_tracker.get_best_result(tid)
+                if final_text in commercial_licenses and final_conf > min_confidence:
+                    ocr_scheduler.settle(tid)
                 
-                # Weißen Text über die farbige Box zeichnen
-                cv2.putText(
-                    disp_frame,
-                    label,
-                    (text_x, text_y),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    text_color,
-                    2,
-                )
-
-                # Erweiterte OCR-Verarbeitung für Lizenzen
-                if class_name == 'licence':
-                    # Prüfe Bildqualität vor OCR
-                    crop_for_quality = raw_frame[bbox[1]:bbox[3], bbox[0]:bbox[2]]
-                    quality_score = calculate_frame_quality(crop_for_quality)
-                    
-                    if quality_score > min_frame_quality:
-                        # Verwende verbesserte OCR
-                        text, ocr_conf, method, preprocessing_methods = perform_ocr_on_license_enhanced(
-                            raw_frame, bbox, ocr_reader, commercial_licenses, min_frame_quality
-                        )
-                        
-                        licenses.append({
-                            'bbox': bbox, 
-                            'text': text, 
-                            'conf': ocr_conf,
-                            'method': method,
-                            'quality_score': quality_score,
-                            'preprocessing_methods': preprocessing_methods
-                        })
-                        
-                        # Erweiterte Visualisierung für OCR-Ergebnisse - auf 2 Stellen begrenzt
-                        if text and ocr_conf > min_confidence:
-                            ocr_label = f"OCR: {text} ({ocr_conf:.2f})"
-                            cv2.putText(
-                                disp_frame,
-                                ocr_label,
-                                (bbox[0], bbox[3] + 15),
-                                cv2.FONT_HERSHEY_SIMPLEX,
-                                0.4,
-                                (0, 255, 0),  # Grün für erfolgreiche OCR
-                                1,
-                            )
-                    else:
-                        # Niedrige Qualität - markiere als problematisch
-                        licenses.append({
-                            'bbox': bbox, 
-                            'text': '', 
-                            'conf': 0.0,
-                            'method': 'quality_too_low',
-                            'quality_score': quality_score,
-                            'preprocessing_methods': []
-                        })
-                        
-                        cv2.putText(
-                            disp_frame,
-                            f"Low Quality: {quality_score:.1f}",
-                            (bbox[0], bbox[3] + 15),
-                            cv2.FONT_HERSHEY_SIMPLEX,
-                            0.4,
-                            (0, 0, 255),  # Rot für schlechte Qualität
-                            1,
-                        )
-                else:
-                    boats.append({
-                        'bbox': bbox,
-                        'tid': tid,
-                        'cls_id': cls_id,
-                        'class_name': class_name,
-                        'conf': conf_score,
-                    })
-
-            # Aktuellen Frame in shared dict speichern für Event-Screenshots
-            screenshot_events[cam_idx] = {
-                'frame': raw_frame.copy(),
-                'objects': current_frame_objects,
-                'timestamp': time.time()
-            }
+                # Update OCR-Informationen nur bei besserer Confidence
+                tr = track_info.get(tid)
+                if tr is not None and lic_conf > tr['ocr_conf']:
+                    tr['extracted_text'] = lic_text
+                    tr['ocr_conf'] = lic_conf
+                    tr['identified'] = 'yes' if lic_text in commercial_licenses else 'no'
+                    tr['ocr_method'] = ocr_result['method']
+                    tr['frame_quality_score'] = ocr_result['quality_score']
+                    tr['preprocessing_methods'] = ocr_result['preprocessing_methods']
+                    tr['ocr_processing_time'] = time.time() - ocr_result['submitted']
+
+            # OCR-Kandidaten dieses Frames: (Abstand zur nächsten Linie, Track-ID, Kennzeichen-Index)
+            ocr_candidates = []
+
+            # Positionen, Kennzeichen-Zuordnung und Linienüberquerung aller Boote in einem Schritt
+            boat_boxes = np.array([boat['bbox'] for boat in boats], dtype=np.float64).reshape(-1, 4)
+            axis = 0 if orientation == "vertical" else 1
+            positions = (boat_boxes[:, axis] + boat_boxes[:, axis + 2]) / 2.0
+            best_lic_idx = best_license_per_boat(
+                [lic['bbox'] for lic in licenses],
+                [lic['conf'] for lic in licenses],
+                [lic['quality_score'] > min_frame_quality for lic in licenses],
+                boat_boxes,
+            )
+            crossing = track_states.update([boat['tid'] for boat in boats], positions)
 
             # Enhanced Tracking Logic für alle Kameras
-            for boat in boats:
+            for boat, cur_pos, lic_idx, crossing_dir in zip(
+                boats, positions.tolist(), best_lic_idx.tolist(), crossing.tolist()
+            ):
                 tid = boat['tid']
-                if tid is None:
-                    continue
-                    
                 x1, y1, x2, y2 = boat['bbox']
-                center_x = (x1 + x2) / 2.0
-                center_y = (y1 + y2) / 2.0
-                cur_pos = center_x if orientation == "vertical" else center_y
     
-                # Verwende verbesserte Lizenz-Suche
-                best_lic = enhanced_find_license_for_boat(
-                    boat['bbox'], licenses, raw_frame, ocr_reader, commercial_licenses
-                )
+                # Bestes Kennzeichen im Boot (ausreichende Qualität) an den OCR-Service schicken
+                best_lic = licenses[lic_idx] if lic_idx >= 0 else None
                 
-                lic_text = best_lic['text'] if best_lic else ''
-                lic_conf = best_lic['ocr_confidence'] if best_lic else 0.0
-                lic_method = best_lic['method'] if best_lic else 'no_license'
-                identified = 'yes' if lic_text and lic_text in commercial_licenses else 'no'
-    
-                # Multi-Frame OCR Tracking
-                if best_lic and lic_text:
-                    ocr_tracker.add_detection(tid, lic_text, lic_conf, lic_method)
+                if best_lic:
+                    line_distance = min(abs(cur_pos - line1), abs(cur_pos - line2))
+                    ocr_candidates.append((line_distance, tid, lic_idx))
     
                 if tid not in track_info:
                     track_info[tid] = {
                         'cls_id': boat['cls_id'],
                         'class_name': boat['class_name'],
                         'conf': boat['conf'],
-                        'prev_pos': cur_pos,
-                        'cross1_r': False,
-                        'cross1_l': False,
-                        'cross2_r': False,
-                        'cross2_l': False,
-                        'last_frame': raw_frame.copy(),
+                        'frame_ref': frame_pool.acquire(frame_ref),
+                        'last_seen': now_f,
                         'last_box': (x1, y1, x2, y2),
-                        'log': False,
-                        'extracted_text': lic_text,
-                        'ocr_conf': lic_conf,
-                        'identified': identified,
-                        'ocr_method': lic_method,
-                        'frame_quality_score': best_lic.get('quality_score', 0) if best_lic else 0,
-                        'preprocessing_methods': best_lic.get('preprocessing_methods', []) if best_lic else [],
+                        'extracted_text': '',
+                        'ocr_conf': 0.0,
+                        'identified': 'no',
+                        'ocr_method': 'no_license',
+                        'frame_quality_score': best_lic['quality_score'] if best_lic else 0,
+                        'preprocessing_methods': [],
                         'ocr_processing_time': 0.0,
                     }
                 else:
                     tr = track_info[tid]
-                    tr['last_frame'] = raw_frame.copy()
+                    frame_pool.release(tr['frame_ref'])
+                    tr['frame_ref'] = frame_pool.acquire(frame_ref)
+                    tr['last_seen'] = now_f
                     tr['last_box'] = (x1, y1, x2, y2)
                     if boat['conf'] > tr['conf']:
                         tr['conf'] = boat['conf']
-                    
-                    # Update OCR-Informationen nur bei besserer Confidence
-                    if lic_conf and lic_conf > tr['ocr_conf']:
-                        tr['extracted_text'] = lic_text
-                        tr['ocr_conf'] = lic_conf
-                        tr['identified'] = identified
-                        tr['ocr_method'] = lic_method
-                        if best_lic:
-                            tr['frame_quality_score'] = best_lic.get('quality_score', 0)
-                            tr['preprocessing_methods'] = best_lic.get('preprocessing_methods', [])
     
                 tr = track_info[tid]
-                prev_pos = tr['prev_pos']
-                tr['prev_pos'] = cur_pos
-    
-                if prev_pos is not None:
-                    if prev_pos <= line1 < cur_pos:
-                        tr['cross1_r'] = True
-                    if prev_pos >= line1 > cur_pos:
-                        tr['cross1_l'] = True
-                    if prev_pos <= line2 < cur_pos:
-                        tr['cross2_r'] = True
-                    if prev_pos >= line2 > cur_pos:
-                        tr['cross2_l'] = True
-    
-                    crossed_r = tr['cross1_r'] and tr['cross2_r']
-                    crossed_l = tr['cross1_l'] and tr['cross2_l']
-    
-                    if (crossed_r or crossed_l) and not tr['log']:
-                        ts = time.strftime('%Y%m%d_%H%M%S')
-                        event_id = f"{ts}_{sanitize_filename(tr['class_name'])}_{sanitize_filename(location)}"
-                        
-                        print(f"Track Worker {cam_idx}: Line-Crossing erkannt! Event: {event_id}")
-                        
-                        direction = (
-                            'right' if orientation == 'vertical' else 'down'
-                        ) if crossed_r else (
-                            'left' if orientation == 'vertical' else 'up'
-                        )
-                        
-                        # Hole finales OCR-Ergebnis aus Multi-Frame Tracking
-                        final_text, final_conf, final_method = ocr_tracker.get_best_result(tid)
-                        
-                        # Verwende Multi-Frame Ergebnis falls verfügbar und besser
-                        if final_text and final_conf > tr['ocr_conf']:
-                            tr['extracted_text'] = final_text
-                            tr['ocr_conf'] = final_conf
-                            tr['ocr_method'] = final_method
-                            tr['identified'] = 'yes' if final_text in commercial_licenses else 'no'
-                        
-                        # Erstelle Event-Screenshots für alle Kameras
-                        all_camera_frames = {}
-                        for i in range(1, num_cams + 1):
-                            if i in screenshot_events:
-                                frame_data = screenshot_events[i]
-                                # Nur verwenden wenn Frame nicht zu alt ist (max 5 Sekunden)
-                                if time.time() - frame_data.get('timestamp', 0) < 5:
-                                    all_camera_frames[i] = frame_data
-                        
-                        if all_camera_frames:
-                            success = create_event_screenshots_for_all_cameras(event_id, all_camera_frames)
-                            if success:
-                                print(f"Track Worker {cam_idx}: Event-Screenshots erfolgreich erstellt für {event_id}")
-                            else:
-                                print(f"Track Worker {cam_idx}: WARNUNG - Event-Screenshots fehlgeschlagen für {event_id}")
+                
+                # Erweiterte Visualisierung für OCR-Ergebnisse - auf 2 Stellen begrenzt
+                if render and best_lic and tr['extracted_text'] and tr['ocr_conf'] > min_confidence:
+                    # Grün für erfolgreiche OCR
+                    overlay.text(
+                        (best_lic['bbox'][0], best_lic['bbox'][3]),
+                        f"OCR: {tr['extracted_text']} ({tr['ocr_conf']:.2f})",
+                        (0, 255, 0),
+                        dy=12,
+                    )
+
+                # Beide Linien in einer Richtung überquert und noch nicht geloggt
+                if crossing_dir:
+                    crossed_r = crossing_dir > 0
+                    # Events tragen den Aufnahmezeitpunkt des Frames, nicht die Verarbeitungszeit
+                    captured_time = time.localtime(captured_at)
+                    ts = time.strftime('%Y%m%d_%H%M%S', captured_time)
+                    event_id = f"{ts}_{sanitize_filename(tr['class_name'])}_{sanitize_filename(location)}"
+                    
+                    print(f"Track Worker {cam_idx}: Line-Crossing erkannt! Event: {event_id}")
+                    
+                    direction = (
+                        'right' if orientation == 'vertical' else 'down'
+                    ) if crossed_r else (
+                        'left' if orientation == 'vertical' else 'up'
+                    )
+                    
+                    # Hole finales OCR-Ergebnis aus Multi-Frame Tracking
+                    final_text, final_conf, final_method = ocr_tracker.get_best_result(tid)
+                    
+                    # Verwende Multi-Frame Ergebnis falls verfügbar und besser
+                    if final_text and final_conf > tr['ocr_conf']:
+                        tr['extracted_text'] = final_text
+                        tr['ocr_conf'] = final_conf
+                        tr['ocr_method'] = final_method
+                        tr['identified'] = 'yes' if final_text in commercial_licenses else 'no'
+                    
+                    # Erstelle Event-Screenshots für alle Kameras
+                    # (Frames der anderen Kameras zero-copy aus deren Ringpuffern, max 5 Sekunden alt)
+                    all_camera_frames = {}
+                    for i in range(1, num_cams + 1):
+                        if i != cam_idx:
+                            frame_data = latest_camera_frame(i)
+                            if frame_data is not None:
+                                all_camera_frames[i] = frame_data
+                    
+                    # Eigene Kamera direkt aus dem Frame-Pool (Pixel werden erst beim Speichern gelesen)
+                    all_camera_frames[cam_idx] = {
+                        'frame': frame_pool.get(tr['frame_ref']),
+                        'objects': current_frame_objects,
+                    }
+                    
+                    if all_camera_frames:
+                        success = create_event_screenshots_for_all_cameras(event_id, all_camera_frames)
+                        if success:
+                            print(f"Track Worker {cam_idx}: Event-Screenshots erfolgreich erstellt für {event_id}")
+                        else:
+                            print(f"Track Worker {cam_idx}: WARNUNG - Event-Screenshots fehlgeschlagen für {event_id}")
                         
-                        # CSV-Event mit vollständiger Precision erstellen (unverändert)
-                        event = {
-                            'camera': cam_idx,
-                            'track_id': tid,
-                            'class_id': tr['cls_id'],
-                            'class_name': tr['class_name'],
-                            'direction': direction,
-                            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                            'location': location,
-                            'extracted_text': tr['extracted_text'],
-                            'identified_licence_number': tr['identified'],
-                            'ocr_confidence': tr['ocr_conf'],  # Vollständige Precision für CSV
-                            'confidence': tr['conf'],          # Vollständige Precision für CSV
-                            'ocr_method_used': tr['ocr_method'],
-                            'ocr_processing_time': tr['ocr_processing_time'],
-                            'frame_quality_score': tr['frame_quality_score'],
-                            'preprocessing_methods': ",".join(tr['preprocessing_methods']),
-                        }
-                        event_queue.put(event)
-                        tr['log'] = True
-
-                        # Console-Output mit 2 Stellen für bessere Lesbarkeit
-                        print(f"Track Worker {cam_idx}: Objekt {tid} geloggt - Richtung: {direction}")
-                        print(f"Track Worker {cam_idx}: OCR: '{tr['extracted_text']}' (Conf: {tr['ocr_conf']:.2f}, Method: {tr['ocr_method']})")
-
-            # Frame in die Queue für Preview schreiben
-            try:
-                ret, jpg = cv2.imencode('.jpg', disp_frame)
-                if ret:
-                    q.put_nowait({"frame": jpg.tobytes(), "fps": fps_val})
-            except Exception:
-                # Queue ist voll - das ist normal, ignorieren
-                pass
+                        # Während des Speicherns überschriebene Slots mit konsistenter Kopie neu schreiben
+                        for i, frame_data in all_camera_frames.items():
+                            if 'slot' in frame_data and i in other_rings and not other_rings[i].is_intact(frame_data):
+                                retry = other_rings[i].read_latest(copy=True)
+                                if retry is not None:
+                                    print(f"Track Worker {cam_idx}: Kamera {i} während des Speicherns überschrieben, schreibe neu")
+                                    create_event_screenshots_for_all_cameras(event_id, {i: retry})
+                    
+                    # CSV-Event als kompakter Binär-Record (volle Precision, Zeitstempel als Epoch)
+                    event = encode_event(
+                        camera=cam_idx,
+                        track_id=tid,
+                        class_id=tr['cls_id'],
+                        class_name=tr['class_name'],
+                        direction=direction,
+                        timestamp=captured_at,
+                        location=location,
+                        extracted_text=tr['extracted_text'],
+                        identified=tr['identified'] == 'yes',
+                        ocr_confidence=tr['ocr_conf'],
+                        confidence=tr['conf'],
+                        ocr_method=tr['ocr_method'],
+                        ocr_processing_time=tr['ocr_processing_time'],
+                        frame_quality_score=tr['frame_quality_score'],
+                        preprocessing_methods=",".join(tr['preprocessing_methods']),
+                    )
+                    event_queue.put(event)
+                    track_states.mark_logged(tid)
+                    ocr_scheduler.settle(tid)
+
+                    # Console-Output mit 2 Stellen für bessere Lesbarkeit
+                    print(f"Track Worker {cam_idx}: Objekt {tid} geloggt - Richtung: {direction}")
+                    print(f"Track Worker {cam_idx}: OCR: '{tr['extracted_text']}' (Conf: {tr['ocr_conf']:.2f}, Method: {tr['ocr_method']})")
+
+            # OCR-Aufträge vergeben: Tracks nahe den Linien zuerst, ein Auftrag pro Kennzeichen
+            # (ein Kennzeichen in überlappenden Boots-Boxen wird nur einmal erkannt)
+            ocr_scheduler.run(
+                ocr_candidates, lambda tids, lic_idx: submit_ocr(tids, licenses[lic_idx]), now_f,
+                key=lambda lic_idx: lic_idx,
+            )
+
+            # Vorschau-Frame ohne Kodierung in den Shared Memory schreiben (neuester Frame gewinnt)
+            if render:
+                if preview_ring is None:
+                    preview_ring = FrameRing.create(
+                        frame_ring_name(f"{frame_ring_prefix}_preview", cam_idx), overlay.frame.shape, slots=2
+                    )
+                preview_ring.write(overlay.frame, {'fps': fps_val})
+
+            # Referenz des Frame-Durchlaufs freigeben (Tracks halten ihre eigenen)
+            frame_pool.release(frame_ref)
 
     except Exception as e:
         print(f"Track Worker {cam_idx}: Fehler in der Hauptschleife: {e}")
@@ -474,6 +574,16 @@ def track_worker(
         print(f"Track Worker {cam_idx}: Detaillierter Fehler: {traceback.format_exc()}")
     finally:
         print(f"Track Worker {cam_idx}: Beendet")
+        if capture is not None:
+            capture.stop()
+        
+        # Ringpuffer freigeben (eigener Ring wird entfernt)
+        if own_ring is not None:
+            own_ring.close()
+        for ring in other_rings.values():
+            ring.close()
+        if preview_ring is not None:
+            preview_ring.close()
         
         # Zeige finale Farbzuweisungen für diesen Stream
         final_colors = global_color_mapper.get_all_known_colors()